@@ -1,4 +1,6 @@
-from os import listdir
+import numpy as np
+
+from help.ResultLoader import heuristicKey, loadResultDir
 
 d = {"HEFT": "0;0;0;1;0;1;0", "BIL": "2;0;1;1;0;1;0", "HPS": "4;0;0;1;0;1;0", "DLS": "0;1;4;0;0;0;0",
      "GDL": "0;1;5;0;0;0;0", "MCT": "1;0;0;1;0;0;0", "MET": "1;0;3;1;0;0;0", "OLB": "1;0;2;1;0;0;0"}
@@ -14,6 +16,28 @@ def get_key(dict, val):
     return "key doesn't exist"
 
 
+def compareSideBySide(columns):
+    """ Count, for every pair of heuristics of **d**, the number of graphs where the first one is better than, as good
+    as and worse than the second one
+
+    :param columns: Results of every graph (see help.ResultLoader)
+    :type columns: dict[str, numpy.ndarray]
+    :return: Counts in format m[i][j] = [better, equal, worse], i and j being indexes in **hs**
+    :rtype: list[list[list[int]]]
+    """
+    # A seed gives distinct graphs for both edge streams
+    seeds, graph = np.unique(columns['seed'] * 2 + columns['legacyStream'], return_inverse=True)
+    relative = np.full((len(seeds), len(hs)), np.nan)  # Relative makespan of each heuristic on each graph
+    for k, h in enumerate(hs):
+        rows = columns['heuristic'] == heuristicKey(d[h])
+        relative[graph[rows], k] = columns['makespan'][rows]
+    better = (relative[:, :, None] > relative[:, None, :]).sum(axis=0)
+    equal = (relative[:, :, None] == relative[:, None, :]).sum(axis=0)
+    worse = len(seeds) - better - equal
+    return [[[int(better[i, j]), int(equal[i, j]), int(worse[i, j])] if i != j else [0, 0, 0] for j in range(len(hs))]
+            for i in range(len(hs))]
+
+
 if __name__ == '__main__':
     m = []
     for i in range(len(d)):
@@ -22,22 +46,5 @@ if __name__ == '__main__':
             l += [[0,0,0]]
         m += [l]
     print(m)
-    listFile = listdir("res")
-
-    for fileName in listFile:
-        file = open("res/" + fileName, 'r')
-        res = {}
-        for l in file.readlines():
-            for v in dv:
-                if l.startswith(v):
-                    res[get_key(d, v)] = l.split(";")[-2]
-        for i in d:
-            for j in d:
-                if i != j:
-                    if res[i] > res[j]:
-                        m[hs.index(i)][hs.index(j)][0] += 1
-                    elif res[i] == res[j]:
-                        m[hs.index(i)][hs.index(j)][1] += 1
-                    else:
-                        m[hs.index(i)][hs.index(j)][2] += 1
-    print(m)
\ No newline at end of file
+    m = compareSideBySide(loadResultDir("res"))
+    print(m)
@@ -1,4 +1,7 @@
-from computations.EarliestTimes import computeEFT
+import numpy as np
+
+from computations.CompiledDAG import compileDAG
+from computations.EarliestTimes import computeEFT, computeAllEFT
 
 
 def computeBIMStar(g, currentNode, proc, schedule, k, verbose, insertion, estimate=False):
@@ -32,4 +35,35 @@ def computeBIMStar(g, currentNode, proc, schedule, k, verbose, insertion, estima
         bims = est + bil[currentNode - 1] + w[currentNode - 1][proc] * max(k / q - 1, 0)
     if verbose:
         print("Attempt on scheduling node ", currentNode, "on proc", proc + 1, " -> bims =", bims)
-    return bims, est, eft
\ No newline at end of file
+    return bims, est, eft
+
+
+def computeAllBIMStar(g, currentNode, schedule, k, verbose, insertion, estimate=False):
+    """ Compute the BIM* value of a node on every proc
+
+    :param g: DAG to schedule
+    :type g: networkx.DiGraph | CompiledDAG
+    :param currentNode: Current node to be evaluated
+    :type currentNode: int
+    :param schedule: Schedule at this point
+    :type schedule: Schedule
+    :param k: Number of ready tasks at this point
+    :type k: int
+    :param verbose: Print non-necessary information ?
+    :type verbose: bool
+    :param insertion: Use of insertion policy ?
+    :type insertion: bool
+    :return: The BIM* values of **currentNode**, along with its EST and EFT, indexed by proc
+    :rtype: (numpy.ndarray, numpy.ndarray, numpy.ndarray)
+    """
+    g = compileDAG(g)
+    q = g.graph['nbproc']
+    bil = g.graph['prio'][currentNode - 1]
+    est, eft = computeAllEFT(g, currentNode, schedule, verbose=verbose, insertion=insertion, estimate=estimate)
+    if isinstance(bil, list):
+        bil = np.array(bil[:q], dtype=float)
+    bims = est + bil + g.cost[currentNode - 1, :q] * max(k / q - 1, 0)
+    if verbose:
+        for proc in range(q):
+            print("Attempt on scheduling node ", currentNode, "on proc", proc + 1, " -> bims =", bims[proc])
+    return bims, est, eft
@@ -1,3 +1,6 @@
+import numpy as np
+
+
 def commCost(g, i, j, m, n, verbose=False) -> float:
     """Compute exact communication cost using startup time, data quantity, and transfer rate
 
@@ -17,6 +20,8 @@ def commCost(g, i, j, m, n, verbose=False) -> float:
     """
     if m == n:
         cijmn = 0
+    elif hasattr(g, 'commTensor'):
+        cijmn = g.commTensor.cost(g.edgeId[i, j], m, n)
     else:
         cijmn = g.graph['L'][m] + g.edges[i, j]['weight'] / g.graph['B'][m][n]
     if verbose and False:
@@ -38,7 +43,176 @@ def meanCommCost(g, i, j, verbose=False):
     :return: The mean communication cost between **i** and **j**
     :rtype: float
     """
-    cij = g.graph['meanL'] + g.edges[i, j]['weight'] / g.graph['meanB']
+    if hasattr(g, 'commTensor'):
+        cij = g.commTensor.meanCosts(g.graph['meanL'], g.graph['meanB'])[g.edgeId[i, j]]
+    else:
+        cij = g.graph['meanL'] + g.edges[i, j]['weight'] / g.graph['meanB']
     if verbose:
         print("c", i, ",", j, " = ", cij, sep="")
     return cij
+
+
+class CommTensor:
+    """ Communication costs of every edge of a DAG between every pair of processors, precomputed for a given platform
+
+    Edges are identified by their index in the edge arrays of the compiled DAG. When every transfer rate is the same,
+    the cost of an edge only depends on the processor it starts from, so that only the data quantity of each edge is
+    kept (factored form). Otherwise, the full q x q matrix of every edge is stored, as long as it holds in
+    **maxFullSize** values; rows are computed on demand beyond that.
+    """
+
+    def __init__(self, weights, B, L, maxFullSize=2 ** 22):
+        q = len(L)
+        self.q = q
+        self.maxFullSize = maxFullSize
+        self.weights = np.asarray(weights, dtype=float)
+        self.L = np.asarray(L, dtype=float)
+        self.B = np.asarray(B, dtype=float)[:q, :q]
+        offDiag = self.B[~np.eye(q, dtype=bool)]
+        self.uniform = q < 2 or (offDiag == offDiag[0]).all()
+        self.factor = None
+        self.full = None
+        self._mean = None
+        if self.uniform:
+            self.factor = self.weights / (offDiag[0] if q > 1 else 1)
+        elif len(self.weights) * q * q <= maxFullSize:
+            self.full = self.L[None, :, None] + self.weights[:, None, None] / self.B[None, :, :]
+            self.full[:, np.arange(q), np.arange(q)] = 0
+        # Plain lists are faster than arrays for the scalar accesses of cost()
+        self._L = self.L.tolist()
+        self._weights = self.weights.tolist()
+        self._B = self.B.tolist()
+        self._factor = self.factor.tolist() if self.uniform else None
+
+    def cost(self, e, m, n):
+        """ Return the communication cost of edge **e** between processors **m** and **n**
+
+        :param e: Edge index
+        :type e: int
+        :param m: Processor on which the source of **e** is scheduled
+        :type m: int
+        :param n: Processor on which the destination of **e** is scheduled
+        :type n: int
+        :return: The communication cost
+        :rtype: float
+        """
+        if m == n:
+            return 0
+        if self.uniform:
+            return self._L[m] + self._factor[e]
+        if self.full is not None:
+            return float(self.full[e, m, n])
+        return self._L[m] + self._weights[e] / self._B[m][n]
+
+    def pairCosts(self, edges, srcProcs, dstProcs):
+        """ Return the communication costs of several edges, each between a given pair of processors
+
+        :param edges: Edge indices
+        :type edges: numpy.ndarray
+        :param srcProcs: Processor on which the source of each edge is scheduled
+        :type srcProcs: numpy.ndarray
+        :param dstProcs: Processor on which the destination of each edge is scheduled
+        :type dstProcs: numpy.ndarray
+        :return: Communication cost of every edge
+        :rtype: numpy.ndarray
+        """
+        if self.full is not None:
+            return self.full[edges, srcProcs, dstProcs]
+        if self.uniform:
+            comm = self.L[srcProcs] + self.factor[edges]
+        else:
+            comm = self.L[srcProcs] + self.weights[edges] / self.B[srcProcs, dstProcs]
+        comm[srcProcs == dstProcs] = 0
+        return comm
+
+    def rows(self, edges, procs):
+        """ Return the communication costs of several edges towards every processor
+
+        :param edges: Edge indices
+        :type edges: numpy.ndarray
+        :param procs: Processor on which the source of each edge is scheduled
+        :type procs: numpy.ndarray
+        :return: Matrix of costs, one row per edge and one column per destination processor
+        :rtype: numpy.ndarray
+        """
+        if self.full is not None:
+            return self.full[edges, procs]
+        if self.uniform:
+            comm = np.repeat((self.L[procs] + self.factor[edges])[:, None], self.q, axis=1)
+        else:
+            comm = self.L[procs, None] + self.weights[edges, None] / self.B[procs]
+        comm[np.arange(len(procs)), procs] = 0
+        return comm
+
+    def matrices(self, edges):
+        """ Return the communication costs of several edges between every pair of processors
+
+        :param edges: Edge indices
+        :type edges: numpy.ndarray
+        :return: Costs of every edge, indexed by edge then source and destination processors
+        :rtype: numpy.ndarray
+        """
+        if self.full is not None:
+            return self.full[edges]
+        q = self.q
+        if self.uniform:
+            comm = np.repeat((self.L[None, :] + self.factor[edges, None])[:, :, None], q, axis=2)
+        else:
+            comm = self.L[None, :, None] + self.weights[edges, None, None] / self.B[None, :, :]
+        comm[:, np.arange(q), np.arange(q)] = 0
+        return comm
+
+    def minPlus(self, edges, values):
+        """ For every edge and every source processor m, compute the minimum over destination processors p of
+        values[p] + cost(m, p)
+
+        :param edges: Edge indices
+        :type edges: numpy.ndarray
+        :param values: Values on every destination processor, one row per edge
+        :type values: numpy.ndarray
+        :return: Minimum of every edge, one row per edge and one column per source processor
+        :rtype: numpy.ndarray
+        """
+        q = self.q
+        if self.uniform and q > 1:
+            # Cost does not depend on the destination (except on the same processor) : min over p != m is the lowest
+            # value, or the second lowest one if the lowest is on m itself
+            rank = np.argsort(values, axis=1, kind='stable')[:, :2]
+            lowest = np.take_along_axis(values, rank, axis=1)
+            others = np.where(np.arange(q)[None, :] == rank[:, :1], lowest[:, 1:2], lowest[:, :1])
+            return np.minimum(values, others + (self.L[None, :] + self.factor[edges, None]))
+        res = np.empty((len(edges), q))
+        step = max(1, self.maxFullSize // (q * q))
+        for k in range(0, len(edges), step):
+            res[k:k + step] = (values[k:k + step, None, :] + self.matrices(edges[k:k + step])).min(axis=2)
+        return res
+
+    def arrivalTimes(self, edges, procs, finishes):
+        """ Compute the time at which the data of several edges are all available, on every processor
+
+        :param edges: Edge indices
+        :type edges: numpy.ndarray
+        :param procs: Processor on which the source of each edge is scheduled
+        :type procs: numpy.ndarray
+        :param finishes: Finish time of the source of each edge
+        :type finishes: numpy.ndarray
+        :return: Latest arrival time on each processor, 0 if there is no edge
+        :rtype: numpy.ndarray
+        """
+        if len(edges) == 0:
+            return np.zeros(self.q)
+        return (finishes[:, None] + self.rows(edges, procs)).max(axis=0)
+
+    def meanCosts(self, meanL, meanB):
+        """ Return the communication cost of every edge using mean value for startup time and transfer rate
+
+        :param meanL: Mean startup time
+        :type meanL: float
+        :param meanB: Mean transfer rate
+        :type meanB: float
+        :return: Mean communication cost of every edge
+        :rtype: numpy.ndarray
+        """
+        if self._mean is None or self._mean[0] != (meanL, meanB):
+            self._mean = ((meanL, meanB), meanL + self.weights / meanB)
+        return self._mean[1]
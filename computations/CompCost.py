@@ -7,13 +7,18 @@ def computeCompCost(g, costFunction='mean', verbose=False):
     """Compute computation cost according to costFunction
 
     :param g: DAG used
-    :type g: networkx.DiGraph
+    :type g: networkx.DiGraph | CompiledDAG
     :param costFunction: Function used to compute computation cost ('mean', 'median', 'max', 'min')
     :type costFunction: str
     :param verbose: Print non-necessary information ?
     :type verbose: bool
     :rtype: None
     """
+    if hasattr(g, 'stages') and ('compcost', costFunction) in g.stages:
+        g.graph['meancompcost'] = g.stages['compcost', costFunction]
+        if verbose:
+            print(costFunction, "CompCost : ", g.graph['meancompcost'])
+        return
     g.graph['meancompcost'] = []
     q = g.graph['nbproc']
     for vertex in g.nodes:
@@ -35,5 +40,7 @@ def computeCompCost(g, costFunction='mean', verbose=False):
         else:
             raise StrategyCostFException(costFunction)
         g.graph['meancompcost'].append(t)
+    if hasattr(g, 'stages'):
+        g.stages['compcost', costFunction] = g.graph['meancompcost']
     if verbose:
         print(costFunction, "CompCost : ", g.graph['meancompcost'])
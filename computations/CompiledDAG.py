@@ -0,0 +1,245 @@
+import copy
+
+import networkx as nx
+import numpy as np
+
+from computations.CommCost import CommTensor
+
+
+class CompiledDAG:
+    """ Array-backed view of a DAG, built once from the networkx.DiGraph returned by readFile
+
+    Nodes are labelled from 1 to n, data related to node i being stored at index i - 1 of every array. Predecessors
+    and successors are stored in CSR format, edge weights being aligned with them, and the communication cost of every
+    edge is precomputed for the platform (see CommTensor). The usual attributes of a
+    networkx.DiGraph (graph, nodes, edges, predecessors, successors) are provided as well, so that every computation
+    accepts a compiled DAG in place of the original graph. The **graph** dict is shared with the original graph.
+
+    Results that only depend on the DAG and the platform are memoized in **stages** by the computations producing them.
+    A compiled DAG is only valid for the platform (nbproc, B, L) it was built for : see isCurrent and compileDAG.
+    **baseArrays** holds every array the DAG is built from, so that it can be rebuilt elsewhere with fromArrays.
+    """
+
+    def __init__(self, g):
+        nodes = list(g.nodes)
+        n = len(nodes)
+        edges = {}
+        edgeId = {}
+        succPtr = [0]
+        succIdx = []
+        succWeight = []
+        for i in range(1, n + 1):
+            for j in g.successors(i):
+                edgeId[i, j] = len(succIdx)
+                edges[i, j] = dict(g.edges[i, j])
+                succIdx.append(j - 1)
+                succWeight.append(g.edges[i, j]['weight'])
+            succPtr.append(len(succIdx))
+        predPtr = [0]
+        predIdx = []
+        predEdge = []
+        for j in range(1, n + 1):
+            for i in g.predecessors(j):
+                predIdx.append(i - 1)
+                predEdge.append(edgeId[i, j])
+            predPtr.append(len(predIdx))
+        arrays = {'nodes': np.array(nodes, dtype=np.int64),
+                  'topo': np.array(list(nx.topological_sort(g)), dtype=np.int64),
+                  'succPtr': np.array(succPtr, dtype=np.int64),
+                  'succIdx': np.array(succIdx, dtype=np.int64),
+                  'succWeight': np.array(succWeight, dtype=float),
+                  'predPtr': np.array(predPtr, dtype=np.int64),
+                  'predIdx': np.array(predIdx, dtype=np.int64),
+                  'predEdge': np.array(predEdge, dtype=np.int64),
+                  'cost': np.array(g.graph['costmatrix'], dtype=float)}
+        self.source = g
+        self._setup(g.graph, arrays, edges)
+
+    @classmethod
+    def fromArrays(cls, graph, arrays):
+        """ Build a compiled DAG from the arrays of another one, without the original networkx.DiGraph
+
+        :param graph: Graph attributes (nbproc, B, L, costmatrix, ..)
+        :type graph: dict
+        :param arrays: Arrays describing the DAG, as returned by **baseArrays**
+        :type arrays: dict[str, numpy.ndarray]
+        :return: The compiled DAG
+        :rtype: CompiledDAG
+        """
+        dag = cls.__new__(cls)
+        dag.source = None
+        dag._setup(graph, arrays)
+        return dag
+
+    def _setup(self, graph, arrays, edges=None):
+        self.graph = graph
+        self.baseArrays = arrays
+        self.nodes = arrays['nodes'].tolist()
+        self.n = len(self.nodes)
+        self.q = graph['nbproc']
+        self.topo = arrays['topo'].tolist()
+
+        self.succPtr = arrays['succPtr']
+        self.succIdx = arrays['succIdx']
+        self.succWeight = arrays['succWeight']
+        self.predPtr = arrays['predPtr']
+        self.predIdx = arrays['predIdx']
+        self.predEdge = arrays['predEdge']
+        self.predWeight = self.succWeight[self.predEdge]
+        self.edgeSrc = np.repeat(np.arange(self.n, dtype=np.int64), np.diff(self.succPtr))
+        self.edgeDst = self.succIdx
+
+        succPtr = self.succPtr.tolist()
+        succs = (self.succIdx + 1).tolist()
+        self._succs = [succs[succPtr[i]:succPtr[i + 1]] for i in range(self.n)]
+        predPtr = self.predPtr.tolist()
+        preds = (self.predIdx + 1).tolist()
+        self._preds = [preds[predPtr[j]:predPtr[j + 1]] for j in range(self.n)]
+        self.edgeId = {(i, j): e for e, (i, j) in enumerate(zip((self.edgeSrc + 1).tolist(), succs))}
+        if edges is None:
+            edges = {edge: {'weight': w} for edge, w in zip(self.edgeId, self.succWeight.tolist())}
+        self.edges = edges
+
+        self.cost = arrays['cost']
+        self.B = np.array(graph['B'], dtype=float)
+        self.L = np.array(graph['L'], dtype=float)
+        self.commTensor = CommTensor(self.succWeight, self.B, self.L[:self.q])
+        self.levels = self._computeLevels()
+        self._levelSegments = {}
+        self.platform = copy.deepcopy((self.q, graph['B'], graph['L']))
+        self.stages = {}
+
+    def isCurrent(self):
+        """ Check whether the platform described in **graph** is still the one the DAG was compiled for
+
+        :return: True if nbproc, B and L did not change since compilation
+        :rtype: bool
+        """
+        return self.platform == (self.graph['nbproc'], self.graph['B'], self.graph['L'])
+
+    def _computeLevels(self):
+        """ Split the nodes into topological levels, every predecessor of a node being in a former level
+
+        :return: Indexes of the nodes of each level, sorted
+        :rtype: list[numpy.ndarray]
+        """
+        remaining = np.diff(self.predPtr)
+        frontier = np.flatnonzero(remaining == 0)
+        levels = []
+        while frontier.size:
+            levels.append(frontier)
+            succs = self.succIdx[csrPositions(self.succPtr, frontier)]
+            remaining = remaining - np.bincount(succs, minlength=self.n)
+            succs = np.unique(succs)
+            frontier = succs[remaining[succs] == 0]
+        return levels
+
+    def levelSegments(self, succ):
+        """ Return for every level the CSR positions of the successors (or predecessors) of its nodes, computed once
+
+        :param succ: Consider successors instead of predecessors ?
+        :type succ: bool
+        :return: For every level, its nodes, the positions of their entries, the start of every non-empty segment of
+            entries and which nodes have such a segment
+        :rtype: list[(numpy.ndarray, numpy.ndarray, numpy.ndarray, numpy.ndarray)]
+        """
+        if succ not in self._levelSegments:
+            ptr = self.succPtr if succ else self.predPtr
+            order = np.concatenate(self.levels)
+            cuts = np.cumsum([len(level) for level in self.levels])[:-1]
+            lengths = ptr[order + 1] - ptr[order]
+            ends = np.cumsum(lengths)
+            starts = ends - lengths  # Start of the segment of each node among all the entries
+            levelStarts = np.concatenate(([0], ends[cuts - 1]))  # Start of the entries of each level
+            segments = []
+            for level, pos, start, full, base in zip(self.levels, np.split(csrPositions(ptr, order), ends[cuts - 1]),
+                                                     np.split(starts, cuts), np.split(lengths > 0, cuts),
+                                                     levelStarts):
+                segments.append((level, pos, start[full] - base, full))
+            self._levelSegments[succ] = segments
+        return self._levelSegments[succ]
+
+    def predecessors(self, node):
+        """ Return the predecessors of **node**
+
+        :param node: Node to consider
+        :type node: int
+        :return: Predecessors of **node**, in the order of the original graph
+        :rtype: list[int]
+        """
+        return self._preds[node - 1]
+
+    def successors(self, node):
+        """ Return the successors of **node**
+
+        :param node: Node to consider
+        :type node: int
+        :return: Successors of **node**, in the order of the original graph
+        :rtype: list[int]
+        """
+        return self._succs[node - 1]
+
+    def number_of_nodes(self):
+        return self.n
+
+    def number_of_edges(self):
+        return len(self.edges)
+
+
+def csrPositions(ptr, nodes):
+    """ Return the positions, in CSR arrays indexed by **ptr**, of the entries of every node of **nodes**
+
+    :param ptr: Index pointer of the CSR arrays (succPtr or predPtr)
+    :type ptr: numpy.ndarray
+    :param nodes: Indexes of the nodes to consider
+    :type nodes: numpy.ndarray
+    :return: Positions of the entries, grouped by node in the order of **nodes**
+    :rtype: numpy.ndarray
+    """
+    starts = ptr[nodes]
+    lengths = ptr[nodes + 1] - starts
+    return np.repeat(starts - np.cumsum(lengths) + lengths, lengths) + np.arange(lengths.sum())
+
+
+def segmentMax(values, starts, full):
+    """ Return for every node the greatest of the values of its segment, 0 if it has none (see levelSegments)
+
+    :param values: Values of the entries, grouped by node (one row per entry if 2-dimensional)
+    :type values: numpy.ndarray
+    :param starts: Start of every non-empty segment in **values**
+    :type starts: numpy.ndarray
+    :param full: Which nodes have a non-empty segment
+    :type full: numpy.ndarray
+    :return: Greatest value (or row-wise greatest values) of each node
+    :rtype: numpy.ndarray
+    """
+    res = np.zeros((len(full),) + values.shape[1:])
+    if values.size:
+        res[full] = np.maximum.reduceat(values, starts, axis=0)
+    return res
+
+
+def compileDAG(g, check=False):
+    """ Compute if necessary the compiled version of **g**, else just return it
+
+    The compiled version (and everything memoized in it) is dropped and built again when the platform changed. This
+    is always checked for a networkx.DiGraph, and only if **check** is set for an already compiled DAG, so that
+    computations called in loops are not slowed down. A DAG rebuilt with CompiledDAG.fromArrays has no original graph
+    to compile again, and is returned as is.
+
+    :param g: DAG to compile
+    :type g: networkx.DiGraph | CompiledDAG
+    :param check: Check the platform of an already compiled DAG ?
+    :type check: bool
+    :return: Compiled version of **g**
+    :rtype: CompiledDAG
+    """
+    if isinstance(g, CompiledDAG):
+        if not check or g.isCurrent() or g.source is None:
+            return g
+        g = g.source
+    dag = g.graph.get('compiled')
+    if dag is None or not dag.isCurrent():
+        dag = CompiledDAG(g)
+        g.graph['compiled'] = dag
+    return dag
@@ -1,7 +1,8 @@
-import math
+import numpy as np
 
-from computations.EarliestTimes import computeEFT
-from computations.Lookahead import getLookAheadFun
+from computations.CompiledDAG import compileDAG
+from computations.EarliestTimes import computeEFT, computeAllEFT, ESTMatrix
+from computations.Lookahead import getLookAheadFun, NOP
 
 
 def DL(g, i, m, schedule, desc=None, verbose=False, insertion=False, nodes=None, isGDL=False, estimate=False):
@@ -22,7 +23,7 @@ def DL(g, i, m, schedule, desc=None, verbose=False, insertion=False, nodes=None,
     :param insertion: Use of insertion policy ?
     :type insertion: bool
     :param nodes: List of nodes sorted
-    :type nodes: list[int]
+    :type nodes: OrderedNodes | list[int]
     :param isGDL: Using GDL or DL ?
     :type isGDL: bool
     :return: DL(i, m, schedule)
@@ -40,7 +41,45 @@ def DL(g, i, m, schedule, desc=None, verbose=False, insertion=False, nodes=None,
     return getLookAheadFun(desc)(g, i, m, nodes, "DL", schedule, dl)
 
 
-def C(g, i, m, schedule, verbose=False, insertion=False):
+def computeAllDL(g, i, schedule, desc=None, verbose=False, insertion=False, nodes=None, estimate=False, est=None):
+    """ Compute the Dynamic Level of a given node on every proc on a given schedule
+
+    :param g: DAG to schedule
+    :type g: networkx.DiGraph | CompiledDAG
+    :param i: Task to schedule
+    :type i: int
+    :param schedule: Schedule at this point
+    :type schedule: Schedule
+    :param desc: Lookahead strategy
+    :type desc: str
+    :param verbose: Print non-necessary information ?
+    :type verbose: bool
+    :param insertion: Use of insertion policy ?
+    :type insertion: bool
+    :param nodes: List of nodes sorted
+    :type nodes: OrderedNodes | list[int]
+    :param est: EST of **i** on every proc, if already known
+    :type est: numpy.ndarray
+    :return: DL(i, m, schedule) for every proc m
+    :rtype: numpy.ndarray
+    """
+    g = compileDAG(g)
+    if nodes is None:
+        nodes = []
+    q = g.graph['nbproc']
+    rku = g.graph['prio'][i - 1]
+    if isinstance(rku, list):  # In case of more precise priority, use rku[m] instead of rku*
+        rku = np.array(rku[:q], dtype=float)
+    if est is None:
+        est = computeAllEFT(g, i, schedule, verbose=verbose, insertion=insertion, estimate=estimate)[0]
+    dl = rku - est + g.graph['meancompcost'][i - 1] - g.cost[i - 1, :q]
+    lookAhead = getLookAheadFun(desc)
+    if lookAhead is not NOP:
+        dl = np.array([lookAhead(g, i, m, nodes, "DL", schedule, dl[m]) for m in range(q)])
+    return dl
+
+
+def C(g, i, m, schedule, verbose=False, insertion=False, est=None):
     """ Compute the C term of GDL *id est* the cost in not scheduling a node on its preferred processor
 
     :param g: DAG to schedule
@@ -55,17 +94,98 @@ def C(g, i, m, schedule, verbose=False, insertion=False):
     :type verbose: bool
     :param insertion: Use of insertion policy ?
     :type insertion: bool
+    :param est: EST of **i** on every proc, if already known
+    :type est: numpy.ndarray
     :return: C(i, m)
     :rtype: float
     """
-    dl = DL(g, i, m, schedule, verbose=verbose, insertion=insertion)
+    dl = computeAllDL(g, i, schedule, verbose=verbose, insertion=insertion, est=est)
     if g.graph['nbproc'] > 1:
-        return dl - max(
-            [DL(g, i, n, schedule, verbose=verbose, insertion=insertion) for n in range(g.graph['nbproc']) if n != m])
-    return dl
+        return dl[m] - np.delete(dl, m).max()
+    return dl[m]
+
+
+class DLMatrix(ESTMatrix):
+    """ Dynamic Levels (without lookahead) of the ready tasks on every proc, maintained along a schedule being built
+
+    DL only depends on the EST of a task besides constant terms, so that the column of the proc chosen is updated along
+    with the EST at each placement. The DL computed without insertion, used by the C term of GDL, is kept as well.
+    """
+
+    fields = ESTMatrix.fields + ('rku', 'meanw', 'dl', 'est0', 'dl0')
+
+    def _slot(self, node):
+        """ Return the row of **node**, computing it if needed """
+        if node in self.slots:
+            return self.slots[node]
+        row = super()._slot(node)
+        rku = self.g.graph['prio'][node - 1]
+        if isinstance(rku, list):  # In case of more precise priority, use rku[m] instead of rku*
+            rku = rku[:self.q]
+        self.rku[row] = rku
+        self.meanw[row] = self.g.graph['meancompcost'][node - 1]
+        self.dl[row] = self.rku[row] - self.est[row] + self.meanw[row] - self.w[row]
+        if self.insertion:
+            self.est0[row] = np.maximum(self.schedule.procEnds(self.q), self.dft[row])
+            self.dl0[row] = self.rku[row] - self.est0[row] + self.meanw[row] - self.w[row]
+        return row
 
+    def levels(self, nodes):
+        """ Return the DL of several ready tasks on every proc
 
-def GDL(g, i, schedule, desc, verbose=False, insertion=False, nodes=None):
+        :param nodes: Ready tasks
+        :type nodes: list[int]
+        :return: DL matrix, one row per task (in the order of **nodes**) and one column per proc
+        :rtype: numpy.ndarray
+        """
+        rows = [self._slot(node) for node in nodes]
+        return self.dl[rows]
+
+    def generalizedLevels(self, nodes, dl=None):
+        """ Return the GDL of several ready tasks, along with the proc maximizing their DL
+
+        The C term is the DL without insertion on the preferred proc minus the greatest one on the other procs.
+
+        :param nodes: Ready tasks
+        :type nodes: list[int]
+        :param dl: DL of **nodes** on every proc, if not the ones of the matrix (for instance when using a lookahead)
+        :type dl: numpy.ndarray
+        :return: GDL of every task and the corresponding preferred proc
+        :rtype: (numpy.ndarray, numpy.ndarray)
+        """
+        rows = [self._slot(node) for node in nodes]
+        if dl is None:
+            dl = self.dl[rows]
+        dl0 = self.dl0[rows] if self.insertion else self.dl[rows]
+        k = np.arange(len(rows))
+        pm = np.argmax(dl, axis=1)
+        c = dl0[k, pm]
+        if self.q > 1:
+            others = dl0.copy()
+            others[k, pm] = -np.inf
+            c = c - others.max(axis=1)
+        return dl[k, pm] + c, pm
+
+    def commit(self, node):
+        """ Update the matrices once **node** has been scheduled (see ESTMatrix.commit)
+
+        :param node: Task just scheduled
+        :type node: int
+        :rtype: None
+        """
+        super().commit(node)
+        if not self.slots:
+            return
+        proc = int(self.schedule[node][0])
+        rows = np.fromiter(self.slots.values(), dtype=np.int64, count=len(self.slots))
+        self.dl[rows, proc] = self.rku[rows, proc] - self.est[rows, proc] + self.meanw[rows, proc] - self.w[rows, proc]
+        if self.insertion:
+            self.est0[rows, proc] = np.maximum(self.schedule.procEnd(proc), self.dft[rows, proc])
+            self.dl0[rows, proc] = self.rku[rows, proc] - self.est0[rows, proc] + self.meanw[rows, proc] - \
+                self.w[rows, proc]
+
+
+def GDL(g, i, schedule, desc, verbose=False, insertion=False, nodes=None, ests=None):
     """ Compute Generalized Dynamic Level of a given node on a given schedule
 
     :param g: DAG to schedule
@@ -80,16 +200,22 @@ def GDL(g, i, schedule, desc, verbose=False, insertion=False, nodes=None):
     :type verbose: bool
     :param insertion: Use of insertion policy ?
     :type insertion: bool
+    :param nodes: List of nodes sorted
+    :type nodes: OrderedNodes | list[int]
+    :param ests: DL of the ready tasks, maintained along **schedule**
+    :type ests: DLMatrix
     :return: GDL(i, schedule)
     :rtype: float
     """
     # GDL de base, peut-être capable de généraliser le résultat ici
     # en utilisant PLAC(ti,pm*) - maxPLAC(ti,pn) + PLAC(ti,pm*) de manière générale, et pas juste pour DL ...
-    pm = None
-    m = -math.inf
-    for p in range(g.graph['nbproc']):
-        dl = DL(g, i, p, schedule, desc=desc, verbose=verbose, insertion=insertion, nodes=nodes, isGDL=True)
-        if dl > m:
-            m = dl
-            pm = p
-    return m + C(g, i, pm, schedule, verbose=False, insertion=False), pm
+    if ests is not None:
+        dl = None
+        if getLookAheadFun(desc) is not NOP:
+            dl = computeAllDL(g, i, schedule, desc=desc, verbose=verbose, insertion=insertion, nodes=nodes,
+                              est=ests.row(i))[None, :]
+        gdl, pm = ests.generalizedLevels([i], dl)
+        return gdl[0], int(pm[0])
+    dl = computeAllDL(g, i, schedule, desc=desc, verbose=verbose, insertion=insertion, nodes=nodes)
+    pm = int(np.argmax(dl))
+    return dl[pm] + C(g, i, pm, schedule, verbose=False, insertion=False), pm
@@ -1,4 +1,8 @@
+import numpy as np
+
 from computations.CommCost import *
+from computations.CompiledDAG import compileDAG
+from computations.Schedule import Schedule
 
 
 def computeEFT(g, node, proc, schedule, verbose=False, insertion=False, estimate=False):
@@ -11,7 +15,7 @@ def computeEFT(g, node, proc, schedule, verbose=False, insertion=False, estimate
     :param proc: Proc to schedule **node** on
     :type proc: int
     :param schedule: Tasks already scheduled to this point
-    :type schedule: dict[int, (int, float, float)]
+    :type schedule: Schedule
     :param verbose: Print non-necessary information ?
     :type verbose: bool
     :param insertion: Use of insertion-based policy ?
@@ -23,21 +27,14 @@ def computeEFT(g, node, proc, schedule, verbose=False, insertion=False, estimate
     """
     if node is None:
         return 0, 0
+    if not isinstance(schedule, Schedule):
+        schedule = Schedule(schedule)
     dft, onproc = computeDFT(g, node, proc, schedule, verbose, estimate)
-    scheduled = False
-    est = 0
     w = g.graph['costmatrix'][node - 1][proc]
     if insertion:
-        for i in range(len(onproc)-1):
-            if onproc[i + 1][1] <= dft and onproc[i][0] - dft >= w and onproc:
-                scheduled = True
-                est = dft
-                break
-    if not scheduled:
-        if len(onproc) > 0:
-            est = max(max(map(lambda x: x[1], onproc)), dft)
-        else:
-            est = dft
+        est = schedule.earliestStart(proc, dft, w)
+    else:
+        est = max(schedule.procEnd(proc), dft)
     return est, est + w
 
 
@@ -52,27 +49,199 @@ def computeDFT(g, node, proc, schedule, verbose=False, estimate=False):
     :param proc: Proc to schedule **node** on
     :type proc: int
     :param schedule: Tasks already scheduled to this point
-    :type schedule: dict[int, (int, float, float)]
+    :type schedule: Schedule
     :param verbose: Print non-necessary information ?
     :type verbose: bool
     :param estimate: Do we know the scheduling of all predecessors ? #TODO Test this
     :type estimate: bool
-    :return: DFT and list of tasks on proc **proc**
-    :rtype: (float,list[list[int]])
+    :return: DFT and timeline of tasks on proc **proc**, sorted by start time
+    :rtype: (float,list[(float, float, int)])
     """
     if node is None:
         return 0, 0
-    onproc = []
+    if not isinstance(schedule, Schedule):
+        schedule = Schedule(schedule)
     DFT = 0
     for pred in g.predecessors(node):
         if pred in schedule or not estimate:
             AFT = schedule[pred][2] + commCost(g, pred, node, schedule[pred][0], proc)
             if AFT > DFT:
                 DFT = AFT
-    for c in schedule:
-        if schedule[c][0] == proc:
-            onproc.append((schedule[c][1], schedule[c][2]))
-    onproc = sorted(onproc, key=lambda x: x[0], reverse=True)
+    onproc = schedule.onProc(proc)
     if verbose:
         print("DFT of task", node, ":", DFT, ". On proc :", onproc)
     return DFT, onproc
+
+
+def computeAllEFT(g, node, schedule, verbose=False, insertion=False, estimate=False):
+    """ Compute Earliest Start and Finish Times for a given node on every proc according to a given schedule
+
+    :param g: DAG used
+    :type g: networkx.DiGraph | CompiledDAG
+    :param node: Node to try scheduling
+    :type node: int
+    :param schedule: Tasks already scheduled to this point
+    :type schedule: Schedule
+    :param verbose: Print non-necessary information ?
+    :type verbose: bool
+    :param insertion: Use of insertion-based policy ?
+    :type insertion: bool
+    :param estimate: Do we know the scheduling of all predecessors ?
+    :type estimate: bool
+    :return: EST and EFT for given node, indexed by proc
+    :rtype: (numpy.ndarray, numpy.ndarray)
+    """
+    g = compileDAG(g)
+    q = g.graph['nbproc']
+    if node is None:
+        return np.zeros(q), np.zeros(q)
+    if not isinstance(schedule, Schedule):
+        schedule = Schedule(schedule)
+    dft = computeAllDFT(g, node, schedule, verbose, estimate)
+    w = g.cost[node - 1, :q]
+    est = np.maximum(schedule.procEnds(q), dft)
+    if insertion:
+        for proc in np.flatnonzero(dft < est):  # Data available while the proc is still busy : look for a gap
+            est[proc] = schedule.earliestStart(int(proc), dft[proc], w[proc])
+    return est, est + w
+
+
+def computeAllDFT(g, node, schedule, verbose=False, estimate=False):
+    """ Compute Data Finish Time for a given node on every proc according to a given schedule, using the finish time
+    and proc of each predecessor along with the precomputed communication costs of the corresponding edge
+
+    :param g: DAG used
+    :type g: networkx.DiGraph | CompiledDAG
+    :param node: Node to try scheduling
+    :type node: int
+    :param schedule: Tasks already scheduled to this point
+    :type schedule: Schedule
+    :param verbose: Print non-necessary information ?
+    :type verbose: bool
+    :param estimate: Do we know the scheduling of all predecessors ?
+    :type estimate: bool
+    :return: DFT for given node, indexed by proc
+    :rtype: numpy.ndarray
+    """
+    g = compileDAG(g)
+    preds = g.predecessors(node)
+    edges = g.predEdge[g.predPtr[node - 1]:g.predPtr[node]]
+    if estimate:
+        known = [k for k, pred in enumerate(preds) if pred in schedule]
+        preds = [preds[k] for k in known]
+        edges = edges[known]
+    procs = np.array([schedule[pred][0] for pred in preds], dtype=np.int64)
+    finishes = np.array([schedule[pred][2] for pred in preds], dtype=float)
+    DFT = g.commTensor.arrivalTimes(edges, procs, finishes)
+    if verbose:
+        print("DFT of task", node, ":", DFT)
+    return DFT
+
+
+class ESTMatrix:
+    """ Earliest Start Times of the ready tasks on every proc, maintained along a schedule being built
+
+    The DFT of a ready task does not change anymore, as every predecessor is scheduled, and placing a task on a proc
+    only changes the EST on that proc. The row of a task is thus computed once, when first requested, and only the
+    column of the proc chosen is updated at each placement (see commit). Rows are kept in matrices (one per name in
+    **fields**), slots of the scheduled tasks being reused.
+    """
+
+    fields = ('dft', 'w', 'est')
+
+    def __init__(self, g, schedule, verbose=False, insertion=False):
+        """
+        :param g: DAG to schedule
+        :type g: networkx.DiGraph | CompiledDAG
+        :param schedule: Schedule being built, committed tasks only
+        :type schedule: Schedule
+        :param verbose: Print non-necessary information ?
+        :type verbose: bool
+        :param insertion: Use of insertion-based policy ?
+        :type insertion: bool
+        """
+        self.g = compileDAG(g)
+        self.schedule = schedule
+        self.verbose = verbose
+        self.insertion = insertion
+        self.q = self.g.graph['nbproc']
+        self.slots = {}  # {task : row,..}
+        self.free = []
+        for field in self.fields:
+            setattr(self, field, np.empty((0, self.q)))
+
+    def _slot(self, node):
+        """ Return the row of **node**, computing it if needed """
+        row = self.slots.get(node)
+        if row is not None:
+            return row
+        if not self.free:
+            size = len(self.est)
+            grow = max(size, 8)
+            for field in self.fields:
+                setattr(self, field, np.concatenate((getattr(self, field), np.empty((grow, self.q)))))
+            self.free = list(range(size + grow - 1, size - 1, -1))
+        row = self.free.pop()
+        self.slots[node] = row
+        dft = computeAllDFT(self.g, node, self.schedule, self.verbose)
+        w = self.g.cost[node - 1, :self.q]
+        est = np.maximum(self.schedule.procEnds(self.q), dft)
+        if self.insertion:
+            for proc in np.flatnonzero(dft < est):
+                est[proc] = self.schedule.earliestStart(int(proc), dft[proc], w[proc])
+        self.dft[row] = dft
+        self.w[row] = w
+        self.est[row] = est
+        return row
+
+    def rows(self, nodes):
+        """ Return the EST of several ready tasks on every proc
+
+        :param nodes: Ready tasks
+        :type nodes: list[int]
+        :return: EST matrix, one row per task (in the order of **nodes**) and one column per proc
+        :rtype: numpy.ndarray
+        """
+        rows = [self._slot(node) for node in nodes]
+        return self.est[rows]
+
+    def row(self, node, insertion=None):
+        """ Return the EST of a ready task on every proc
+
+        :param node: Ready task
+        :type node: int
+        :param insertion: Use of insertion-based policy ? Same as the matrix if None
+        :type insertion: bool
+        :return: EST of **node**, indexed by proc
+        :rtype: numpy.ndarray
+        """
+        row = self._slot(node)
+        if insertion is None or insertion == self.insertion:
+            return self.est[row].copy()
+        est = np.maximum(self.schedule.procEnds(self.q), self.dft[row])
+        if insertion:
+            for proc in np.flatnonzero(self.dft[row] < est):
+                est[proc] = self.schedule.earliestStart(int(proc), self.dft[row, proc], self.w[row, proc])
+        return est
+
+    def commit(self, node):
+        """ Update the matrix once **node** has been scheduled : its row is freed and the column of its proc computed
+        again for every other task
+
+        :param node: Task just scheduled
+        :type node: int
+        :rtype: None
+        """
+        row = self.slots.pop(node, None)
+        if row is not None:
+            self.free.append(row)
+        if not self.slots:
+            return
+        proc = int(self.schedule[node][0])
+        rows = np.fromiter(self.slots.values(), dtype=np.int64, count=len(self.slots))
+        dft = self.dft[rows, proc]
+        est = np.maximum(self.schedule.procEnd(proc), dft)
+        if self.insertion:
+            for k in np.flatnonzero(dft < est):
+                est[k] = self.schedule.earliestStart(proc, dft[k], self.w[rows[k], proc])
+        self.est[rows, proc] = est
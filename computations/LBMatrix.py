@@ -5,13 +5,19 @@ def computeLB(g, costFunction='mean', verbose=False):
     """Compute communication cost according to costFunction
 
     :param g: DAG used
-    :type g: networkx.DiGraph
+    :type g: networkx.DiGraph | CompiledDAG
     :param costFunction: Function used to compute communication cost ('mean', 'median', 'max', 'min')
     :type costFunction: str
     :param verbose: Print non-necessary information ?
     :type verbose: bool
     :rtype: None
     """
+    if hasattr(g, 'stages') and ('lb', costFunction) in g.stages:
+        g.graph['meanB'], g.graph['meanL'] = g.stages['lb', costFunction]
+        if verbose:
+            print("MeanB : ", g.graph['meanB'])
+            print("MeanL : ", g.graph['meanL'])
+        return
     q = g.graph['nbproc']
     meanBV = []
     meanB = meanL = 0
@@ -34,6 +40,8 @@ def computeLB(g, costFunction='mean', verbose=False):
         exit()
     g.graph['meanB'] = meanB
     g.graph['meanL'] = meanL
+    if hasattr(g, 'stages'):
+        g.stages['lb', costFunction] = meanB, meanL
     if verbose:
         print("MeanB : ", g.graph['meanB'])
         print("MeanL : ", g.graph['meanL'])
@@ -1,11 +1,45 @@
-import math
+import numpy as np
 
 from computations.BIMStarValue import computeBIMStar
-from computations.CommCost import commCost, meanCommCost
+from computations.CommCost import meanCommCost
+from computations.CompiledDAG import compileDAG, segmentMax
 from computations.EarliestTimes import computeEFT
+from computations.ReadyTasks import OrderedNodes
 from exceptions.StrategyLookAheadException import StrategyLookAheadException
 
 
+def lookaheadTables(g):
+    """ Compute for every node the descendant to which it passes the most data and the F term of DLS towards it, on
+    every proc
+
+    Both only depend on the graph and on the platform, and are memoized in the stages of the compiled DAG.
+
+    :param g: DAG to schedule
+    :type g: networkx.DiGraph | CompiledDAG
+    :return: Heaviest successor of every node (0 if none), indexed by node - 1, and F(i, j, m) indexed by i - 1 and m
+    :rtype: (numpy.ndarray, numpy.ndarray)
+    """
+    g = compileDAG(g)
+    if 'lookahead' in g.stages:
+        return g.stages['lookahead']
+    q = g.graph['nbproc']
+    counts = np.diff(g.succPtr)
+    full = counts > 0
+    heaviest = np.zeros(g.n, dtype=np.int64)
+    f = np.zeros((g.n, q))
+    if len(g.succIdx):
+        # First successor (in order of g.successors) with the greatest positive weight, as DC used to do
+        heaviestWeight = segmentMax(g.succWeight, g.succPtr[:-1][full], full)
+        src = g.edgeSrc
+        candidates = np.flatnonzero((g.succWeight == heaviestWeight[src]) & (g.succWeight > 0))
+        nodes, first = np.unique(src[candidates], return_index=True)
+        edges = candidates[first]
+        heaviest[nodes] = g.succIdx[edges] + 1
+        f[nodes] = g.commTensor.minPlus(edges, g.cost[g.succIdx[edges], :q])
+    g.stages['lookahead'] = heaviest, f
+    return heaviest, f
+
+
 def F(g, i, j, m):
     """ Compute the F term of DLS *id est* how quickly succ(i) can be completed on any other processor than PE(i)
 
@@ -20,16 +54,12 @@ def F(g, i, j, m):
     :return: F(i, j, m)
     :rtype: float
     """
-    q = g.graph['nbproc']
-    f = math.inf
     if m is None:
-        f = meanCommCost(g, i, j) + g.graph['meancompcost'][j - 1]
-    else:
-        for p in range(q):
-            fp = commCost(g, i, j, m, p) + g.graph['costmatrix'][j - 1][p]
-            if fp < f:
-                f = fp
-    return f
+        return meanCommCost(g, i, j) + g.graph['meancompcost'][j - 1]
+    g = compileDAG(g)
+    q = g.graph['nbproc']
+    comm = g.commTensor.rows(np.array([g.edgeId[i, j]]), np.array([m]))[0]
+    return float((comm + g.cost[j - 1, :q]).min())
 
 
 def DC(g, i, m):
@@ -44,15 +74,13 @@ def DC(g, i, m):
     :return: DC(i,m)
     :rtype: float
     """
-    ma = 0
-    j = None
-    for s in g.successors(i):
-        if g.edges[i, s]['weight'] > ma:
-            ma = g.edges[i, s]['weight']
-            j = s
-    if j is None:
+    heaviest, f = lookaheadTables(g)
+    j = int(heaviest[i - 1])
+    if j == 0:
         return 0
-    return g.graph['meancompcost'][j - 1] - F(g, i, j, m)
+    if m is None:
+        return g.graph['meancompcost'][j - 1] - F(g, i, j, m)
+    return g.graph['meancompcost'][j - 1] - float(f[i - 1, m])
 
 
 def DLSDC(g, i, m, nodes, placeStrat, schedule, placeValue):
@@ -89,10 +117,12 @@ def DCP(g, i, m, nodes, placeStrat, schedule, placeValue):
     secondValue = 0
     if not nodes:
         return placeValue
-    nextNode = [x for x in nodes if x in g.successors(i)]
-    if not nextNode:
+    if isinstance(nodes, OrderedNodes):
+        nextNode = nodes.nextSuccessor(g, i)
+    else:
+        nextNode = next((x for x in nodes if x in g.successors(i)), None)
+    if nextNode is None:
         return placeValue
-    nextNode = nextNode[0]
     if placeStrat == "EFT":
         secondValue = computeEFT(g, nextNode, m, schedule, verbose=False, insertion=True, estimate=True)[1]
     elif placeStrat == "BIM*":
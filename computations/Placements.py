@@ -1,90 +1,50 @@
 import math
-from typing import Dict, Tuple
 
-from computations.BIMStarValue import computeBIMStar
+import numpy as np
+
+from computations.BIMStarValue import computeAllBIMStar
 from computations.CompCost import computeCompCost
-from computations.DynamicLevel import DL, GDL
+from computations.DynamicLevel import computeAllDL, DLMatrix, GDL
 from computations.EarliestTimes import *
 from computations.LBMatrix import computeLB
-from computations.Lookahead import getLookAheadFun
+from computations.Lookahead import getLookAheadFun, NOP
 from computations.Priorities import identifyCP
+from computations.ReadyTasks import OrderedNodes, ReadyTasks
+from computations.Schedule import Schedule
 from help.Printer import printSchedule
 
 
-def updateReadyTasks(g, readyTasks, nodes, scheduledNode, deletion=True, verbose=False):
-    """ Update the list of ready tasks after scheduling of a node
-
-    :param g: DAG to schedule
-    :type g: networkx.DiGraph
-    :param readyTasks: List of ready tasks
-    :type readyTasks: list[int]
-    :param nodes: Ordered list of nodes
-    :type nodes: list[int]
-    :param scheduledNode: Node scheduled
-    :type scheduledNode: int
-    :param deletion: Should we delete readyTask from nodes ?
-    :type deletion: bool
-    :param verbose: Print non-necessary information ?
-    :type verbose: bool
-
-    :rtype: None
-    """
-    for n in g.successors(scheduledNode):
-        ready = True
-        for p in g.predecessors(n):
-            if p in readyTasks or p in nodes:
-                ready = False
-        if ready:
-            if n not in readyTasks:
-                readyTasks.append(n)
-            if deletion and n in nodes:
-                nodes.remove(n)
-    if verbose:
-        print("Ready task list after update :", readyTasks)
-
-
-def computeCurrentNodeBIM(g, readyTasks, schedule, verbose=False, insertion=True):
+def computeCurrentNodeBIM(g, readyTasks, schedule, verbose=False, insertion=True, ests=None):
     """ Determine node to schedule using the BIM policy
 
     :param g: DAG to schedule
     :type g: networkx.DiGraph
-    :param readyTasks: List of ready tasks
-    :type readyTasks: list[int]
+    :param readyTasks: Ready tasks
+    :type readyTasks: ReadyTasks | list[int]
     :param schedule: Schedule at this point
-    :type schedule: dict[int, (int, float, float)]
+    :type schedule: Schedule
     :param verbose: Print non-necessary information ?
     :type verbose: bool
     :param insertion: Use of insertion policy ?
     :type insertion: bool
+    :param ests: EST of the ready tasks, maintained along **schedule** (computed from scratch if None)
+    :type ests: ESTMatrix
     :return: Node to schedule
     :rtype: int
     """
     q = g.graph['nbproc']
-    k = len(readyTasks)
-    currentNode = 0
+    nodes = list(readyTasks)
+    if ests is None:
+        ests = ESTMatrix(g, schedule, verbose, insertion)
+    est = ests.rows(nodes)
     prio = g.graph['prio']
-    n = len(prio)
-    bim = []
-    for i in range(n):
-        bim.append([])
-
-    m = math.inf
-    for t in readyTasks:
-        for p in range(q):
-            est, tmp = computeEFT(g=g, node=t, proc=p, schedule=schedule, verbose=verbose, insertion=insertion)
-            if isinstance(prio[t - 1], list):
-                bim[t - 1].append(prio[t - 1][p] + est)
-            else:
-                bim[t - 1].append(prio[t - 1] + est)
-        sortedBIM = sorted(bim[t - 1])
-        if k > len(sortedBIM):
-            kmBIM = sortedBIM[-1]
-        else:
-            kmBIM = sortedBIM[k - 1]
-        if kmBIM < m:
-            m = kmBIM
-            currentNode = t
-    return currentNode
+    if isinstance(prio[nodes[0] - 1], list):
+        bim = np.array([prio[t - 1][:q] for t in nodes], dtype=float) + est
+    else:
+        bim = np.array([prio[t - 1] for t in nodes], dtype=float)[:, None] + est
+    kth = min(len(nodes), q) - 1
+    kmBIM = np.partition(bim, kth, axis=1)[:, kth]
+    return nodes[int(np.argmin(kmBIM))]
 
 
 def findBestProcEFT(g, currentNode, schedule, desc, verbose, insertion, useEST, nodes):
@@ -92,13 +52,13 @@ def findBestProcEFT(g, currentNode, schedule, desc, verbose, insertion, useEST,
     proc
 
     :param nodes: List of nodes sorted
-    :type nodes: list[int]
+    :type nodes: OrderedNodes | list[int]
     :param g: DAG to schedule
     :type g: networkx.DiGraph
     :param currentNode: Node to schedule
     :type currentNode: int
     :param schedule: Schedule at this point
-    :type schedule: dict[int, (int, float, float)]
+    :type schedule: Schedule
     :param desc: Lookahead strategy
     :type desc: str
     :param verbose: Print non-necessary information ?
@@ -111,29 +71,20 @@ def findBestProcEFT(g, currentNode, schedule, desc, verbose, insertion, useEST,
     if nodes is None:
         nodes = []
     q = g.graph['nbproc']
-    um = m = math.inf
-    umm = mm = math.inf
-    pm = 0
-    uest = ueft = 0
-    for proc in range(q):
-        est, eft = computeEFT(g=g, node=currentNode, proc=proc, schedule=schedule, verbose=verbose,
-                              insertion=insertion)
-        if useEST:
-            uest = getLookAheadFun(desc)(g, currentNode, proc, nodes, "EST", schedule, est)
-        else:
-            ueft = getLookAheadFun(desc)(g, currentNode, proc, nodes, "EFT", schedule, eft)
-        if verbose:
-            print("Attempt on scheduling node ", currentNode, "on proc", proc + 1, " -> est =", est, " and eft =",
-                  eft)
-        if (not useEST and ueft < um) or (useEST and uest < umm):
-            um = ueft
-            umm = uest
-            m = eft
-            mm = est
-            pm = proc
+    est, eft = computeAllEFT(g=g, node=currentNode, schedule=schedule, verbose=verbose, insertion=insertion)
+    value = est if useEST else eft
+    lookAhead = getLookAheadFun(desc)
+    if lookAhead is not NOP:
+        value = [lookAhead(g, currentNode, proc, nodes, "EST" if useEST else "EFT", schedule, value[proc])
+                 for proc in range(q)]
+    if verbose:
+        for proc in range(q):
+            print("Attempt on scheduling node ", currentNode, "on proc", proc + 1, " -> est =", est[proc],
+                  " and eft =", eft[proc])
+    pm = int(np.argmin(value))
     if verbose:
         print("Choice of proc :", pm + 1)
-    schedule[currentNode] = (pm, mm, m)
+    schedule[currentNode] = (pm, float(est[pm]), float(eft[pm]))
 
 
 def placeEFTBIM(g, nodes, desc=None, verbose=False, insertion=True):
@@ -150,22 +101,17 @@ def placeEFTBIM(g, nodes, desc=None, verbose=False, insertion=True):
     :param insertion: Use of insertion policy ?
     :type insertion: bool
     :return: A corresponding schedule in format {task : [proc, est, eft],..}
-    :rtype: dict[int, (int, float, float)]
+    :rtype: Schedule
     """
-    schedule = {}
-    n = len(nodes)
-    readyTasks = [nodes[0]]
-    nodes = nodes[1::]
-    bim = []
-    for i in range(n):
-        bim.append([])
-    k = len(readyTasks)
-    while k > 0:
-        currentNode = computeCurrentNodeBIM(g, readyTasks, schedule, verbose=verbose, insertion=insertion)
-        readyTasks.remove(currentNode)
-        findBestProcEFT(g, currentNode, schedule, desc, verbose, insertion, False, nodes)
-        updateReadyTasks(g, readyTasks, nodes, currentNode)
-        k = len(readyTasks)
+    schedule = Schedule()
+    readyTasks = ReadyTasks(g, nodes)
+    ests = ESTMatrix(g, schedule, verbose, insertion)
+    while readyTasks:
+        currentNode = computeCurrentNodeBIM(g, readyTasks, schedule, verbose=verbose, insertion=insertion, ests=ests)
+        readyTasks.take(currentNode)
+        findBestProcEFT(g, currentNode, schedule, desc, verbose, insertion, False, readyTasks.pending)
+        ests.commit(currentNode)
+        readyTasks.release(currentNode)
     return schedule
 
 
@@ -183,15 +129,15 @@ def placeEFT(g, nodes, desc=None, verbose=False, insertion=True):
     :param insertion: Use of insertion policy ?
     :type insertion: bool
     :return: A corresponding schedule in format {task : [proc, est, eft],..}
-    :rtype: dict[int, (int, float, float)]
+    :rtype: Schedule
     """
     if verbose:
         print("Nodes :", nodes)
-    schedule = {}
-    while len(nodes) > 0:
-        currentNode = nodes[0]
-        nodes = nodes[1::]
-        findBestProcEFT(g, currentNode, schedule, desc, verbose, insertion, False, nodes)
+    schedule = Schedule()
+    remaining = OrderedNodes(nodes)
+    for currentNode in nodes:
+        del remaining[currentNode]
+        findBestProcEFT(g, currentNode, schedule, desc, verbose, insertion, False, remaining)
     if verbose:
         schedulebis = {}
         for s in schedule:
@@ -214,30 +160,29 @@ def placeMET(g, nodes, desc=None, verbose=False, insertion=True):
     :param insertion: Use of insertion policy ?
     :type insertion: bool
     :return: A corresponding schedule in format {task : [proc, est, eft],..}
-    :rtype: dict[int, (int, float, float)]
+    :rtype: Schedule
     """
-    schedule: Dict[int, Tuple[int, float, float]] = {}
+    schedule = Schedule()
     q = g.graph['nbproc']
-    while len(nodes) > 0:
+    remaining = OrderedNodes(nodes)
+    for currentNode in nodes:
         m = math.inf
         mm = 0
         mmm = 0
         pm = 0
-        currentNode = nodes[0]
-        nodes = nodes[1::]
+        del remaining[currentNode]
+        est, eft = computeAllEFT(g=g, node=currentNode, schedule=schedule, verbose=verbose, insertion=insertion)
         for proc in range(q):
             diff = g.graph['costmatrix'][currentNode - 1][proc]
-            diff = getLookAheadFun(desc)(g, currentNode, proc, nodes, "MET", schedule, diff)
-            est, eft = computeEFT(g=g, node=currentNode, proc=proc, schedule=schedule, verbose=verbose,
-                                  insertion=insertion)
-            if diff < m or (diff == m and eft < mmm):
+            diff = getLookAheadFun(desc)(g, currentNode, proc, remaining, "MET", schedule, diff)
+            if diff < m or (diff == m and eft[proc] < mmm):
                 m = g.graph['costmatrix'][currentNode - 1][proc]
-                mm = est
-                mmm = eft
+                mm = est[proc]
+                mmm = eft[proc]
                 pm = proc
         if verbose:
             print("Choice of proc :", pm + 1)
-        schedule[currentNode] = (pm, mm, mmm)
+        schedule[currentNode] = (pm, float(mm), float(mmm))
     if verbose:
         schedulebis = {}
         for s in schedule:
@@ -260,13 +205,13 @@ def placeOLB(g, nodes, desc=None, verbose=False, insertion=True):
     :param insertion: Use of insertion policy ?
     :type insertion: bool
     :return: A corresponding schedule in format {task : [proc, est, eft],..}
-    :rtype: dict[int, (int, float, float)]
+    :rtype: Schedule
         """
-    schedule = {}
-    while len(nodes) > 0:
-        currentNode = nodes[0]
-        nodes = nodes[1::]
-        findBestProcEFT(g, currentNode, schedule, desc, verbose, insertion, True, nodes)
+    schedule = Schedule()
+    remaining = OrderedNodes(nodes)
+    for currentNode in nodes:
+        del remaining[currentNode]
+        findBestProcEFT(g, currentNode, schedule, desc, verbose, insertion, True, remaining)
     if verbose:
         schedulebis = {}
         for s in schedule:
@@ -284,7 +229,7 @@ def findBestProcBIMStar(g, currentNode, schedule, k, desc, verbose, insertion, n
     :param currentNode: Node to schedule
     :type currentNode: int
     :param schedule: Schedule at this point
-    :type schedule: dict[int, (int, float, float)]
+    :type schedule: Schedule
     :param k: Number of ready tasks at this point
     :type k: int
     :param desc: Lookahead strategy
@@ -294,25 +239,18 @@ def findBestProcBIMStar(g, currentNode, schedule, k, desc, verbose, insertion, n
     :param insertion: Use of insertion policy ?
     :type insertion: bool
     :param nodes: List of nodes sorted
-    :type nodes: list[int]
+    :type nodes: OrderedNodes | list[int]
     """
     q = g.graph['nbproc']
-    m = math.inf
-    mm = 0
-    pm = 0
-    mmm = 0
-    for proc in range(q):
-        bims, est, eft = computeBIMStar(g, currentNode, proc, schedule, k, verbose, insertion)
-        bims = getLookAheadFun(desc)(g, currentNode, proc, nodes, "BIM*", schedule, bims)
-        if bims <= m:
-            if bims < m or eft < mmm:
-                m = bims
-                mm = est
-                mmm = eft
-                pm = proc
+    bims, est, eft = computeAllBIMStar(g, currentNode, schedule, k, verbose, insertion)
+    lookAhead = getLookAheadFun(desc)
+    if lookAhead is not NOP:
+        bims = np.array([lookAhead(g, currentNode, proc, nodes, "BIM*", schedule, bims[proc]) for proc in range(q)])
+    best = np.flatnonzero(bims == bims.min())  # Ties broken by EFT
+    pm = int(best[np.argmin(eft[best])])
     if verbose:
         print("Choice of proc :", pm + 1)
-    schedule[currentNode] = (pm, mm, mmm)
+    schedule[currentNode] = (pm, float(est[pm]), float(eft[pm]))
 
 
 def placeBIMStar(g, nodes, desc, verbose, insertion):
@@ -329,17 +267,15 @@ def placeBIMStar(g, nodes, desc, verbose, insertion):
     :param insertion: Use of insertion policy ?
     :type insertion: bool
     :return: A corresponding schedule in format {task : [proc, est, eft],..}
-    :rtype: dict[int, (int, float, float)]
+    :rtype: Schedule
     """
-    schedule = {}
-    readyTasks = [nodes[0]]
-    while len(nodes) > 0:
+    schedule = Schedule()
+    readyTasks = ReadyTasks(g, nodes, deletion=False)
+    for currentNode in nodes:
         k = len(readyTasks)
-        currentNode = nodes[0]
-        nodes = nodes[1::]
-        findBestProcBIMStar(g, currentNode, schedule, k, desc, verbose, insertion, nodes)
-        readyTasks.remove(currentNode)
-        updateReadyTasks(g, readyTasks, nodes, currentNode, deletion=False)
+        readyTasks.take(currentNode)
+        findBestProcBIMStar(g, currentNode, schedule, k, desc, verbose, insertion, readyTasks.pending)
+        readyTasks.release(currentNode)
     if verbose:
         schedulebis = {}
         for s in schedule:
@@ -362,24 +298,20 @@ def placeBIMStarBIM(g, nodes, desc, verbose, insertion):
     :param insertion: Use of insertion policy ?
     :type insertion: bool
     :return: A corresponding schedule in format {task : [proc, est, eft],..}
-    :rtype: dict[int, (int, float, float)]
+    :rtype: Schedule
     """
-    schedule = {}
-    bim = []
-    for _ in nodes:
-        bim.append([])
-    readyTasks = [nodes[0]]
-    nodes = nodes[1::]
-    k = len(readyTasks)
-    while k > 0:
-        currentNode = computeCurrentNodeBIM(g, readyTasks, schedule, verbose=verbose, insertion=insertion)
+    schedule = Schedule()
+    readyTasks = ReadyTasks(g, nodes)
+    ests = ESTMatrix(g, schedule, verbose, insertion)
+    while readyTasks:
+        currentNode = computeCurrentNodeBIM(g, readyTasks, schedule, verbose=verbose, insertion=insertion, ests=ests)
         if verbose:
             print("Current node :", currentNode)
         k = len(readyTasks)
-        readyTasks.remove(currentNode)
-        findBestProcBIMStar(g, currentNode, schedule, k, desc, verbose, insertion, nodes)
-        updateReadyTasks(g, readyTasks, nodes, currentNode)
-        k = len(readyTasks)
+        readyTasks.take(currentNode)
+        findBestProcBIMStar(g, currentNode, schedule, k, desc, verbose, insertion, readyTasks.pending)
+        ests.commit(currentNode)
+        readyTasks.release(currentNode)
     if verbose:
         schedulebis = {}
         for s in schedule:
@@ -404,25 +336,23 @@ def placeDL(g, nodes, desc, verbose, insertion, costFunction="mean"):
     :param costFunction: Function used to simplify comp/comm cost
     :type costFunction: str
     :return: A corresponding schedule in format {task : [proc, est, eft],..}
-    :rtype: dict[int, (int, float, float)]
+    :rtype: Schedule
     """
     computeCompCost(g, costFunction, verbose)
     computeLB(g, costFunction, verbose)
-    schedule = {}
-    q = g.graph['nbproc']
-    readyTasks = [nodes[0]]
-    while nodes:
-        i = None
-        m = -math.inf
-        pm = None
-        for n in readyTasks:
-            for p in range(q):
-                dl = DL(g, n, p, schedule, desc, verbose, insertion, nodes, False)
-                if dl > m:
-                    m = dl
-                    i = n
-                    pm = p
-        placeNode(g, i, pm, schedule, nodes, readyTasks, verbose, insertion)
+    schedule = Schedule()
+    readyTasks = ReadyTasks(g, nodes, deletion=False)
+    dls = DLMatrix(g, schedule, verbose, insertion)
+    lookAhead = getLookAheadFun(desc) is not NOP
+    while readyTasks.pending:
+        ready = list(readyTasks)
+        if lookAhead:
+            dl = np.array([computeAllDL(g, n, schedule, desc, verbose, insertion, readyTasks.pending,
+                                        est=dls.row(n)) for n in ready])
+        else:
+            dl = dls.levels(ready)
+        best = int(np.argmax(dl.max(axis=1)))
+        placeNode(g, ready[best], int(np.argmax(dl[best])), schedule, readyTasks, verbose, insertion, dls)
     if verbose:
         printSchedule(schedule)
     return schedule
@@ -444,30 +374,30 @@ def placeDLBIM(g, nodes, desc, verbose, insertion, costFunction="mean"):
     :param costFunction: Function used to simplify comp/comm cost
     :type costFunction: str
     :return: A corresponding schedule in format {task : [proc, est, eft],..}
-    :rtype: dict[int, (int, float, float)]
+    :rtype: Schedule
     """
     computeCompCost(g, costFunction, verbose)
     computeLB(g, costFunction, verbose)
-    schedule = {}
-    q = g.graph['nbproc']
-    readyTasks = [nodes[0]]
-    while nodes:
-        m = -math.inf
-        pm = None
-        currentNode = computeCurrentNodeBIM(g, readyTasks, schedule, verbose, insertion)
-        for p in range(q):
-            dl = DL(g, currentNode, p, schedule, desc, verbose, insertion, nodes, False)
-            if dl > m:
-                m = dl
-                pm = p
-        placeNode(g, currentNode, pm, schedule, nodes, readyTasks, verbose, insertion)
+    schedule = Schedule()
+    readyTasks = ReadyTasks(g, nodes, deletion=False)
+    dls = DLMatrix(g, schedule, verbose, insertion)
+    lookAhead = getLookAheadFun(desc) is not NOP
+    while readyTasks.pending:
+        currentNode = computeCurrentNodeBIM(g, readyTasks, schedule, verbose, insertion, dls)
+        if lookAhead:
+            dl = computeAllDL(g, currentNode, schedule, desc, verbose, insertion, readyTasks.pending,
+                              est=dls.row(currentNode))
+        else:
+            dl = dls.levels([currentNode])[0]
+        pm = int(np.argmax(dl))
+        placeNode(g, currentNode, pm, schedule, readyTasks, verbose, insertion, dls)
     if verbose:
         printSchedule(schedule)
     return schedule
 
 
-def placeNode(g, currentNode, proc, schedule, nodes, readyTasks, verbose, insertion):
-    """ Place node in schedule, and update ready tasks list
+def placeNode(g, currentNode, proc, schedule, readyTasks, verbose, insertion, ests=None):
+    """ Place node in schedule, and update ready tasks
 
     :param g: DAG to schedule
     :type g: networkx.DiGraph
@@ -476,24 +406,25 @@ def placeNode(g, currentNode, proc, schedule, nodes, readyTasks, verbose, insert
     :param proc: Processor to schedule **currentNode** on
     :type proc: int
     :param schedule: Schedule at this point
-    :type schedule: dict[int, (int, float, float)]
-    :param nodes: Ordered list of nodes
-    :type nodes: list[int]
-    :param readyTasks: List of ready tasks
-    :type readyTasks: list[int]
+    :type schedule: Schedule
+    :param readyTasks: Ready and pending tasks
+    :type readyTasks: ReadyTasks
     :param verbose: Print non-necessary information ?
     :type verbose: bool
     :param insertion: Use of insertion policy ?
     :type insertion: bool
+    :param ests: EST of the ready tasks, to update once **currentNode** is scheduled
+    :type ests: ESTMatrix
     :rtype: None
     """
     if verbose:
         print("Choice of proc :", proc + 1)
     est, eft = computeEFT(g, currentNode, proc, schedule, verbose, insertion)
     schedule[currentNode] = (proc, est, eft)
-    nodes.remove(currentNode)
-    readyTasks.remove(currentNode)
-    updateReadyTasks(g, readyTasks, nodes, currentNode, deletion=False, verbose=verbose)
+    if ests is not None:
+        ests.commit(currentNode)
+    readyTasks.take(currentNode)
+    readyTasks.release(currentNode, verbose=verbose)
 
 
 def placeGDLBIM(g, nodes, desc, verbose, insertion, costFunction="mean"):
@@ -512,23 +443,22 @@ def placeGDLBIM(g, nodes, desc, verbose, insertion, costFunction="mean"):
     :param costFunction: Function used to simplify comp/comm cost
     :type costFunction: str
     :return: A corresponding schedule in format {task : [proc, est, eft],..}
-    :rtype: dict[int, (int, float, float)]
+    :rtype: Schedule
     """
     computeCompCost(g, costFunction, verbose)
     computeLB(g, costFunction, verbose)
-    schedule = {}
-    readyTasks = [nodes[0]]
-    while nodes:
-        i = None
-        m = -math.inf
-        pm = None
-        for n in readyTasks:
-            dl, p = GDL(g, n, schedule, desc, verbose, insertion)
-            if dl > m:
-                m = dl
-                i = n
-                pm = p
-        placeNode(g, i, pm, schedule, nodes, readyTasks, verbose, insertion)
+    schedule = Schedule()
+    readyTasks = ReadyTasks(g, nodes, deletion=False)
+    dls = DLMatrix(g, schedule, verbose, insertion)
+    lookAhead = getLookAheadFun(desc) is not NOP
+    while readyTasks.pending:
+        ready = list(readyTasks)
+        dl = None
+        if lookAhead:
+            dl = np.array([computeAllDL(g, n, schedule, desc, verbose, insertion, est=dls.row(n)) for n in ready])
+        gdl, pm = dls.generalizedLevels(ready, dl)
+        best = int(np.argmax(gdl))
+        placeNode(g, ready[best], int(pm[best]), schedule, readyTasks, verbose, insertion, dls)
     if verbose:
         printSchedule(schedule)
     return schedule
@@ -550,16 +480,17 @@ def placeGDL(g, nodes, desc, verbose, insertion, costFunction="mean"):
     :param costFunction: Function used to simplify comp/comm cost
     :type costFunction: str
     :return: A corresponding schedule in format {task : [proc, est, eft],..}
-    :rtype: dict[int, (int, float, float)]
+    :rtype: Schedule
     """
     computeCompCost(g, costFunction, verbose)
     computeLB(g, costFunction, verbose)
-    schedule = {}
-    readyTasks = [nodes[0]]
-    while nodes:
-        currentNode = computeCurrentNodeBIM(g, readyTasks, schedule, verbose, insertion)
-        dl, p = GDL(g, currentNode, schedule, desc, verbose, insertion, nodes)
-        placeNode(g, currentNode, p, schedule, nodes, readyTasks, verbose, insertion)
+    schedule = Schedule()
+    readyTasks = ReadyTasks(g, nodes, deletion=False)
+    dls = DLMatrix(g, schedule, verbose, insertion)
+    while readyTasks.pending:
+        currentNode = computeCurrentNodeBIM(g, readyTasks, schedule, verbose, insertion, dls)
+        dl, p = GDL(g, currentNode, schedule, desc, verbose, insertion, readyTasks.pending, dls)
+        placeNode(g, currentNode, p, schedule, readyTasks, verbose, insertion, dls)
     if verbose:
         printSchedule(schedule)
     return schedule
@@ -638,7 +569,7 @@ def placeSerial(g, strategyPrio, verbose):
     :param verbose: Print non-necessary information ?
     :type verbose: bool
     :return: A corresponding schedule in format {task : [proc, est, eft],..}
-    :rtype: dict[int, (int, float, float)]
+    :rtype: Schedule
     """
     CP = identifyCP(g, strategyPrio, verbose)
     if not CP:
@@ -661,7 +592,7 @@ def placeSerial(g, strategyPrio, verbose):
             makespan = ms
     if verbose:
         print("Pivot :", pivot)
-    schedule: Dict[int, Tuple[int, float, float]] = {}
+    schedule = Schedule()
     for t in serialOrder:
         est, eft = computeEFT(g, t, pivot, schedule, verbose, False)
         schedule[t] = (pivot, est, eft)
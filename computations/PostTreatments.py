@@ -1,11 +1,18 @@
 from computations.CommCost import commCost
-from computations.EarliestTimes import computeDFT, computeEFT
+from computations.CompiledDAG import compileDAG
+from computations.EarliestTimes import computeAllDFT
 from computations.Priorities import getExitTask
+from computations.Schedule import Schedule
 
 
 def applyBSA(g, schedule: dict, verbose=False):
     """ Apply BSA to an already-computed schedule
 
+    The schedule is copied once, then updated in place. Evaluating a migration of a task only reads its predecessors
+    and the timeline of the target proc, which does not hold the task, so that it needs no tentative copy of the
+    schedule: a task is only removed and inserted again (at the end of the schedule, as a copy would do) when it
+    actually migrates.
+
     :param g: DAG to schedule
     :type g: networkx.DiGraph
     :param schedule: Schedule computed, to improve using BSA
@@ -15,7 +22,9 @@ def applyBSA(g, schedule: dict, verbose=False):
     :return: A *possibly* improved schedule in format {task : [proc, est, eft],..}
     :rtype: dict[int, (int, float, float)]
     """
+    g = compileDAG(g)
     q = g.graph['nbproc']
+    schedule = schedule.copy() if isinstance(schedule, Schedule) else Schedule(schedule)
     procList = sorted(schedule.values(), key=lambda x: x[2], reverse=False)  # Reverse = true -> 10 d'abord
     procList = list(map(lambda x: x[0], procList))
     procList = list(dict.fromkeys(procList))
@@ -25,30 +34,25 @@ def applyBSA(g, schedule: dict, verbose=False):
             procList.append(p)
     for p in procList:  # TODO Check which one of those two is the most effective ...
         # for p in range(q):
-        tasks = []
-        for t in schedule:
-            if schedule[t][0] == p:
-                tasks.append(t)
+        tasks = [t for t, value in schedule.items() if value[0] == p]
         for t in tasks:
-            allowedProc = []
             eft = schedule[t][2]
             est = schedule[t][1]
-            scheduleBis = dict.copy(schedule)
-            scheduleBis.pop(t)
-            dft, unused = computeDFT(g, t, p, scheduleBis, verbose, estimate=False)
-            if est > dft:
+            dft = computeAllDFT(g, t, schedule, verbose).tolist()
+            if est > dft[p]:
+                w = g.cost[t - 1, :q].tolist()
                 for py in range(q):
                     if py == p:
                         continue
-                    esty, efty = computeEFT(g, t, py, scheduleBis, verbose, insertion=True, estimate=False)
+                    esty = schedule.earliestStart(py, dft[py], w[py])
+                    efty = esty + w[py]
                     if efty < eft:
                         swap = True
                         for s in g.successors(t):
                             swap = swap and schedule[s][1] >= efty + commCost(g, t, s, py, schedule[s][0],
                                                                               verbose=False)
                         if swap:
-                            allowedProc.append([py, esty, efty])
-                            schedule = scheduleBis
+                            del schedule[t]
                             schedule[t] = [py, esty, efty]
     endMakespan = schedule[getExitTask(g)][2]
     if endMakespan > initMakespan:
@@ -1,9 +1,10 @@
 import math
 from collections import defaultdict
 
-from networkx import topological_sort
+import numpy as np
 
 from computations.CommCost import *
+from computations.CompiledDAG import compileDAG, segmentMax
 from computations.CompCost import *
 from computations.LBMatrix import *
 
@@ -20,8 +21,8 @@ def getCP(g, costFunction="mean", verbose=False):
     :return: Critical Path of **g**
     :rtype: str
     """
-    computeRankU(g, costFunction=costFunction)
-    computeRankD(g, costFunction=costFunction, add=True)
+    rku, rkd = computeRanks(g, costFunction=costFunction)
+    g.graph['prio'] = (rku + rkd).tolist()
     entryTask = getEntryTask(g)
     exitTask = getExitTask(g)
     cpLength = g.graph['prio'][entryTask - 1]
@@ -81,6 +82,40 @@ def getEntryTask(g, verbose=False):
     return None
 
 
+def computeRanks(g, costFunction="mean", verbose=False):
+    """ Compute both rku and rkd for every node of **g**, level by level
+
+    Nodes of a topological level only depend on nodes of the following levels for rku, and of the former ones for rkd,
+    so that each level is computed at once, as a max over the CSR segments of its nodes. Ranks are memoized per cost
+    function in the stages of the compiled DAG.
+
+    :param g: DAG to schedule
+    :type g: networkx.DiGraph | CompiledDAG
+    :param costFunction: Function used to compute meanCompCost and meanCommCost
+    :type costFunction: str
+    :param verbose: Print non-necessary information ?
+    :type verbose: bool
+    :return: rku and rkd, indexed by node - 1
+    :rtype: (numpy.ndarray, numpy.ndarray)
+    """
+    computeCompCost(g, costFunction, verbose)
+    computeLB(g, costFunction, verbose)
+    g = compileDAG(g)
+    if ('ranks', costFunction) in g.stages:
+        return g.stages['ranks', costFunction]
+    comp = np.array(g.graph['meancompcost'], dtype=float)
+    comm = g.commTensor.meanCosts(g.graph['meanL'], g.graph['meanB'])
+    rku = np.zeros(g.n)
+    rkd = np.zeros(g.n)
+    for level, pos, starts, full in reversed(g.levelSegments(succ=True)):
+        rku[level] = comp[level] + segmentMax(comm[pos] + rku[g.succIdx[pos]], starts, full)
+    for level, pos, starts, full in g.levelSegments(succ=False):
+        preds = g.predIdx[pos]
+        rkd[level] = segmentMax(comm[g.predEdge[pos]] + rkd[preds] + comp[preds], starts, full)
+    g.stages['ranks', costFunction] = rku, rkd
+    return rku, rkd
+
+
 def computeRankU(g, costFunction="mean", verbose=False):
     """ Compute rku for every node of **g** and store it in g.graph['prio']
 
@@ -91,33 +126,8 @@ def computeRankU(g, costFunction="mean", verbose=False):
     :param verbose: Print non-necessary information ?
     :type verbose: bool
     """
-    computeCompCost(g, costFunction, verbose)
-    computeLB(g, costFunction, verbose)
-    currentNode = getExitTask(g, verbose)
-    entry = getEntryTask(g, verbose)
-    rku = [-1] * len(g.nodes)
-    toTreat = []
-    while currentNode is not None:
-        currentNodeRku = g.graph['meancompcost'][currentNode - 1]
-        succs = list(g.successors(currentNode))
-        if len(succs) > 0:
-            currentNodeRku += max(map(lambda x: meanCommCost(g, currentNode, x) + rku[x - 1], succs))
-        if verbose:
-            print("Rku of", currentNode, currentNodeRku)
-        rku[currentNode - 1] = currentNodeRku
-        for p in g.predecessors(currentNode):
-            isOk = True
-            for s in g.successors(p):
-                if rku[s - 1] == -1:
-                    isOk = False
-            if isOk:
-                toTreat.append(p)
-        if currentNode != entry:
-            currentNode = toTreat[0]
-            toTreat = list(dict.fromkeys(toTreat[1::]))  # To remove duplicates
-        else:
-            currentNode = None
-    g.graph['prio'] = rku
+    rku, rkd = computeRanks(g, costFunction, verbose)
+    g.graph['prio'] = rku.tolist()
     if verbose:
         print("rku : ", list(map(lambda x: round(x, 2), g.graph['prio'])))
 
@@ -136,38 +146,13 @@ def computeRankD(g, costFunction="mean", verbose=False, add=False, sub=False):
         :param sub: Subtract rkd to current prio ?
         :type sub: bool
         """
-    computeCompCost(g, costFunction, verbose)
-    computeLB(g, costFunction, verbose)
-    currentNode = getEntryTask(g, verbose)
-    exitTask = getExitTask(g, verbose)
-    rkd = [-1] * len(g.nodes)
-    toTreat = []
-    while currentNode is not None:
-        currentNodeRkd = 0
-        preds = list(g.predecessors(currentNode))
-        if len(preds) > 0:
-            currentNodeRkd += max(
-                list(map(lambda x: meanCommCost(g, x, currentNode) + rkd[x - 1] + g.graph['meancompcost'][x - 1],
-                         preds)))
-        if add:
-            g.graph['prio'][currentNode - 1] += currentNodeRkd
-        elif sub:
-            g.graph['prio'][currentNode - 1] -= currentNodeRkd
-        rkd[currentNode - 1] = currentNodeRkd
-        for p in g.successors(currentNode):
-            isOk = True
-            for s in g.predecessors(p):
-                if rkd[s - 1] == -1:
-                    isOk = False
-            if isOk:
-                toTreat.append(p)
-        if currentNode != exitTask:
-            currentNode = toTreat[0]
-            toTreat = list(dict.fromkeys(toTreat[1::]))
-        else:
-            currentNode = None
-    if not add and not sub:
-        g.graph['prio'] = rkd
+    rku, rkd = computeRanks(g, costFunction, verbose)
+    if add:
+        g.graph['prio'] = (np.array(g.graph['prio']) + rkd).tolist()
+    elif sub:
+        g.graph['prio'] = (np.array(g.graph['prio']) - rkd).tolist()
+    else:
+        g.graph['prio'] = rkd.tolist()
         if verbose:
             print("rkd :", list(map(lambda x: round(x, 2), g.graph['prio'])))
 
@@ -180,43 +165,14 @@ def computeBIL(g, verbose=False):
     :param verbose: Print non-necessary information ?
     :type verbose: bool
     """
-    currentNode = getExitTask(g, verbose)
-    entry = getEntryTask(g, verbose)
+    g = compileDAG(g)
     q = g.graph['nbproc']
-    n = len(g.nodes)
-    bil: list[list[float]] = []
-    toTreat = []
-    for i in range(n):
-        bil.append([])
-    while currentNode is not None:
-        for proc in range(q):
-            currentNodeBil = g.graph['costmatrix'][currentNode - 1][proc]
-            succs = list(g.successors(currentNode))
-            maxS = 0
-            for s in succs:
-                minP = math.inf
-                for p in range(q):
-                    succVal = bil[s - 1][p] + commCost(g, currentNode, s, proc, p, verbose=verbose)
-                    if succVal < minP:
-                        minP = succVal
-                if minP > maxS:
-                    maxS = minP
-            currentNodeBil += maxS
-            bil[currentNode - 1].append(currentNodeBil)
-
-        for p in g.predecessors(currentNode):
-            isOk = True
-            for s in g.successors(p):
-                if not bil[s - 1]:
-                    isOk = False
-            if isOk:
-                toTreat.append(p)
-        if currentNode != entry:
-            currentNode = toTreat[0]
-            toTreat = list(dict.fromkeys(toTreat[1::]))
-        else:
-            currentNode = None
-    g.graph['prio'] = bil
+    bil = np.zeros((g.n, q))
+    for level, pos, starts, full in reversed(g.levelSegments(succ=True)):
+        # Entries of the succ CSR arrays are edge indices : pos holds the out-edges of the level
+        succVal = g.commTensor.minPlus(pos, bil[g.succIdx[pos]])
+        bil[level] = g.cost[level, :q] + segmentMax(succVal, starts, full)
+    g.graph['prio'] = bil.tolist()
     if verbose:
         print("Bil : ", g.graph['prio'])
 
@@ -258,7 +214,7 @@ def computeLevels(g, verbose=False):
     :return: Dict containing nodes for each level
     :rtype: dict[int, list[int]]
     """
-    nodes = list(topological_sort(g))
+    nodes = list(compileDAG(g).topo)
     lvl = {nodes.pop(0): 0}
     while nodes:
         currentTask = nodes.pop(0)
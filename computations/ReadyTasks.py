@@ -0,0 +1,112 @@
+import numpy as np
+
+from computations.CompiledDAG import compileDAG
+
+
+class OrderedNodes(dict):
+    """ Nodes still to be scheduled, in format {node : rank in priority order,..}
+
+    Being an insertion-ordered dict, it iterates over the nodes in priority order and lets a scheduler drop nodes in
+    constant time, instead of slicing the ordered list of nodes at every step. Nodes are only ever removed, so that the
+    successors of every node are sorted by rank once, a cursor skipping the ones already scheduled.
+    """
+
+    def __init__(self, nodes):
+        """
+        :param nodes: Ordered list of nodes
+        :type nodes: list[int]
+        """
+        super().__init__((node, rank) for rank, node in enumerate(nodes))
+        self.successors = None
+        self.cursors = None
+        self.ends = None
+
+    def _sortSuccessors(self, g):
+        """ Sort the successors of every node by rank, nodes out of the ordering last """
+        g = compileDAG(g)
+        rank = np.full(g.n, g.n, dtype=np.int64)
+        rank[np.fromiter(self.keys(), dtype=np.int64, count=len(self)) - 1] = np.fromiter(self.values(),
+                                                                                           dtype=np.int64,
+                                                                                           count=len(self))
+        order = np.lexsort((rank[g.succIdx], g.edgeSrc))
+        self.successors = (g.succIdx[order] + 1).tolist()
+        self.cursors = g.succPtr[:-1].tolist()
+        self.ends = g.succPtr[1:].tolist()
+
+    def nextSuccessor(self, g, node):
+        """ Return the first successor of **node** in priority order that is still to be scheduled
+
+        :param g: DAG to schedule
+        :type g: networkx.DiGraph | CompiledDAG
+        :param node: Node to consider
+        :type node: int
+        :return: Successor of **node** with the lowest rank, None if none of them remains
+        :rtype: int | None
+        """
+        if self.successors is None:
+            self._sortSuccessors(g)
+        k, end = self.cursors[node - 1], self.ends[node - 1]
+        while k < end and self.successors[k] not in self:
+            k += 1
+        self.cursors[node - 1] = k
+        return self.successors[k] if k < end else None
+
+
+class ReadyTasks:
+    """ Tasks ready to be scheduled (every predecessor already scheduled) along with the tasks still pending, used by
+    the list schedulers
+
+    A counter of remaining predecessors is kept for every task, so that releasing a scheduled task only visits its
+    successors. Both **ready** and **pending** are insertion-ordered dicts, giving constant time removal while keeping
+    the order in which tasks became ready, respectively the priority order of the pending tasks (see OrderedNodes).
+    """
+
+    def __init__(self, g, nodes, deletion=True):
+        """
+        :param g: DAG to schedule
+        :type g: networkx.DiGraph | CompiledDAG
+        :param nodes: Ordered list of nodes, starting with the entry task
+        :type nodes: list[int]
+        :param deletion: Should tasks leave **pending** as soon as they are ready (instead of when they are taken) ?
+        :type deletion: bool
+        """
+        self.g = compileDAG(g)
+        self.deletion = deletion
+        self.remaining = np.diff(self.g.predPtr).tolist()
+        self.ready = {nodes[0]: None}
+        self.pending = OrderedNodes(nodes[1:] if deletion else nodes)
+
+    def __len__(self):
+        return len(self.ready)
+
+    def __iter__(self):
+        return iter(self.ready)
+
+    def take(self, node):
+        """ Remove **node** from the ready tasks (and from the pending ones), before scheduling it
+
+        :param node: Node about to be scheduled
+        :type node: int
+        :rtype: None
+        """
+        del self.ready[node]
+        self.pending.pop(node, None)
+
+    def release(self, node, verbose=False):
+        """ Update the ready tasks after scheduling of **node**
+
+        :param node: Node scheduled
+        :type node: int
+        :param verbose: Print non-necessary information ?
+        :type verbose: bool
+        :rtype: None
+        """
+        remaining = self.remaining
+        for s in self.g.successors(node):
+            remaining[s - 1] -= 1
+            if remaining[s - 1] == 0:
+                self.ready[s] = None
+                if self.deletion:
+                    self.pending.pop(s, None)
+        if verbose:
+            print("Ready task list after update :", list(self.ready))
@@ -0,0 +1,273 @@
+import math
+import random
+from bisect import bisect_left, insort
+
+import numpy as np
+
+_rng = random.Random(0)  # Treap priorities, kept apart from the global random state
+
+# Treap node : [start, end, priority, left, right, greatest gap length in subtree]
+_START, _END, _PRIO, _LEFT, _RIGHT, _MAXLEN = range(6)
+
+
+def _node(start, end):
+    return [start, end, _rng.random(), None, None, end - start]
+
+
+def _pull(node):
+    m = node[_END] - node[_START]
+    if node[_LEFT] is not None and node[_LEFT][_MAXLEN] > m:
+        m = node[_LEFT][_MAXLEN]
+    if node[_RIGHT] is not None and node[_RIGHT][_MAXLEN] > m:
+        m = node[_RIGHT][_MAXLEN]
+    node[_MAXLEN] = m
+
+
+def _split(node, key):
+    """ Split a treap into the gaps starting before **key** and the others """
+    if node is None:
+        return None, None
+    if node[_START] < key:
+        left, right = _split(node[_RIGHT], key)
+        node[_RIGHT] = left
+        _pull(node)
+        return node, right
+    left, right = _split(node[_LEFT], key)
+    node[_LEFT] = right
+    _pull(node)
+    return left, node
+
+
+def _merge(a, b):
+    """ Merge two treaps, every gap of **a** starting before those of **b** """
+    if a is None:
+        return b
+    if b is None:
+        return a
+    if a[_PRIO] > b[_PRIO]:
+        a[_RIGHT] = _merge(a[_RIGHT], b)
+        _pull(a)
+        return a
+    b[_LEFT] = _merge(a, b[_LEFT])
+    _pull(b)
+    return b
+
+
+def _firstFit(node, t, w):
+    """ Return the first gap starting after **t** with length at least **w** """
+    if node is None or node[_MAXLEN] < w:
+        return None
+    if node[_START] > t:
+        found = _firstFit(node[_LEFT], t, w)
+        if found is not None:
+            return found
+        if node[_END] - node[_START] >= w:
+            return node
+    return _firstFit(node[_RIGHT], t, w)
+
+
+class IdleGaps:
+    """ Idle periods of a processor, stored in a treap ordered by start time where each node also holds the greatest
+    gap length of its subtree
+
+    The gaps are the periods between two consecutive tasks of the timeline, along with the period before the first
+    task and the unbounded one after the last task, tasks of a processor being assumed not to overlap.
+    """
+
+    def __init__(self, timeline):
+        """
+        :param timeline: Tasks of the processor in format [(est, eft, task),..], sorted by start time
+        :type timeline: list[(float, float, int)]
+        """
+        self.root = None
+        prevEnd = 0
+        for est, eft, task in timeline:
+            if est > prevEnd:
+                self.root = _merge(self.root, _node(prevEnd, est))
+            prevEnd = eft
+        self.root = _merge(self.root, _node(prevEnd, math.inf))
+
+    def replace(self, lo, hi, gaps):
+        """ Replace the gaps starting in [**lo**, **hi**) by **gaps**
+
+        :param lo: Lower bound of the period to update
+        :type lo: float
+        :param hi: Upper bound of the period to update
+        :type hi: float
+        :param gaps: New gaps in format [(start, end),..], sorted by start time, starting in [**lo**, **hi**)
+        :type gaps: list[(float, float)]
+        :rtype: None
+        """
+        left, rest = _split(self.root, lo)
+        unused, right = _split(rest, hi)
+        for start, end in gaps:
+            left = _merge(left, _node(start, end))
+        self.root = _merge(left, right)
+
+    def earliestStart(self, t, w):
+        """ Return the earliest time at or after **t** when a task of length **w** fits in a gap
+
+        :param t: Earliest allowed start time
+        :type t: float
+        :param w: Length of the task
+        :type w: float
+        :return: Start time of the task
+        :rtype: float
+        """
+        node, gap = self.root, None
+        while node is not None:  # Gap containing t, if any
+            if node[_START] <= t:
+                gap, node = node, node[_RIGHT]
+            else:
+                node = node[_LEFT]
+        if gap is not None and gap[_END] - t >= w:
+            return t
+        return _firstFit(self.root, t, w)[_START]
+
+
+class Schedule(dict):
+    """ Schedule in format {task : [proc, est, eft],..}, along with a timeline of the tasks scheduled on each processor
+
+    The timeline of a processor is kept sorted by start time and is updated in place every time a task is added,
+    moved or removed, so that the tasks of a processor can be queried without scanning the whole schedule. The idle
+    gaps of a processor (see IdleGaps) are indexed the first time an insertion is attempted on it, then kept up to date
+    along with its timeline.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__()
+        self.timelines = {}
+        self.ends = np.zeros(0)
+        self.gaps = {}
+        self.update(*args, **kwargs)
+
+    def __setitem__(self, task, value):
+        if task in self:
+            self._unindex(task, self[task])
+        super().__setitem__(task, value)
+        self._index(task, value)
+
+    def __delitem__(self, task):
+        self._unindex(task, self[task])
+        super().__delitem__(task)
+
+    def pop(self, task, *default):
+        if task not in self:
+            if default:
+                return default[0]
+            raise KeyError(task)
+        value = self[task]
+        del self[task]
+        return value
+
+    def popitem(self):
+        if not self:
+            raise KeyError('popitem(): schedule is empty')
+        task = next(reversed(self))
+        return task, self.pop(task)
+
+    def setdefault(self, task, default=None):
+        if task not in self:
+            self[task] = default
+        return self[task]
+
+    def update(self, *args, **kwargs):
+        for task, value in dict(*args, **kwargs).items():
+            self[task] = value
+
+    def clear(self):
+        super().clear()
+        self.timelines = {}
+        self.ends = np.zeros(0)
+        self.gaps = {}
+
+    def copy(self):
+        """ Copy the schedule along with its timelines, the gaps being indexed again on demand
+
+        :return: A copy of the schedule
+        :rtype: Schedule
+        """
+        schedule = Schedule()
+        dict.update(schedule, self)
+        schedule.timelines = {proc: list(timeline) for proc, timeline in self.timelines.items()}
+        schedule.ends = self.ends.copy()
+        return schedule
+
+    def onProc(self, proc):
+        """ Return the timeline of **proc**
+
+        :param proc: Processor to consider
+        :type proc: int
+        :return: Tasks scheduled on **proc** in format [(est, eft, task),..], sorted by start time
+        :rtype: list[(float, float, int)]
+        """
+        return self.timelines.get(proc, [])
+
+    def procEnd(self, proc):
+        """ Return the time at which **proc** becomes idle for good
+
+        :param proc: Processor to consider
+        :type proc: int
+        :return: Greatest finish time of the tasks scheduled on **proc**, 0 if there is none
+        :rtype: float
+        """
+        return float(self.ends[proc]) if proc < len(self.ends) else 0
+
+    def procEnds(self, q):
+        """ Return the time at which every processor becomes idle for good
+
+        :param q: Number of processors
+        :type q: int
+        :return: Greatest finish time of the tasks scheduled on each processor, 0 if there is none (read-only)
+        :rtype: numpy.ndarray
+        """
+        if len(self.ends) < q:
+            self.ends = np.concatenate((self.ends, np.zeros(q - len(self.ends))))
+        return self.ends[:q]
+
+    def earliestStart(self, proc, t, w):
+        """ Return the earliest time at or after **t** when a task of length **w** can be inserted on **proc**
+
+        :param proc: Processor to consider
+        :type proc: int
+        :param t: Earliest allowed start time
+        :type t: float
+        :param w: Length of the task
+        :type w: float
+        :return: Start of the first idle gap long enough, **t** itself if it falls in one
+        :rtype: float
+        """
+        gaps = self.gaps.get(proc)
+        if gaps is None:
+            gaps = self.gaps[proc] = IdleGaps(self.onProc(proc))
+        return gaps.earliestStart(t, w)
+
+    def _index(self, task, value):
+        proc, est, eft = value[0], value[1], value[2]
+        timeline = self.timelines.setdefault(proc, [])
+        insort(timeline, (est, eft, task))
+        if proc >= len(self.ends):
+            self.ends = np.concatenate((self.ends, np.zeros(proc + 1 - len(self.ends))))
+        self.ends[proc] = max(self.ends[proc], eft)
+        if proc in self.gaps:
+            i = bisect_left(timeline, (est, eft, task))
+            prevEnd = timeline[i - 1][1] if i > 0 else 0
+            nextStart = timeline[i + 1][0] if i + 1 < len(timeline) else math.inf
+            gaps = [(prevEnd, est)] if est > prevEnd else []
+            if nextStart > eft:
+                gaps.append((eft, nextStart))
+            self.gaps[proc].replace(prevEnd, nextStart, gaps)
+
+    def _unindex(self, task, value):
+        proc, est, eft = value[0], value[1], value[2]
+        timeline = self.timelines[proc]
+        i = bisect_left(timeline, (est, eft, task))
+        del timeline[i]
+        if not timeline:
+            self.ends[proc] = 0
+        elif self.ends[proc] == eft:
+            self.ends[proc] = max(x[1] for x in timeline)
+        if proc in self.gaps:
+            prevEnd = timeline[i - 1][1] if i > 0 else 0
+            nextStart = timeline[i][0] if i < len(timeline) else math.inf
+            self.gaps[proc].replace(prevEnd, nextStart, [(prevEnd, nextStart)] if nextStart > prevEnd else [])
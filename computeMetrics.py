@@ -1,48 +1,173 @@
-from os import listdir
+import os
+from multiprocessing import Pool
 from statistics import mean, median, stdev
 
-from computations.Priorities import getCP
+from executions.Campaign import LEVEL_SUFFIX
 from help.FileReader import readFile
+from help.ResultFile import parseHeader
+from metrics.SLR import minCPScheduleLength
 from metrics.Sequential import sequentialScheduleLength
 
+
+def indexResults(resDir, legacyStream=True):
+    """ Index the result files of a campaign by seed, their names ending with "-{seed}.csv", or with
+    "-{seed}-level.csv" for graphs whose edges were drawn level by level (see campaignPoints)
+
+    :param resDir: Directory of the result files
+    :type resDir: str
+    :param legacyStream: Index the results of graphs whose edges were drawn as by older versions ? Otherwise, those of
+        graphs whose edges were drawn level by level
+    :type legacyStream: bool
+    :return: Result file of each seed in format {seed : path,..}
+    :rtype: dict[int, str]
+    """
+    index = {}
+    for fileName in os.listdir(resDir):
+        name = fileName.rsplit(".", 1)[0]
+        if not legacyStream:
+            if not name.endswith(LEVEL_SUFFIX):
+                continue
+            name = name[:-len(LEVEL_SUFFIX)]
+        seed = name.rsplit("-", 1)[-1]
+        if seed.isdigit():
+            index[int(seed)] = resDir + "/" + fileName
+    return index
+
+
+def readMetadata(path):
+    """ Read the metadata ("#@key value" lines) at the top of a result file, CSV or columnar
+
+    :param path: Result file
+    :type path: str
+    :return: Metadata in format {key : value,..}, values left as strings
+    :rtype: dict[str, str]
+    """
+    lines = []
+    with open(path, 'rb') as file:
+        for line in file:
+            if not line.startswith(b"#@") or line.startswith(b"#@end"):
+                break
+            lines.append(line.decode())
+    return parseHeader(lines)
+
+
+def readBaselines(cacheFile):
+    """ Read the baselines cached by computeMetrics
+
+    :param cacheFile: Cache file, in format "graphfile;mtime;minCP;sequential;nbproc" per line
+    :type cacheFile: str
+    :return: Baselines in format {graphfile : (mtime, minCP, sequential, nbproc),..}
+    :rtype: dict[str, (float, float, float, int)]
+    """
+    baselines = {}
+    if cacheFile and os.path.exists(cacheFile):
+        with open(cacheFile) as file:
+            for line in file:
+                fields = line.rstrip("\n").rsplit(";", 4)
+                if len(fields) == 5:
+                    baselines[fields[0]] = float(fields[1]), float(fields[2]), float(fields[3]), int(fields[4])
+    return baselines
+
+
+def graphBaselines(graphfile):
+    """ Compute the baselines of the metrics of a graph : makespan of its Critical-Path on the fastest procs (SLR) and
+    sequential makespan (speedup and efficiency)
+
+    :param graphfile: Graph file
+    :type graphfile: str
+    :return: Baselines along with the number of processors, in format (minCP, sequential, nbproc)
+    :rtype: (float, float, int)
+    """
+    graph = readFile(graphfile, converter=False, verbose=False)
+    return minCPScheduleLength(graph), sequentialScheduleLength(graph, False), graph.graph['nbproc']
+
+
+def _seedMetrics(args):
+    """ Compute the metrics of a seed in a worker process, reading the graph only when its baselines are not cached """
+    seed, resfile, graphfile, cached = args
+    metadata = readMetadata(resfile)
+    mk = float(metadata['minmk'])
+    computed = graphBaselines(graphfile) if cached is None else None
+    minCP, seqMakespan, nbproc = computed or cached
+    speedup = seqMakespan / mk
+    return seed, mk, mk / minCP, speedup, speedup / nbproc, computed
+
+
+def computeMetrics(seeds, resDir="res", graphDir="graphs", workers=1, cacheFile="baselines.csv", verbose=True,
+                   legacyStream=True):
+    """ Compute the SLR, speedup and efficiency of the best heuristic of every seed of a campaign
+
+    Result files are indexed by seed once, and the best makespan of each one is read from its metadata. Baselines of
+    each graph are cached in **cacheFile** (along with the modification time of the graph file), so that graphs are
+    only read the first time. Seeds are spread over a process pool, results being given in the order of **seeds**.
+
+    :param seeds: Seeds of the campaign
+    :type seeds: list[int] | range
+    :param resDir: Directory of the result files
+    :type resDir: str
+    :param graphDir: Directory of the graphs
+    :type graphDir: str
+    :param workers: Number of worker processes, 0 for one per core
+    :type workers: int
+    :param cacheFile: File caching the baselines of the graphs, None for no cache
+    :type cacheFile: str
+    :param verbose: Print progress ?
+    :type verbose: bool
+    :param legacyStream: Use the graphs whose edges were drawn as by older versions ? Otherwise, those whose edges
+        were drawn level by level, their files being named as by campaignPoints
+    :type legacyStream: bool
+    :return: Metrics of each seed in format [(seed, makespan, SLR, speedup, efficiency),..]
+    :rtype: list[(int, float, float, float, float)]
+    """
+    index = indexResults(resDir, legacyStream)
+    suffix = "" if legacyStream else LEVEL_SUFFIX
+    baselines = readBaselines(cacheFile)
+    tasks = []
+    for seed in seeds:
+        if seed not in index:
+            print(f"No result file for seed {seed}")
+            continue
+        graphfile = f"{graphDir}/tmp{seed}{suffix}.gml"
+        cached = baselines.get(graphfile)
+        if cached is not None and cached[0] == os.path.getmtime(graphfile):
+            cached = cached[1:]
+        else:
+            cached = None
+        tasks.append((seed, index[seed], graphfile, cached))
+    if workers == 0:
+        workers = os.cpu_count()
+
+    metrics = []
+    newBaselines = []
+    pool = Pool(workers) if workers > 1 and len(tasks) > 1 else None
+    try:
+        results = pool.imap(_seedMetrics, tasks, chunksize=16) if pool else map(_seedMetrics, tasks)
+        for cnt, (seed, mk, slr, speedup, eff, computed) in enumerate(results):
+            if verbose and cnt % 100 == 0:
+                print(f"Treating seed {seed}, {len(tasks) - cnt} left")
+            metrics.append((seed, mk, slr, speedup, eff))
+            if computed is not None:
+                newBaselines.append((f"{graphDir}/tmp{seed}{suffix}.gml", computed))
+    finally:
+        if pool:
+            pool.close()
+            pool.join()
+    if cacheFile and newBaselines:
+        with open(cacheFile, 'a') as file:
+            for graphfile, (minCP, seqMakespan, nbproc) in newBaselines:
+                file.write(f"{graphfile};{os.path.getmtime(graphfile)!r};{minCP!r};{seqMakespan!r};{nbproc}\n")
+    return metrics
+
+
 if __name__ == '__main__':
+    metrics = computeMetrics(range(4320), workers=0)
     writeFile = open("resSLR.log", "w")
-    listFile = listdir("res")
-    SLRs = []
-    speedups = []
-    effs = []
-    for seed in range(4320):
-        if seed % 100 == 0:
-            print(f"Treating seed {seed}, length listFile {len(listFile)}")
-        graph = readFile(f"graphs/tmp{seed}.gml", converter=False, verbose=False)
-        fileName = ""
-        line = ""
-        for fileName in listFile:
-            if fileName.endswith(f"-{seed}.csv"):
-                file = open("res/" + fileName)
-                file.readline()
-                file.readline()
-                file.readline()
-                file.readline()
-                file.readline()
-                file.readline()
-                file.readline()
-                line = file.readline()
-                file.close()
-                break
-        listFile.remove(fileName)
-        mk = (float(line.split()[1]))
-        print(mk)
-        minCP = getCP(graph, costFunction="minmin")
-        minMakespan = sum(map(lambda n: min(graph.graph['costmatrix'][n - 1]), minCP))
-        seqMakespan = sequentialScheduleLength(graph, False)
-        speedup = seqMakespan / mk
-        eff = speedup/graph.graph["nbproc"]
-        SLRs.append(mk / minMakespan)
-        speedups.append(speedup)
-        effs.append(eff)
-        writeFile.write(f"SLR : {mk / minMakespan} for seed {seed} \n")
+    for seed, mk, slr, speedup, eff in metrics:
+        writeFile.write(f"SLR : {slr} for seed {seed} \n")
     writeFile.close()
+    SLRs = [m[2] for m in metrics]
+    speedups = [m[3] for m in metrics]
+    effs = [m[4] for m in metrics]
     print(f"Mean :\n-----------\nSLR : {mean(SLRs)}\nSpeedup : {mean(speedups)}\nEfficiency : {mean(effs)}\n")
     print(f"Median :\n-----------\nSLR : {median(SLRs)}\nSpeedup : {median(speedups)}\nEfficiency : {median(effs)}\n")
     print(f"Std :\n-----------\nSLR : {stdev(SLRs)}\nSpeedup : {stdev(speedups)}\nEfficiency : {stdev(effs)}\n")
@@ -0,0 +1,161 @@
+import os
+import random
+from itertools import product
+from multiprocessing import Pool
+
+import numpy
+
+from computations.CompiledDAG import compileDAG
+from executions.ExtensiveTest import realTryHard
+from help.GraphGenerator import generateGraph, saveGraph
+from help.ResultFile import generationHeader, resultsToCSV
+
+LEVEL_SUFFIX = "-level"  # End of the names of the files of graphs whose edges were drawn level by level
+
+
+def campaignGrid(sizes, depths, sdComps, CCRs, cv, nbProcs):
+    """ List the points of a campaign, in the order in which seeds are given to them
+
+    :param sizes: Number of nodes of the graphs
+    :type sizes: list[int]
+    :param depths: Number of levels of the graphs, relatively to their size
+    :type depths: list[float]
+    :param sdComps: Standard Deviations of computations costs
+    :type sdComps: list[float]
+    :param CCRs: Communications to Computations Ratios
+    :type CCRs: list[float]
+    :param cv: Standard Deviations of communications costs, relatively to the CCR
+    :type cv: list[float]
+    :param nbProcs: Numbers of processors
+    :type nbProcs: list[int]
+    :return: Points in format [{'size': .., 'depth': .., 'sdComp': .., 'CCR': .., 'sdComm': .., 'nbproc': ..},..]
+    :rtype: list[dict]
+    """
+    return [dict(size=size, depth=int(depth * size), sdComp=sdComp, CCR=CCR, sdComm=c * CCR, nbproc=nbproc)
+            for size, depth, sdComp, CCR, c, nbproc in product(sizes, depths, sdComps, CCRs, cv, nbProcs)]
+
+
+def campaignPoints(grid, firstSeed=0, repeats=1, graphDir="graphs", resDir="res", legacyStream=True):
+    """ Give a seed and files to every point of a campaign : the grid is repeated **repeats** times, seeds following
+    each other from **firstSeed**
+
+    Without **legacyStream**, names of the files end with LEVEL_SUFFIX, so that a seed has distinct graphs and results
+    for both edge streams.
+
+    :param grid: Points of the campaign (see campaignGrid)
+    :type grid: list[dict]
+    :param firstSeed: Seed of the first point
+    :type firstSeed: int
+    :param repeats: Number of graphs generated for each point of the grid
+    :type repeats: int
+    :param graphDir: Directory of the generated graphs, None not to write them
+    :type graphDir: str
+    :param resDir: Directory of the result files
+    :type resDir: str
+    :param legacyStream: Draw the edges of the graphs as older versions, so that a seed gives the same graph ? (see
+        genGraph)
+    :type legacyStream: bool
+    :return: Points, along with their 'seed', 'graphfile', 'resfile' and 'legacyStream'
+    :rtype: list[dict]
+    """
+    points = []
+    for k in range(repeats * len(grid)):
+        point = dict(grid[k % len(grid)], seed=firstSeed + k, legacyStream=legacyStream)
+        suffix = "" if legacyStream else LEVEL_SUFFIX
+        point['graphfile'] = f"{graphDir}/tmp{point['seed']}{suffix}.gml" if graphDir is not None else None
+        point['resfile'] = f"{resDir}/output{point['size']}-{point['nbproc']}-{point['depth']}-{point['sdComp']}" \
+                           f"-{point['CCR']}-{round(point['sdComm'], 3)}-{point['seed']}{suffix}.csv"
+        points.append(point)
+    return points
+
+
+def runPoint(point):
+    """ Generate the graph of a point of a campaign then try every heuristic on it, writing its result file
+
+    Random generators are seeded as main.py does, before the generation and again before the sweep, so that results
+    are the same as with two runs of main.py. The graph is generated in memory and scheduled right away, its file
+    being written in background, if the point has a 'graphfile'.
+
+    :param point: Point to run (see campaignPoints)
+    :type point: dict
+    :return: Seed of the point
+    :rtype: int
+    """
+    seed = point['seed']
+    random.seed(seed)
+    numpy.random.seed(seed)
+    legacyStream = point.get('legacyStream', True)
+    graph = generateGraph(point['size'], point['depth'], point['sdComp'], point['sdComm'], point['CCR'],
+                          point['nbproc'], legacyStream=legacyStream)
+    saving = saveGraph(graph, point['graphfile']) if point['graphfile'] else None
+    header = generationHeader(seed, point['size'], point['depth'], point['sdComp'], point['sdComm'], point['CCR'],
+                              point['nbproc'], legacyStream)
+
+    random.seed(seed)
+    numpy.random.seed(seed)
+    graph.graph['nbproc'] = point['nbproc']
+    graph = compileDAG(graph)
+    results = realTryHard(graph, 1, False, point['graphfile'] or "")
+    file = open(point['resfile'], 'w')
+    file.write(resultsToCSV(results, header))
+    file.close()
+    if saving:
+        saving.result()
+    return seed
+
+
+def _doneKey(point):
+    """ Identify a point in the checkpoint of a campaign : its seed, followed by "level" if its edges are drawn level
+    by level """
+    return f"{point['seed']}" if point.get('legacyStream', True) else f"{point['seed']} level"
+
+
+def _tryPoint(point):
+    """ Run a point in a worker process, errors being returned instead of stopping the campaign """
+    try:
+        runPoint(point)
+        return point, None
+    except Exception as e:
+        return point, f"{type(e).__name__} : {e}"
+
+
+def runCampaign(points, workers=1, checkpoint="campaign.done", verbose=True):
+    """ Run every point of a campaign not done yet, in long-lived worker processes
+
+    Seeds of the points done are appended to **checkpoint** as soon as they are (followed by "level" for points whose
+    edges are drawn level by level), so that an interrupted campaign resumes where it stopped. Points whose result file already exists are considered as done too. Errors are
+    logged in error.log, the campaign going on.
+
+    :param points: Points of the campaign (see campaignPoints)
+    :type points: list[dict]
+    :param workers: Number of worker processes, 0 for one per core
+    :type workers: int
+    :param checkpoint: File listing the points done
+    :type checkpoint: str
+    :param verbose: Print progress ?
+    :type verbose: bool
+    :return: Seeds of the points that failed
+    :rtype: list[int]
+    """
+    done = set()
+    if os.path.exists(checkpoint):
+        with open(checkpoint) as file:
+            done = {" ".join(line.split()) for line in file if line.strip()}
+    todo = [p for p in points if _doneKey(p) not in done and not os.path.exists(p['resfile'])]
+    for directory in {os.path.dirname(p[f]) for p in todo for f in ['graphfile', 'resfile'] if p[f]} - {""}:
+        os.makedirs(directory, exist_ok=True)
+    failed = []
+    with Pool(workers or os.cpu_count()) as pool, open(checkpoint, 'a') as file:
+        for cnt, (point, error) in enumerate(pool.imap_unordered(_tryPoint, todo), 1):
+            seed = point['seed']
+            if error:
+                failed.append(seed)
+                log = open("error.log", 'a')
+                log.write(f"Error for seed {_doneKey(point)} : {error}\n")
+                log.close()
+            else:
+                file.write(f"{_doneKey(point)}\n")
+                file.flush()
+            if verbose:
+                print(f"Seed {seed} {'failed' if error else 'done'} ({cnt}/{len(todo)})")
+    return failed
@@ -1,24 +1,25 @@
+import math
+import os
 import timeit
-from typing import Dict, Tuple, List
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
 
+import numpy as np
+
+from computations.CompCost import computeCompCost
+from computations.CompiledDAG import CompiledDAG, compileDAG
+from computations.LBMatrix import computeLB
+from computations.Lookahead import lookaheadTables
 from computations.Priorities import getExitTask
-from executions.TotalComputation import computeSchedule
+from executions.TotalComputation import computePriorities, computeSchedule
 from tests.VerifPrecedence import verifPrec
 
 
-# noinspection PyBroadException
-def tryEverything(g, verbose, graphname):
-    """ Try every heuristic possible according to given array
-
+def listHeuristics():
+    """ List every heuristic combination tried by tryEverything, in order
 
-    :param g: DAG to schedule
-    :type g: networkx.DiGraph
-    :param verbose: Print non-necessary information ?
-    :type verbose: bool
-    :param graphname: Name of the graph used, for error tracking purpose
-    :type graphname: str
-    :return: Results of each heuristics and runtime in ms {heuristic : [makespan, runtime]}
-    :rtype: dict[str, list[float]]
+    :return: Name of each heuristic along with the parameters of computeSchedule, in format [(name, params),..]
+    :rtype: list[(str, dict)]
     """
     prio = ['rku', 'random', 'BIL', 'rkd', 'cluHPS', 'rkusd', 'rkuad']
     placement = ['eft', 'BIM*', 'OLB', 'MET', 'DL', 'GDL']
@@ -27,9 +28,7 @@ def tryEverything(g, verbose, graphname):
     useOfBIM = [False, True]
     insertion = [False, True]
     BSA = [False, True]
-    res: Dict[str, List[float]] = {}
-    cnt = 0
-
+    heuristics = []
     for ip, p in enumerate(prio):
         for ipl, pl in enumerate(placement):
             for ic, c in enumerate(costFunction):
@@ -38,40 +37,201 @@ def tryEverything(g, verbose, graphname):
                         for iu, u in enumerate(useOfBIM):
                             for ii, i in enumerate(insertion):
                                 for ib, b in enumerate(BSA):
-                                    cnt += 1
                                     name = ";".join(map(str, [ip, ic, ipl, idd, iu, ii, ib]))
+                                    heuristics.append((name, dict(strategyPrio=p, costFunction=c, strategyPlacement=pl,
+                                                                  useOfBIM=u, desc=d, insertion=i, bsa=b)))
+    return heuristics
+
+
+def _timeStage(g, key, compute):
+    """ Compute a memoized stage from scratch and time it in ms, once per DAG, the stages it produces being kept """
+    timeKey = ('time',) + key
+    if timeKey not in g.stages:
+        stages, g.stages = g.stages, {}
+        start = timeit.default_timer()
+        try:
+            compute()
+        finally:
+            elapsed = 1000 * (timeit.default_timer() - start)
+            fresh, g.stages = g.stages, stages
+        for k, v in fresh.items():
+            stages.setdefault(k, v)
+        stages[timeKey] = elapsed
+    return g.stages[timeKey]
+
+
+def warmStages(g, params, verbose=False):
+    """ Compute the memoized stages used by a heuristic before it is timed, returning the time they take
+
+    Priorities of (prio, cost), mean costs of DL and GDL placements and lookahead tables of DLS/DC are memoized in the
+    stages of the compiled DAG, so that only the first heuristic using them would pay for them, depending on the order
+    of the sweep and on the worker running it. Each stage is instead computed from scratch and timed once, and its time
+    is added to every heuristic using it : every runtime measures the same work, as if nothing was memoized.
+
+    :param g: DAG to schedule
+    :type g: CompiledDAG
+    :param params: Parameters of computeSchedule
+    :type params: dict
+    :param verbose: Print non-necessary information ?
+    :type verbose: bool
+    :return: Time of the stages used by the heuristic, in ms
+    :rtype: float
+    """
+    p, c = params['strategyPrio'], params['costFunction']
+    elapsed = _timeStage(g, ('prio', p, c), lambda: computePriorities(g, p, c, verbose))
+    if params['strategyPlacement'] in ["DL", "GDL"]:  # Mean costs not already computed along with priorities
+        if p in ["random", "BIL", "cluHPS"]:
+            elapsed += _timeStage(g, ('compcost', c), lambda: computeCompCost(g, c, verbose))
+        if p in ["random", "BIL"]:
+            elapsed += _timeStage(g, ('lb', c), lambda: computeLB(g, c, verbose))
+    if params['desc'] == 'DLS/DC':
+        elapsed += _timeStage(g, ('lookahead',), lambda: lookaheadTables(g))
+    return elapsed
+
+
+# noinspection PyBroadException
+def tryHeuristic(g, name, params, verbose, graphname):
+    """ Compute and check the schedule of a single heuristic, timing it on its own along with the stages it uses
+    (see warmStages). Invalid schedules are logged in error.log and given an infinite makespan, the sweep going on
+
+    :param g: DAG to schedule
+    :type g: CompiledDAG
+    :param name: Name of the heuristic, as given by listHeuristics
+    :type name: str
+    :param params: Parameters of computeSchedule
+    :type params: dict
+    :param verbose: Print non-necessary information ?
+    :type verbose: bool
+    :param graphname: Name of the graph used, for error tracking purpose
+    :type graphname: str
+    :return: Makespan (inf if the schedule is invalid) and runtime in ms
+    :rtype: list[float]
+    """
+    try:
+        stageTime = warmStages(g, params, verbose)
+        startScheduling = timeit.default_timer()
+        schedule = computeSchedule(g, verbose=verbose, **params)
+        violations = verifPrec(g, schedule, verbose)
+        endScheduling = timeit.default_timer()
+        if violations:
+            file = open("error.log", 'a')
+            file.write(f"Invalid schedule for {name} on file {graphname} : {len(violations)} violation(s), first "
+                       f"one : {violations[0]['message']}\n")
+            file.close()
+        timeS = round(1000 * (endScheduling - startScheduling) + stageTime, 2)
+        if verbose:
+            print(f"Time : {timeS}ms")
+        return [math.inf if violations else round(schedule[getExitTask(g)][2], 6), timeS]
+    except Exception as _:
+        print("Error for : " + name + " on file " + graphname)
+        file = open("error.log", 'a')
+        file.write(f"Error for {name} on file {graphname}\n")
+        file.close()
+        raise _
+
+
+def meanCostsAfter(params, meanCosts=(None, None)):
+    """ Return the cost functions of the mean costs left in g.graph by a heuristic
+
+    Strategies that do not compute mean costs (such as 'random' or 'BIL' with 'eft') keep reading the ones left by the
+    previous heuristic of the sweep, so that a worker must set them again before running a batch.
+
+    :param params: Parameters of computeSchedule
+    :type params: dict
+    :param meanCosts: Cost functions of meancompcost and of meanB/meanL before the heuristic
+    :type meanCosts: (str, str)
+    :return: Cost functions of meancompcost and of meanB/meanL after the heuristic
+    :rtype: (str, str)
+    """
+    compCost, lb = meanCosts
+    c = params['costFunction']
+    if params['strategyPrio'] in ["rku", "rkd", "rkusd", "rkuad"] or params['strategyPlacement'] in ["DL", "GDL"]:
+        compCost = lb = c
+    elif params['strategyPrio'] == "cluHPS":
+        lb = c
+    return compCost, lb
+
+
+_worker = {}  # State of a worker process of the parallel sweep
+
+
+def _initWorker(graph, shared, verbose, graphname):
+    """ Rebuild the compiled DAG of the sweep from shared memory, once per worker process """
+    blocks = {key: shared_memory.SharedMemory(name=name) for key, (name, shape, dtype) in shared.items()}
+    arrays = {key: np.ndarray(shape, dtype=dtype, buffer=blocks[key].buf) for key, (name, shape, dtype) in
+              shared.items()}
+    graph = dict(graph)
+    graph['costmatrix'] = arrays['cost'].tolist()
+    _worker.update(blocks=blocks, dag=CompiledDAG.fromArrays(graph, arrays), verbose=verbose, graphname=graphname)
+
+
+def _tryBatch(meanCosts, batch):
+    """ Try a batch of heuristics in a worker process, starting from the mean costs of the sequential sweep """
+    g = _worker['dag']
+    compCost, lb = meanCosts
+    if compCost is not None:
+        computeCompCost(g, compCost)
+    if lb is not None:
+        computeLB(g, lb)
+    return [(name, tryHeuristic(g, name, params, _worker['verbose'], _worker['graphname'])) for name, params in batch]
+
+
+def tryEverything(g, verbose, graphname, workers=1):
+    """ Try every heuristic possible according to given array
+
+    With several workers, heuristics are spread over a process pool, in batches sharing the same priority, placement
+    and cost function so that each worker reuses its memoized stages. The arrays of the compiled DAG are put in shared
+    memory once, every worker rebuilding the DAG from them. Each heuristic is still timed on its own, inside the worker,
+    along with the stages it uses (see warmStages), and results are the same as with a single process (see
+    meanCostsAfter).
+
+    :param g: DAG to schedule
+    :type g: networkx.DiGraph | CompiledDAG
+    :param verbose: Print non-necessary information ?
+    :type verbose: bool
+    :param graphname: Name of the graph used, for error tracking purpose
+    :type graphname: str
+    :param workers: Number of worker processes, 0 for one per core
+    :type workers: int
+    :return: Results of each heuristics and runtime in ms {heuristic : [makespan, runtime]}
+    :rtype: dict[str, list[float]]
+    """
+    g = compileDAG(g)
+    heuristics = listHeuristics()
+    if workers == 0:
+        workers = os.cpu_count()
+    if workers <= 1:
+        return {name: tryHeuristic(g, name, params, verbose, graphname) for name, params in heuristics}
+
+    batches = []
+    meanCosts = (None, None)
+    for name, params in heuristics:
+        key = params['strategyPrio'], params['strategyPlacement'], params['costFunction']
+        if not batches or batches[-1][0] != key:
+            batches.append((key, meanCosts, []))
+        batches[-1][2].append((name, params))
+        meanCosts = meanCostsAfter(params, meanCosts)
+    blocks = {}
+    try:
+        shared = {}
+        for key, array in g.baseArrays.items():
+            blocks[key] = shared_memory.SharedMemory(create=True, size=max(array.nbytes, 1))
+            np.ndarray(array.shape, dtype=array.dtype, buffer=blocks[key].buf)[...] = array
+            shared[key] = (blocks[key].name, array.shape, array.dtype.str)
+        graph = {k: v for k, v in g.graph.items() if k not in ['compiled', 'costmatrix']}
+        with ProcessPoolExecutor(max_workers=workers, initializer=_initWorker,
+                                 initargs=(graph, shared, verbose, graphname)) as pool:
+            done = {}
+            for results in pool.map(_tryBatch, [b[1] for b in batches], [b[2] for b in batches]):
+                done.update(results)
+    finally:
+        for block in blocks.values():
+            block.close()
+            block.unlink()
+    return {name: done[name] for name, params in heuristics}
+
 
-                                    # dispName = "-".join(map(str, [p, pl, c, d, u, i, b]))
-                                    # print("Heuristic n°", cnt, "-", dispName)
-                                    # print("Heuristic n°", cnt, "-", name)
-
-                                    startScheduling = timeit.default_timer()
-                                    try:
-                                        schedule = computeSchedule(g, strategyPrio=p, costFunction=c,
-                                                                   strategyPlacement=pl,
-                                                                   useOfBIM=u, desc=d,
-                                                                   insertion=i, bsa=b, verbose=verbose)
-                                        verifPrec(g, schedule, verbose)
-                                        endScheduling = timeit.default_timer()
-                                        # print("Ended in :", 1000*(endScheduling - startScheduling), "ms")
-                                        # print("Ended in :", round(1000 * (endScheduling - startScheduling),2), "ms")
-                                        timeS = round(1000 * (endScheduling - startScheduling), 2)
-                                        # print(f"timeS : {timeS}")
-                                        if verbose:
-                                            print(f"Time : {timeS}ms")
-                                        res[name] = [round(schedule[getExitTask(g)][2], 6), timeS]
-                                    except Exception as _:
-
-                                        print("Error for : " + name + " on file " + graphname)
-                                        file = open("error.log", 'a')
-                                        file.write(f"Error for {name} on file {graphname}\n")
-                                        file.close()
-                                        raise _
-                                        return res
-    return res
-
-
-def realTryHard(g, n, verbose=False, graphname=""):
+def realTryHard(g, n, verbose=False, graphname="", workers=1):
     """ Try every heuristics a given number of time, to measure a meaningful runtime
 
     :param g: DAG to schedule
@@ -82,13 +242,15 @@ def realTryHard(g, n, verbose=False, graphname=""):
     :type verbose: bool
     :param graphname: Name of the graph used, for error tracking purpose
     :type graphname: str
+    :param workers: Number of worker processes, 0 for one per core
+    :type workers: int
     :return: Results of each heuristics and runtime in ms {heuristic : [makespan, runtime]}
     :rtype: dict[str, list[float]]
     """
     tot = None
     for i in range(n):
         # print("Starting batch ", i)
-        res = tryEverything(g, verbose, graphname)
+        res = tryEverything(g, verbose, graphname, workers)
         if tot is None:
             tot = res
         else:
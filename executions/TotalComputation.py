@@ -1,5 +1,6 @@
-import networkx as nx
-
+from computations.CompCost import computeCompCost
+from computations.CompiledDAG import compileDAG
+from computations.LBMatrix import computeLB
 from computations.Placements import placeEFTBIM, placeEFT, placeBIMStarBIM, placeBIMStar, placeOLB, placeMET, \
     placeDLBIM, placeDL, placeGDLBIM, placeGDL, placeSerial
 from computations.PostTreatments import applyBSA
@@ -9,39 +10,38 @@ from exceptions.StrategyPrioException import StrategyPrioException
 from executions.Executions import execRKU, execBIL, execRKD, execRKUSD, execRKUAD, execCluHPS
 
 
-def computeWithList(g, strategyPrio="rku", strategyPlacement="eft", costFunction="mean", desc=None, useOfBIM=False,
-                    insertion=True, bsa=False, verbose=False):
-    """Compute a schedule using list-based heuristic
+def computePriorities(g, strategyPrio="rku", costFunction="mean", verbose=False):
+    """ Compute the priority of every node and the resulting ordered list of nodes, starting with the entry task
+
+    Priorities only depend on (strategyPrio, costFunction) and on the platform, so that they are memoized in the
+    stages of the compiled DAG and shared by every placement, lookahead, BIM, insertion and BSA variant. On a hit,
+    the mean costs computed by the strategy are set again in g.graph, as the placements and lookaheads read them.
 
     :param g: DAG to schedule
-    :type g: nx.DiGraph
+    :type g: CompiledDAG
     :param strategyPrio: Priority-computations strategy ('rku', 'random', 'BIL', 'rkd', 'rkusd', 'rkuad', 'cluHPS')
     :type strategyPrio: str
-    :param strategyPlacement: Placement-strategy ('eft', 'BIM*', 'OLB', 'MET', 'DL', 'GDL')
-    :type strategyPlacement: str
     :param costFunction: Function used to simplify comp/comm cost ('mean', 'median', 'maxmax', 'minmin',\
     'minmax', 'maxmin')
     :type costFunction: str
-    :param desc: Lookahead strategy ('DLS/DC', None)
-    :type desc: str
-    :param useOfBIM: Use of BIM strategy (k-th smallest) ?
-    :type useOfBIM: bool
-    :param insertion: Use of insertion-based policy ?
-    :type insertion: bool
-    :param bsa: Use of BSA post-treatment ?
-    :type bsa: bool
     :param verbose: Print non-necessary information ?
     :type verbose: bool
     :raises StrategyPrioException: If strategyPrio is unknown
-    :raises StrategyPlacementException: If strategyPlacement is unknown
-    :return: A corresponding schedule in format {task : [proc, est, eft],..}
-    :rtype: dict[int, (int, float, float)]
+    :return: Ordered list of nodes
+    :rtype: list[int]
     """
-
+    stage = g.stages.get(('prio', strategyPrio, costFunction))
+    if stage is not None:
+        nodes, g.graph['prio'] = stage
+        if strategyPrio in ["rku", "rkd", "rkusd", "rkuad"]:
+            computeCompCost(g, costFunction, verbose)
+        if strategyPrio in ["rku", "rkd", "rkusd", "rkuad", "cluHPS"]:
+            computeLB(g, costFunction, verbose)
+        return list(nodes)
     if strategyPrio == "rku":
         nodes = execRKU(g, costFunction=costFunction, verbose=verbose)
     elif strategyPrio == "random":  # Topological sort
-        nodes = list(nx.topological_sort(g))
+        nodes = list(g.topo)
         g.graph['prio'] = list(range(len(nodes)))
     elif strategyPrio == "BIL":
         nodes = execBIL(g, verbose=verbose)
@@ -58,6 +58,40 @@ def computeWithList(g, strategyPrio="rku", strategyPlacement="eft", costFunction
 
     nodes.remove(getEntryTask(g, verbose))
     nodes = [getEntryTask(g, verbose)] + nodes
+    g.stages['prio', strategyPrio, costFunction] = nodes, g.graph['prio']
+    return list(nodes)
+
+
+def computeWithList(g, strategyPrio="rku", strategyPlacement="eft", costFunction="mean", desc=None, useOfBIM=False,
+                    insertion=True, bsa=False, verbose=False):
+    """Compute a schedule using list-based heuristic
+
+    :param g: DAG to schedule
+    :type g: networkx.DiGraph | CompiledDAG
+    :param strategyPrio: Priority-computations strategy ('rku', 'random', 'BIL', 'rkd', 'rkusd', 'rkuad', 'cluHPS')
+    :type strategyPrio: str
+    :param strategyPlacement: Placement-strategy ('eft', 'BIM*', 'OLB', 'MET', 'DL', 'GDL')
+    :type strategyPlacement: str
+    :param costFunction: Function used to simplify comp/comm cost ('mean', 'median', 'maxmax', 'minmin',\
+    'minmax', 'maxmin')
+    :type costFunction: str
+    :param desc: Lookahead strategy ('DLS/DC', None)
+    :type desc: str
+    :param useOfBIM: Use of BIM strategy (k-th smallest) ?
+    :type useOfBIM: bool
+    :param insertion: Use of insertion-based policy ?
+    :type insertion: bool
+    :param bsa: Use of BSA post-treatment ?
+    :type bsa: bool
+    :param verbose: Print non-necessary information ?
+    :type verbose: bool
+    :raises StrategyPrioException: If strategyPrio is unknown
+    :raises StrategyPlacementException: If strategyPlacement is unknown
+    :return: A corresponding schedule in format {task : [proc, est, eft],..}
+    :rtype: dict[int, (int, float, float)]
+    """
+    g = compileDAG(g, check=True)
+    nodes = computePriorities(g, strategyPrio, costFunction, verbose)
 
     if strategyPlacement == "eft":
         if useOfBIM:
@@ -99,7 +133,7 @@ def computeSchedule(g, category="list", strategyPrio="rku", strategyPlacement="e
     """ Compute schedule
 
     :param g: DAG to schedule
-    :type g: nx.DiGraph
+    :type g: networkx.DiGraph | CompiledDAG
     :param category: Type of scheduling algorithm to use ('list', 'clustering')
     :type category: str
     :param strategyPrio: Priority-computations strategy ('rku', 'random', 'BIL')
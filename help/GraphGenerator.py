@@ -1,11 +1,124 @@
-import os
+from concurrent.futures import ThreadPoolExecutor
 
-from help.Converter import igraphToNetworkX
-from help.recursiveGenLength import executionL
+import networkx as nx
+import numpy as np
+from numpy import random
 
+from help.recursiveGenLength import TABLE_DIR, countingTable, randomShape, shapeToCSR
 
-def genGraph(length, depth, filename, sdComp, sdComm, CCR, nbproc):
-    """ Generate a graph using recursiveGenLength.py
+_writer = None  # Background thread writing the graphs to persist (see saveGraph)
+
+
+def generateGraph(length, depth, sdComp, sdComm, CCR, nbproc, logDomain=False, legacyStream=True,
+                  tableDir=TABLE_DIR):
+    """ Generate a graph entirely in memory : shape, edges, then computations and communications costs
+
+    Random draws are the same as those of executionL and Converter.igraphToNetworkX, and the graph is built as
+    readFile returns the file they wrote (same nodes and edges, in the same order, same costs). With **legacyStream**
+    (the default), a given seed thus still gives the same graph and the same schedules as older versions.
+
+    :param length: Length of the graph (number of nodes)
+    :type length: int
+    :param depth: Depth of the graph (number of levels)
+    :type depth: int
+    :param sdComp: Standard Deviation of computations costs
+    :type sdComp: float
+    :param sdComm: Standard Deviation of communications costs
+    :type sdComm: float
+    :param CCR: Communications to Computations Ratio
+    :type CCR: float
+    :param nbproc: Number of processors used when generating the graph
+    :type nbproc: int
+    :param logDomain: Count shapes with floats in log domain instead of mpmath (for large graphs, see countingMethodLog)
+    :type logDomain: bool
+    :param legacyStream: Draw edges one by one as formerly, to get the same graph as older versions for a given seed ?
+        Otherwise, edges are drawn level by level, faster but giving another graph for the same seed
+    :type legacyStream: bool
+    :param tableDir: Directory caching the counting tables (see countingTable)
+    :type tableDir: str
+    :return: Generated graph, ready to be scheduled
+    :rtype: networkx.DiGraph
+    """
+    n, depth, nbproc = int(length), int(depth), int(nbproc)
+    sdComp, sdComm, CCR = float(sdComp), float(sdComm), float(CCR)
+    shape = randomShape(countingTable(n, depth, logDomain, tableDir), n, depth)
+    indptr, indices = shapeToCSR(shape, legacyStream)
+
+    # Edges as listed by networkx once read back : by source, then by target
+    dst = np.repeat(np.arange(n), np.diff(indptr))
+    order = np.lexsort((dst, indices))
+    src, dst = indices[order], dst[order]
+
+    costmatrix = random.gamma(1. / (sdComp ** 2), (sdComp ** 2), (n, nbproc)).tolist()
+    weights = random.gamma(CCR ** 2 / (sdComm ** 2), (sdComm ** 2) / CCR, len(src)).tolist()
+
+    # Root (-1) and sink (n) nodes, linked with weight 0 edges to every entry or exit node if there are several
+    nodes = list(range(n))
+    edges = list(zip(src.tolist(), dst.tolist(), weights))
+    entries = np.flatnonzero(np.diff(indptr) == 0).tolist()
+    exits = np.flatnonzero(np.bincount(src, minlength=n) == 0).tolist()
+    if len(exits) > 1:
+        nodes.append(n)
+        edges += [(e, n, 0) for e in exits]
+        edges.sort(key=lambda edge: edge[0])  # Exit nodes have no other successor
+        costmatrix = costmatrix + [[0] * nbproc]
+    if len(entries) > 1:
+        nodes.insert(n, -1)
+        edges += [(-1, e, 0) for e in entries]
+        costmatrix = [[0] * nbproc] + costmatrix
+    diff = 2 if len(entries) > 1 else 1
+
+    g = nx.DiGraph()
+    g.graph['costmatrix'] = costmatrix
+    g.graph['B'] = [[1] * nbproc for _ in range(nbproc)]
+    g.graph['L'] = [0] * nbproc
+    g.graph['nbproc'] = nbproc
+    g.add_nodes_from(i + diff for i in nodes)
+    g.add_weighted_edges_from((u + diff, v + diff, w) for u, v, w in edges)
+    return g
+
+
+def _writeGML(snapshot, filename):
+    """ Write a graph snapshot taken by saveGraph, in the format of Converter.igraphToNetworkX """
+    graph, nodes, edges = snapshot
+    g = nx.DiGraph()
+    g.graph.update((key, value if key == 'nbproc' else str(value)) for key, value in graph.items())
+    g.add_nodes_from(nodes)
+    g.add_weighted_edges_from(edges)
+    nx.write_gml(g, filename, lambda x: str(x))
+    return filename
+
+
+def saveGraph(graph, filename, wait=False):
+    """ Persist a generated graph in a GML file, readable by readFile
+
+    The graph is copied right away, so that it can be scheduled (and its attributes modified) while it is written by
+    a background thread.
+
+    :param graph: Graph given by generateGraph
+    :type graph: networkx.DiGraph
+    :param filename: Output filename
+    :type filename: str
+    :param wait: Wait for the file to be written ?
+    :type wait: bool
+    :return: Future of the writing, giving the filename
+    :rtype: concurrent.futures.Future
+    """
+    global _writer
+    snapshot = ({'costmatrix': [list(row) for row in graph.graph['costmatrix']],
+                 'B': [list(row) for row in graph.graph['B']], 'L': list(graph.graph['L']),
+                 'nbproc': graph.graph['nbproc']},
+                list(graph.nodes), list(graph.edges(data='weight')))
+    if _writer is None:
+        _writer = ThreadPoolExecutor(max_workers=1)
+    future = _writer.submit(_writeGML, snapshot, filename)
+    if wait:
+        future.result()
+    return future
+
+
+def genGraph(length, depth, filename, sdComp, sdComm, CCR, nbproc, logDomain=False, legacyStream=True, wait=True):
+    """ Generate a graph using recursiveGenLength.py, and write it in a file
 
     :param length: Length of the graph (number of nodes)
     :type length: int
@@ -21,13 +134,16 @@ def genGraph(length, depth, filename, sdComp, sdComm, CCR, nbproc):
     :type CCR: float
     :param nbproc: Number of processors used when generating the graph
     :type nbproc: int
-    :return: Generated and converted graph
+    :param logDomain: Count shapes with floats in log domain instead of mpmath (for large graphs, see countingMethodLog)
+    :type logDomain: bool
+    :param legacyStream: Draw edges one by one as formerly, to get the same graph as older versions for a given seed ?
+        Otherwise, edges are drawn level by level, faster but giving another graph for the same seed
+    :type legacyStream: bool
+    :param wait: Wait for the file to be written ? Otherwise it is written in background (see saveGraph)
+    :type wait: bool
+    :return: Generated graph
     :rtype: networkx.DiGraph
     """
-    filename, ext = filename.split(".")
-    igraphFile = filename+"-igraph."+ext
-    networkxFile = filename+"."+ext
-    executionL(int(length), int(depth), igraphFile)
-    graph = igraphToNetworkX(igraphFile, networkxFile, float(sdComp), float(sdComm), float(CCR), int(nbproc))
-    os.remove(igraphFile)
+    graph = generateGraph(length, depth, sdComp, sdComm, CCR, nbproc, logDomain, legacyStream)
+    saveGraph(graph, filename, wait)
     return graph
@@ -23,6 +23,8 @@ def defineParser():
     parser.add_argument("filename", help="output file")
     parser.add_argument("-m", "--mail", help="send results by mail", action="store_true")
     parser.add_argument("-mf", "--mailfilename", help="file containing mail information", default="mailinfo")
+    parser.add_argument("-b", "--binary", help="write the results of --all in the binary columnar format\n"
+                                               "(see help.ResultFile) instead of CSV", action="store_true")
 
     graphSource = parser.add_mutually_exclusive_group(required=True)
     graphSource.add_argument("-g", "--generate", help="generate graph to use.\nthe mean of computation cost is "
@@ -42,4 +44,9 @@ def defineParser():
 
     parser.add_argument("-p", "--nbproc", help="number of processors available", required=False)
     parser.add_argument("-s", "--seed", help="seed for the random generation")
+    parser.add_argument("-l", "--levelstream", help="draw the edges of a generated graph level by level : faster, but "
+                                                    "a seed gives\nanother graph than with older versions",
+                        action="store_true")
+    parser.add_argument("-w", "--workers", help="number of worker processes used by --all, 0 for one per core",
+                        type=int, default=1)
     return parser
@@ -0,0 +1,254 @@
+import math
+
+import numpy as np
+
+# Columns of a result file : indexes of the heuristic (as in the names given by listHeuristics), then its results
+HEURISTIC_COLUMNS = ['prio', 'cost', 'placement', 'desc', 'BIM', 'ins', 'bsa']
+COLUMNS = [(column, np.dtype(np.uint8)) for column in HEURISTIC_COLUMNS] + \
+          [('makespan', np.dtype('<f8')), ('time', np.dtype('<f8'))]
+ALIGNMENT = 8
+
+
+def parseHeader(text):
+    """ Parse the metadata lines (in format "#@key value") of a result file
+
+    :param text: Lines to parse, other lines being ignored
+    :type text: str | list[str]
+    :return: Metadata in format {key : value,..}, values left as strings
+    :rtype: dict[str, str]
+    """
+    if isinstance(text, str):
+        text = text.splitlines()
+    metadata = {}
+    for line in text:
+        if line.startswith("#@"):
+            fields = line[2:].split(maxsplit=1)
+            if fields:
+                metadata[fields[0]] = fields[1].strip() if len(fields) > 1 else ""
+    return metadata
+
+
+def generationHeader(seed, size, depth, sdComp, sdComm, CCR, nbproc, legacyStream=True):
+    """ Return the metadata lines describing a generated graph, as written at the top of its result file
+
+    :param seed: Seed used for the random generation
+    :param size: Number of nodes
+    :param depth: Number of levels
+    :param sdComp: Standard Deviation of computations costs
+    :param sdComm: Standard Deviation of communications costs
+    :param CCR: Communications to Computations Ratio
+    :param nbproc: Number of processors
+    :param legacyStream: Were edges drawn as by older versions (see genGraph) ? Otherwise, an "#@edgeStream level"
+        line tells the results apart, since a seed then gives another graph
+    :return: Metadata lines in format "#@key value"
+    :rtype: str
+    """
+    header = f"#@seed {seed}\n"
+    header += f"#@graphSize {size}\n"
+    header += f"#@graphDepth {depth}\n"
+    header += f"#@sdComp {sdComp}\n"
+    header += f"#@sdComm {round(float(sdComm), 2)}\n"
+    header += f"#@CCR {CCR}\n"
+    header += f"#@nbproc {nbproc}\n"
+    if not legacyStream:
+        header += "#@edgeStream level\n"
+    return header
+
+
+def invalidHeuristics(results):
+    """ List the heuristics whose schedule was invalid, given an infinite makespan by tryHeuristic
+
+    :param results: Results of each heuristic in format {heuristic : [makespan, runtime],..}
+    :type results: dict[str, list[float]]
+    :return: Invalid heuristics, in the order of **results**
+    :rtype: list[str]
+    """
+    return [heur for heur, (makespan, time) in results.items() if math.isinf(makespan)]
+
+
+def resultsToCSV(results, header=""):
+    """ Format the results of a sweep as CSV, heuristics sorted by makespan then runtime, makespans being given
+    relatively to the best one
+
+    Heuristics whose schedule was invalid get no row : they are listed in an "#@invalid" metadata line instead, in
+    format "heur,heur,..".
+
+    :param results: Results of each heuristic in format {heuristic : [makespan, runtime],..}
+    :type results: dict[str, list[float]]
+    :param header: Metadata lines to write first
+    :type header: str
+    :return: Content of the CSV file
+    :rtype: str
+    """
+    invalid = invalidHeuristics(results)
+    rs = [heur for heur in sorted(results, key=results.get, reverse=False) if not math.isinf(results[heur][0])]
+    minmk = round(results[rs[0]][0], 4) if rs else math.inf
+    resultCSV = header
+    if invalid:
+        resultCSV += f"#@invalid {','.join(invalid)}\n"
+    resultCSV += f"#@minmk {minmk}\n\n"
+    resultCSV += "prio;cost;placement;desc;BIM;ins;bsa;makespan;time\n"
+    for tryIndex in rs:
+        resultCSV += f"{tryIndex};{round(minmk / results[tryIndex][0], 4)};{results[tryIndex][1]}\n"
+    return resultCSV
+
+
+def _padding(size):
+    """ Number of bytes to add to **size** to reach the next aligned offset """
+    return -size % ALIGNMENT
+
+
+def writeResults(filename, results, metadata=None):
+    """ Write the results of a sweep in the binary columnar format
+
+    The file starts with a text header of "#@key value" lines (the same metadata as the CSV output, along with the
+    number of rows), ended by a "#@end" line padded so that the columns are aligned. Columns follow one after the
+    other, in the order of COLUMNS, each padded to the alignment. They can thus be memory-mapped (see readResults).
+    As in resultsToCSV, heuristics whose schedule was invalid get no row but are listed in an "#@invalid" line.
+
+    :param filename: File to write
+    :type filename: str
+    :param results: Results of each heuristic in format {heuristic : [makespan, runtime],..}, heuristics being named
+        as in listHeuristics
+    :type results: dict[str, list[float]]
+    :param metadata: Metadata of the run, in format {key : value,..}
+    :type metadata: dict[str, Any]
+    :rtype: None
+    """
+    invalid = invalidHeuristics(results)
+    results = {heur: result for heur, result in results.items() if not math.isinf(result[0])}
+    rows = len(results)
+    columns = {column: np.empty(rows, dtype=dtype) for column, dtype in COLUMNS}
+    heuristics = np.empty((rows, len(HEURISTIC_COLUMNS)), dtype=np.uint8)
+    for row, (name, (makespan, time)) in enumerate(results.items()):
+        heuristics[row] = name.split(';')
+        columns['makespan'][row] = makespan
+        columns['time'][row] = time
+    for k, column in enumerate(HEURISTIC_COLUMNS):
+        columns[column][:] = heuristics[:, k]
+
+    header = "#@format columns\n"
+    for key, value in (metadata or {}).items():
+        if key not in ['format', 'rows', 'end', 'invalid']:
+            header += f"#@{key} {value}\n"
+    if invalid:
+        header += f"#@invalid {','.join(invalid)}\n"
+    header += f"#@rows {rows}\n"
+    header = header.encode()
+    header += b"#@end" + b" " * _padding(len(header) + len("#@end\n")) + b"\n"
+    with open(filename, 'wb') as file:
+        file.write(header)
+        for column, dtype in COLUMNS:
+            data = columns[column].tobytes()
+            file.write(data + b"\0" * _padding(len(data)))
+
+
+def readResults(filename, mmap=True):
+    """ Read a result file written by writeResults
+
+    :param filename: File to read
+    :type filename: str
+    :param mmap: Memory-map the columns instead of loading them ?
+    :type mmap: bool
+    :return: Metadata in format {key : value,..} (values as strings) and columns in format {column : array,..}
+    :rtype: (dict[str, str], dict[str, numpy.ndarray])
+    """
+    lines = []
+    with open(filename, 'rb') as file:
+        for line in file:
+            lines.append(line.decode())
+            if line.startswith(b"#@end"):
+                break
+        offset = file.tell()
+    metadata = parseHeader(lines)
+    if metadata.get('format') != 'columns':
+        raise ValueError(f"{filename} is not a columnar result file")
+    del metadata['format']
+    rows = int(metadata.pop('rows'))
+    del metadata['end']
+    columns = {}
+    for column, dtype in COLUMNS:
+        if rows == 0:
+            columns[column] = np.empty(0, dtype=dtype)
+        elif mmap:
+            columns[column] = np.memmap(filename, dtype=dtype, mode='r', offset=offset, shape=(rows,))
+        else:
+            columns[column] = np.fromfile(filename, dtype=dtype, count=rows, offset=offset)
+        offset += rows * dtype.itemsize + _padding(rows * dtype.itemsize)
+    return metadata, columns
+
+
+def heuristicNames(columns):
+    """ Return the name of the heuristic of every row, as given by listHeuristics
+
+    :param columns: Columns read by readResults
+    :type columns: dict[str, numpy.ndarray]
+    :return: Names of the heuristics, in format ["prio;cost;placement;desc;BIM;ins;bsa",..]
+    :rtype: list[str]
+    """
+    indexes = np.stack([np.asarray(columns[column]) for column in HEURISTIC_COLUMNS], axis=1).tolist()
+    return [";".join(map(str, row)) for row in indexes]
+
+
+def isColumnar(path):
+    """ Tell whether a file is a result file in the binary columnar format (see writeResults)
+
+    :param path: File to check
+    :type path: str
+    :return: Is it a columnar result file ?
+    :rtype: bool
+    """
+    with open(path, 'rb') as file:
+        return file.read(16).startswith(b"#@format columns")
+
+
+def _readLines(path):
+    """ Return the lines of a result file, columnar files being formatted as their CSV counterpart """
+    if not isColumnar(path):
+        with open(path, "r") as file:
+            return file.readlines()
+    metadata, columns = readResults(path, mmap=False)
+    results = {name: [makespan, time] for name, makespan, time in
+               zip(heuristicNames(columns), columns['makespan'].tolist(), columns['time'].tolist())}
+    header = "".join(f"#@{key} {value}\n" for key, value in metadata.items() if key != 'minmk')
+    return resultsToCSV(results, header).splitlines(keepends=True)
+
+
+def parseResultFile(path):
+    """ Parse a result file (CSV or columnar), returning its rows prefixed by the parameters of its graph, the last
+    one telling whether its edges were drawn as by older versions (1) or level by level (0, "#@edgeStream level")
+
+    :param path: Result file to parse
+    :type path: str
+    :return: Rows of the aggregate, in format "seed;graphSize;..;nbproc;legacyStream;prio;..;time\\n", joined in a
+        single string
+    :rtype: str
+    """
+    seed = graphSize = graphDepth = sdComp = sdComm = CCR = nbproc = None
+    legacyStream = 1
+    lines = _readLines(path)
+    for index, line in enumerate(lines):
+        if line.startswith("#@"):
+            param = line.split()[0][2:]
+            val = line.split()[1]
+            if param == 'seed':
+                seed = val
+            elif param == 'graphSize':
+                graphSize = val
+            elif param == 'graphDepth':
+                graphDepth = val
+            elif param == 'sdComp':
+                sdComp = val
+            elif param == 'sdComm':
+                sdComm = val
+            elif param == 'CCR':
+                CCR = val
+            elif param == 'nbproc':
+                nbproc = val
+            elif param == 'edgeStream':
+                legacyStream = int(val != 'level')
+        elif line != '\n':  # Column names : metadata lines come before, rows after
+            sdComp = round(float(sdComp) * float(CCR), 2)
+            prefix = f'{seed};{graphSize};{graphDepth};{sdComp};{sdComm};{CCR};{nbproc};{legacyStream};'
+            return "".join([prefix + row for row in lines[index + 1:] if row != '\n' and not row.startswith("#@")])
+    return ""
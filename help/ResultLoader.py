@@ -0,0 +1,153 @@
+import os
+
+import numpy as np
+
+from help.ResultFile import HEURISTIC_COLUMNS, heuristicNames, isColumnar, parseResultFile, readResults
+
+# Columns of an aggregate (see resAggregator), heuristics being encoded in a single 'heuristic' key
+GRAPH_COLUMNS = [('seed', np.dtype(np.int64)), ('graphSize', np.dtype(np.int32)), ('graphDepth', np.dtype(np.int32)),
+                 ('sdComp', np.dtype('<f8')), ('sdComm', np.dtype('<f8')), ('CCR', np.dtype('<f8')),
+                 ('nbproc', np.dtype(np.int32)), ('legacyStream', np.dtype(bool))]
+AGGREGATE_COLUMNS = GRAPH_COLUMNS + [('heuristic', np.dtype(np.int32)), ('makespan', np.dtype('<f8')),
+                                     ('time', np.dtype('<f8'))]
+_WIDTH = len(GRAPH_COLUMNS) + len(HEURISTIC_COLUMNS) + 2  # Fields of a row of the aggregate
+_DIGITS = 10 ** np.arange(len(HEURISTIC_COLUMNS) - 1, -1, -1)  # Indexes of a heuristic are all lower than 10
+
+
+def heuristicKey(name):
+    """ Encode a heuristic as a single integer, whose decimal digits are its indexes
+
+    :param name: Heuristic, as named by listHeuristics ("prio;cost;placement;desc;BIM;ins;bsa") or as a list of indexes
+    :type name: str | list[int] | list[str]
+    :return: Key of the heuristic, for instance 1010 for "0;0;0;1;0;1;0"
+    :rtype: int
+    """
+    if isinstance(name, str):
+        name = name.split(";")
+    return int(np.dot(list(map(int, name)), _DIGITS))
+
+
+def heuristicName(key):
+    """ Decode a key given by heuristicKey
+
+    :param key: Key of the heuristic
+    :type key: int
+    :return: Heuristic, as named by listHeuristics
+    :rtype: str
+    """
+    return ";".join(str(int(key) // int(d) % 10) for d in _DIGITS)
+
+
+def _parseRows(lines):
+    """ Parse rows of an aggregate into typed columns, all fields being numbers """
+    values = np.loadtxt(lines, delimiter=";", ndmin=2) if lines else np.zeros((0, _WIDTH))
+    columns = {column: values[:, k].astype(dtype) for k, (column, dtype) in enumerate(GRAPH_COLUMNS)}
+    columns['heuristic'] = (values[:, len(GRAPH_COLUMNS):-2] @ _DIGITS).astype(np.int32)
+    columns['makespan'] = values[:, -2]
+    columns['time'] = values[:, -1]
+    return columns
+
+
+def _concatenate(chunks):
+    """ Concatenate columns read by chunks """
+    if not chunks:
+        return {column: np.empty(0, dtype=dtype) for column, dtype in AGGREGATE_COLUMNS}
+    return {column: np.concatenate([c[column] for c in chunks]) for column, dtype in AGGREGATE_COLUMNS}
+
+
+def loadAggregate(filename="ress.csv", chunk=1 << 26, cache=True):
+    """ Load an aggregate written by resAggregator into typed columns, reading it by chunks of about **chunk** bytes
+
+    With **cache**, columns are saved in **filename**.npz the first time, and loaded from it as long as it is newer
+    than the aggregate. Aggregates written by older versions, without the 'legacyStream' column, have to be written
+    again.
+
+    :param filename: Aggregate to load
+    :type filename: str
+    :param chunk: Size of the chunks, in bytes
+    :type chunk: int
+    :param cache: Use (and write) the cached columns ?
+    :type cache: bool
+    :return: Columns in format {column : array,..} (see AGGREGATE_COLUMNS), rows in the order of the file
+    :rtype: dict[str, numpy.ndarray]
+    """
+    cacheFilename = filename + ".npz"
+    if cache and os.path.exists(cacheFilename) and os.path.getmtime(cacheFilename) >= os.path.getmtime(filename):
+        with np.load(cacheFilename) as data:
+            if all(column in data for column, dtype in AGGREGATE_COLUMNS):
+                return {column: data[column] for column, dtype in AGGREGATE_COLUMNS}
+    chunks = []
+    with open(filename, "r") as file:
+        if 'legacyStream' not in file.readline().rstrip("\n").split(";"):
+            raise ValueError(f"{filename} has no legacyStream column, aggregate the result files again")
+        while True:
+            lines = file.readlines(chunk)
+            if not lines:
+                break
+            chunks.append(_parseRows([line for line in lines if line != "\n"]))
+    columns = _concatenate(chunks)
+    if cache:
+        np.savez(cacheFilename, **columns)
+    return columns
+
+
+def loadResultDir(dir="res", chunk=256):
+    """ Load every result file (CSV or columnar) of a directory into typed columns, as if aggregated
+
+    :param dir: Directory of the result files
+    :type dir: str
+    :param chunk: Number of files parsed at once
+    :type chunk: int
+    :return: Columns in format {column : array,..} (see AGGREGATE_COLUMNS), files being in the order of listdir
+    :rtype: dict[str, numpy.ndarray]
+    """
+    listFile = os.listdir(dir)
+    chunks = []
+    for start in range(0, len(listFile), chunk):
+        rows = "".join(parseResultFile(dir + "/" + fileName) for fileName in listFile[start:start + chunk])
+        chunks.append(_parseRows(rows.splitlines()))
+    return _concatenate(chunks)
+
+
+def loadRanking(path):
+    """ Load the heuristics of a result file ranked by makespan then runtime, the order of the rows of CSV files
+
+    :param path: Result file, columnar or text starting with metadata lines (rows in format "prio;cost;..;makespan;time"
+        or, for older files, "heur makespan runtime")
+    :type path: str
+    :return: Heuristics as named by listHeuristics, best one first, None if **path** is not a result file
+    :rtype: list[str]
+    """
+    if isColumnar(path):
+        metadata, columns = readResults(path, mmap=False)
+        names = heuristicNames(columns)
+        return [names[i] for i in np.lexsort((columns['time'], columns['makespan'])).tolist()]
+    try:
+        with open(path, "r") as file:
+            lines = file.readlines()
+    except UnicodeDecodeError:
+        return None
+    if not lines or not lines[0].startswith("#@"):
+        return None
+    rows = [line for line in lines if not line.startswith("#@") and line != "\n"][1:]  # After column names
+    return [row.split(" ")[0] if " " in row else row.rsplit(";", 2)[0] for row in rows]
+
+
+def selectRows(columns, heuristic=None, **params):
+    """ Select the rows of the given heuristic(s) and graph parameters
+
+    :param columns: Columns given by loadAggregate or loadResultDir
+    :type columns: dict[str, numpy.ndarray]
+    :param heuristic: Heuristic(s) to keep, as named by listHeuristics or as keys, None for all of them
+    :type heuristic: str | int | list[str | int]
+    :param params: Values to keep for other columns, in format column=value or column=[value,..]
+    :return: Selected rows, in format {column : array,..}
+    :rtype: dict[str, numpy.ndarray]
+    """
+    mask = np.ones(len(columns['heuristic']), dtype=bool)
+    if heuristic is not None:
+        params['heuristic'] = [h if isinstance(h, (int, np.integer)) else heuristicKey(h) for h in
+                               (heuristic if isinstance(heuristic, list) else [heuristic])]
+    for column, value in params.items():
+        mask &= np.isin(columns[column], value)
+    return {column: array[mask] for column, array in columns.items()}
@@ -1,6 +1,9 @@
 #!/usr/lib/python3.6
 # -*-coding:Utf-8 -*
 
+import math
+import os
+import pickle
 import sys
 import time
 
@@ -93,6 +96,59 @@ def shapeToDag(s):
     return DAG
 
 
+# probabilité d'un arc depuis un noeud du niveau précédent (de taille stmp > 1), autre que le prédécesseur tiré
+def edgeProbability(stmp):
+    return (stmp / (2 - 2.0 ** (1 - stmp)) - 1) / (stmp - 1)
+
+
+# génération du DAG sous forme CSR, sans objets Noeud : les prédécesseurs du noeud d'indice v (à partir de 0) sont
+# indices[indptr[v]:indptr[v + 1]]. Les arcs d'un niveau sont tirés en une fois (tableaux de Bernoulli) ; avec
+# **legacy**, les tirages sont ceux de shapeToDag (même graphe pour une même graine), en quelques appels par noeud
+def shapeToCSR(s, legacy=False):
+    s = [int(x) for x in s]
+    starts = np.concatenate([[0], np.cumsum(s)]).astype(np.int64)
+    counts = [np.zeros(s[0] if s else 0, dtype=np.int64)]
+    indices = []
+    for i in range(1, len(s)):
+        c, stmp, prevStart, levelStart = s[i], s[i - 1], starts[i - 1], starts[i]
+        if legacy:
+            if stmp > 1:
+                pb = float((stmp * (float(2 ** (stmp - 1)) / float(2 ** stmp - 1)) - 1)) / float((stmp - 1))
+                cdf = np.cumsum([pb, 1 - pb])
+                cdf /= cdf[-1]
+            level = np.empty(c, dtype=np.int64)
+            for j in range(c):
+                parent = int(npr.randint(0, stmp, size=1)[0])
+                pred = [np.array([prevStart + parent])]
+                if stmp > 1:
+                    others = np.delete(np.arange(prevStart, levelStart), parent)
+                    pred.append(others[cdf.searchsorted(npr.random_sample(stmp - 1), side='right') == 0])
+                if prevStart > 0:
+                    pred.append(np.flatnonzero(npr.randint(0, 2, size=prevStart) == 0))
+                pred = np.concatenate(pred)
+                indices.append(pred)
+                level[j] = len(pred)
+            counts.append(level)
+        else:
+            parents = npr.randint(0, stmp, size=c)
+            threshold = np.full(levelStart, 0.5)
+            threshold[prevStart:] = edgeProbability(stmp) if stmp > 1 else 0.0
+            adj = npr.random_sample((c, levelStart)) < threshold
+            adj[np.arange(c), prevStart + parents] = True
+            rows, cols = np.nonzero(adj)
+            indices.append(cols)
+            counts.append(np.bincount(rows, minlength=c))
+    indptr = np.concatenate([[0], np.cumsum(np.concatenate(counts))]).astype(np.int64)
+    return indptr, np.concatenate(indices).astype(np.int64) if indices else np.zeros(0, dtype=np.int64)
+
+
+# transformation du DAG CSR en graphe, en un seul ajout d'arcs
+def csrToGraph(indptr, indices):
+    n = len(indptr) - 1
+    dst = np.repeat(np.arange(n), np.diff(indptr))
+    return ig.Graph(n=n, edges=np.stack([indices, dst], axis=1).tolist(), directed=True)
+
+
 # transformation du DAG en matrice pour l'affichage
 def dagToMatrix(dag, n=10):
     mat = np.zeros((n, n), int)
@@ -117,8 +173,10 @@ def dagToGraph(dag, n=10):
     return graph
 
 
-# compte le nombre de DAGs possible à partir du tableau
+# compte le nombre de DAGs possible à partir du tableau (son log pour un tableau en log)
 def countAn(tab, n=10, l=1):
+    if tab.dtype != object:
+        return logSumExp(tab[n - 1, :n, l - 1])
     i = 0
     res = mp.mpf(0.0)
     while i < n:
@@ -128,10 +186,16 @@ def countAn(tab, n=10, l=1):
 
 
 # génère le tableau des A(n,k,l)
-def countingMethod(n=10, length=1):
+# A(i,k,l) ne dépend que des A(i',s,l-1) avec i' < i : le tableau d'un (n,l) plus petit, **known**, en est un préfixe
+# et n'est pas recalculé
+def countingMethod(n=10, length=1, known=None):
     tab = np.zeros((n, n, length), mp.mpf)
     if length > n:
         return tab
+    N, L = (0, 0) if known is None else known.shape[1:]
+    N, L = min(N, n), min(L, length)
+    if N:
+        tab[:N, :N, :L] = known[:N, :N, :L]
 
     tab[0][0][0] = mp.mpf(1.0)
 
@@ -142,7 +206,7 @@ def countingMethod(n=10, length=1):
             if i == k:
                 tab[i - 1][k - 1][0] = mp.mpf(1.0)
             else:
-                l = 2
+                l = L + 1 if i <= N else 2
                 while l <= length:
                     s = 1
                     tmp = 0.0
@@ -157,6 +221,111 @@ def countingMethod(n=10, length=1):
     return tab
 
 
+# log(somme(exp(x))) selon l'axe **axis**, -inf pour une somme nulle
+def logSumExp(x, axis=0):
+    m = x.max(axis=axis)
+    m = np.where(np.isfinite(m), m, 0.0)
+    with np.errstate(divide='ignore'):
+        return m + np.log(np.exp(x - np.expand_dims(m, axis)).sum(axis=axis))
+
+
+# même tableau que countingMethod, en log (flottants) : pas de dépassement pour n grand, sans mpmath
+# A(m+k,k,.) ne dépend que de A(m,.,.) : les A(m+k,k,l) sont calculés ensemble pour tous les k, par m croissant. La
+# somme sur s est un produit matriciel de (1 - 2^-k)^(s-1) par exp(A(m,s,l-1)) mis à l'échelle, sauf pour les k dont
+# les poids seraient trop petits pour des flottants (k petits, m grands) : elle est alors faite en log
+def countingMethodLog(n=10, length=1, known=None):
+    tab = np.full((n, n, length), -np.inf)
+    if length > n:
+        return tab
+    N, L = (0, 0) if known is None else known.shape[1:]
+    N, L = min(N, n), min(L, length)
+    if N:
+        tab[:N, :N, :L] = known[:N, :N, :L]
+
+    idx = np.arange(n)
+    tab[idx, idx, 0] = 0.0
+    log2 = math.log(2)
+    lgamma = np.vectorize(math.lgamma, otypes=[float])
+    for m in range(1, n):
+        k = np.arange(1, n - m + 1)
+        i = m + k
+        s = np.arange(m)
+        # log((2^k - 1)^s * 2^(k(m - s))) = s * c + k * m * log(2), avec c = log(1 - 2^-k)
+        c = np.log1p(-np.exp2(-k.astype(float)))
+        offset = lgamma(i + 1.0) - lgamma(k + 1.0) - math.lgamma(m + 1) + k * m * log2 + c
+        scaled = (m - 1) * c > -600
+        for rows, lStart in [(i <= N, L + 1), (i > N, 2)]:
+            if lStart > length or not rows.any():
+                continue
+            prev = tab[m - 1, :m, lStart - 2:length - 1]
+            for r, matmul in [(np.flatnonzero(rows & scaled), True), (np.flatnonzero(rows & ~scaled), False)]:
+                if len(r) == 0:
+                    continue
+                logW = s[None, :] * c[r, None]
+                if matmul:
+                    top = prev.max(axis=0)
+                    top = np.where(np.isfinite(top), top, 0.0)
+                    with np.errstate(divide='ignore'):
+                        total = np.log(np.exp(logW) @ np.exp(prev - top)) + top
+                else:
+                    total = logSumExp(logW[:, :, None] + prev[None], axis=1)
+                tab[i[r] - 1, k[r] - 1, lStart - 1:] = offset[r, None] + total
+    return tab
+
+
+# cache des tableaux : le plus grand tableau calculé de chaque sorte (mpmath ou log), en mémoire et dans **tableDir**
+TABLE_DIR = "tables"
+_tables = {}
+
+
+def _tableFile(tableDir, logDomain):
+    return os.path.join(tableDir, "counting-log.npy" if logDomain else "counting-mpf.pkl")
+
+
+def _covers(tab, n, length):
+    return tab is not None and tab.shape[1] >= n and tab.shape[2] >= length
+
+
+def _loadTable(tableDir, logDomain):
+    filename = _tableFile(tableDir, logDomain)
+    if not os.path.exists(filename):
+        return None
+    if logDomain:
+        return np.load(filename)
+    with open(filename, 'rb') as file:
+        return pickle.load(file)
+
+
+def _saveTable(tab, tableDir, logDomain):
+    os.makedirs(tableDir, exist_ok=True)
+    filename = _tableFile(tableDir, logDomain)
+    tmp = f"{filename}.{os.getpid()}.tmp"
+    with open(tmp, 'wb') as file:
+        if logDomain:
+            np.save(file, tab)
+        else:
+            pickle.dump(tab, file)
+    os.replace(tmp, filename)  # atomique : plusieurs processus peuvent générer en parallèle
+
+
+# tableau des A(n,k,l) pour (n, length), vue sur un tableau en cache (à ne pas modifier)
+def countingTable(n=10, length=1, logDomain=False, tableDir=TABLE_DIR):
+    if length > n:
+        return countingMethodLog(n, length) if logDomain else countingMethod(n, length)
+    tab = _tables.get(logDomain)
+    if not _covers(tab, n, length) and tableDir:
+        onDisk = _loadTable(tableDir, logDomain)
+        if onDisk is not None and (tab is None or onDisk.size > tab.size):
+            tab = onDisk
+    if not _covers(tab, n, length):
+        N, L = (n, length) if tab is None else (max(n, tab.shape[1]), max(length, tab.shape[2]))
+        tab = countingMethodLog(N, L, tab) if logDomain else countingMethod(N, L, tab)
+        if tableDir:
+            _saveTable(tab, tableDir, logDomain)
+    _tables[logDomain] = tab
+    return tab[:n, :n, :length]
+
+
 # liste de nombre de noeuds par niveau
 def randomShape(tab, n=10, l=1):
     liste = []
@@ -170,10 +339,15 @@ def randomShape(tab, n=10, l=1):
         if l == 1:
             s[0] = j
         else:
-            while i < n:
-                nb.append(i + 1)
-                pb.append(mp.mpf(tab[j - 1][i][l - 1] / An))
-                i += 1
+            if tab.dtype != object:
+                nb = list(range(1, n + 1))
+                pb = np.exp(tab[j - 1, :n, l - 1] - An)
+                pb /= pb.sum()
+            else:
+                while i < n:
+                    nb.append(i + 1)
+                    pb.append(mp.mpf(tab[j - 1][i][l - 1] / An))
+                    i += 1
 
             s = npr.choice(a=nb, p=pb, size=1)
 
@@ -190,7 +364,7 @@ def chrono(n=10, l=4):
 
     tableau = countingMethod(taille, longueur)
     shape = randomShape(tableau, taille, longueur)
-    dag = shapeToDag(shape)
+    dag = shapeToCSR(shape)
 
     return time.time() - start
 
@@ -221,10 +395,8 @@ if __name__ == '__main__':
     print("liste de nombre de noeuds par niveau : ")
     print(shape)
 
-    dag = shapeToDag(shape)
-
     # affichage avec graphe
-    G = dagToGraph(dag, taille)
+    G = csrToGraph(*shapeToCSR(shape))
     G.write("recGenLength_n" + str(taille) + "_lg" + str(longueur), "gml")
 
 
@@ -245,13 +417,13 @@ def initialisationSeed(seed):
     npr.seed(seed)
 
 
-def executionL(n=10, l=4, filename="output-igraph.gml"):
+# par défaut, tirages de shapeToDag : une graine donne le même graphe qu'avec les versions précédentes
+def executionL(n=10, l=4, filename="output-igraph.gml", logDomain=False, tableDir=TABLE_DIR, legacyStream=True):
     taille = n
     longueur = l
 
-    tableau = countingMethod(taille, longueur)
+    tableau = countingTable(taille, longueur, logDomain, tableDir)
     shape = randomShape(tableau, taille, longueur)
-    dag = shapeToDag(shape)
-    G = dagToGraph(dag, taille)
+    G = csrToGraph(*shapeToCSR(shape, legacyStream))
     G.write(filename)
     return G
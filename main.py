@@ -1,8 +1,10 @@
 import random
+import sys
 import timeit
 
 import numpy
 
+from computations.CompiledDAG import compileDAG
 from computations.Placements import *
 from computations.Priorities import *
 from executions.ExtensiveTest import realTryHard
@@ -11,6 +13,7 @@ from help.FileReader import readFile
 from help.GraphGenerator import genGraph
 from help.MailSender import sendMail
 from help.Parser import defineParser
+from help.ResultFile import generationHeader, parseHeader, resultsToCSV, writeResults
 from metrics.Speedup import measureSpecificEfficiency, measureGeneralEfficiency, measureSpeedup
 from tests.VerifPrecedence import verifPrec
 
@@ -34,7 +37,7 @@ if __name__ == '__main__':
     start = timeit.default_timer()
     graphname = ""
     if args.generate:
-        graph = genGraph(*args.generate, args.nbproc)
+        graph = genGraph(*args.generate, args.nbproc, legacyStream=not args.levelstream, wait=False)
         graphname = args.generate[2]
     else:
         graph = readFile(args.graphfile, verbose=DEBUG)
@@ -43,18 +46,15 @@ if __name__ == '__main__':
 
     if args.nbproc:
         graph.graph['nbproc'] = int(args.nbproc)
+    if not args.nothing:
+        graph = compileDAG(graph)
     # print("Time elapsed to read file :", round(1000 * (end - start), 2), "ms")
 
     result = ""
     resultCSV = ""
     if args.generate:
-        resultCSV += f"#@seed {args.seed}\n"
-        resultCSV += f"#@graphSize {args.generate[0]}\n"
-        resultCSV += f"#@graphDepth {args.generate[1]}\n"
-        resultCSV += f"#@sdComp {args.generate[3]}\n"
-        resultCSV += f"#@sdComm {round(float(args.generate[4]), 2)}\n"
-        resultCSV += f"#@CCR {args.generate[5]}\n"
-        resultCSV += f"#@nbproc {args.nbproc}\n"
+        resultCSV += generationHeader(args.seed, args.generate[0], args.generate[1], args.generate[3], args.generate[4],
+                                      args.generate[5], args.nbproc, not args.levelstream)
     else:
         try:
             file = open("pre" + args.graphfile, "r")
@@ -66,20 +66,20 @@ if __name__ == '__main__':
 
     if args.all:
         realstart = timeit.default_timer()
-        r = realTryHard(graph, int(args.all), DEBUG, graphname)
+        r = realTryHard(graph, int(args.all), DEBUG, graphname, args.workers)
         rs = sorted(r, key=r.get, reverse=False)
-        minmk = round(r[rs[0]][0], 4)
-        resultCSV += f"#@minmk {minmk}\n\n"
-        resultCSV += "prio;cost;placement;desc;BIM;ins;bsa;makespan;time\n"
+        resultCSV = resultsToCSV(r, resultCSV)
         realend = timeit.default_timer()
         for tryIndex in rs:
             result += f"{tryIndex.split(';')} {r[tryIndex]}\n"
-            resultCSV += f"{tryIndex};{round(minmk / r[tryIndex][0], 4)};{r[tryIndex][1]}\n"
         # result += "\nTotal time elapsed : " + str(round(realend - realstart, 2)) + "s.\n"
         # result += verifBSA(rs, r, DEBUG)
-        file = open(args.filename, 'w')
-        file.write(resultCSV)
-        file.close()
+        if args.binary:
+            writeResults(args.filename, r, parseHeader(resultCSV))
+        else:
+            file = open(args.filename, 'w')
+            file.write(resultCSV)
+            file.close()
     elif args.heuristic:
         start = timeit.default_timer()
         aPrio, aCostFunction, aStrategyPlacement, aDesc, aUseOfBIM, absa, aInsertion = args.heuristic
@@ -91,7 +91,10 @@ if __name__ == '__main__':
                                         useOfBIM=bool(int(aUseOfBIM)), verbose=DEBUG,
                                         insertion=bool(int(aInsertion)), bsa=bool(int(absa)))
         end = timeit.default_timer()
-        verifPrec(graph, finalSchedule, DEBUG)
+        violations = verifPrec(graph, finalSchedule, DEBUG)
+        if violations:
+            print(f"Invalid schedule for {name} : {len(violations)} violation(s)")
+            sys.exit(1)
         time = round(1000 * (end - start), 2)
         makespan = finalSchedule[getExitTask(graph)][2]
         efficiency = round(measureSpecificEfficiency(graph, finalSchedule, verbose=DEBUG), 3)
@@ -99,7 +102,6 @@ if __name__ == '__main__':
         speedup = round(measureSpeedup(graph, finalSchedule, verbose=False), 3)
         if DEBUG:
             printSchedule(finalSchedule)
-        verifPrec(graph, finalSchedule, DEBUG)
         result = f"Time elapsed to compute schedule : {time}ms\n"
         result += f"Makespan : {makespan}\n"
         result += f"Efficiency : {efficiency}\n"
@@ -1,6 +1,7 @@
 import os
 from os import listdir
 
+from computations.CompiledDAG import compileDAG
 from computations.Priorities import getExitTask, getCP
 from help.FileReader import readFile
 
@@ -17,6 +18,22 @@ def computeSLR(g, schedule, verbose=False):
     :return: SLR, the smaller the better
     :rtype: float
     """
-    minCP = getCP(g, costFunction="minmin")
-    minMakespan = sum(map(lambda n: min(g.graph['costmatrix'][n - 1]), minCP))
-    return schedule[getExitTask(g)][2] / minMakespan
\ No newline at end of file
+    return schedule[getExitTask(g)][2] / minCPScheduleLength(g, verbose)
+
+
+def minCPScheduleLength(g, verbose=False):
+    """ Compute the denominator of the SLR : sum of the minimal computation costs of the nodes of the (minmin)
+    Critical-Path. Memoized in the stages of the compiled DAG
+
+    :param g: Used DAG
+    :type g: networkx.DiGraph | CompiledDAG
+    :param verbose: Print non-necessary information ?
+    :type verbose: bool
+    :return: Makespan of the Critical-Path on the fastest procs
+    :rtype: float
+    """
+    stages = compileDAG(g).stages
+    if 'minCP' not in stages:
+        minCP = getCP(g, costFunction="minmin", verbose=verbose)
+        stages['minCP'] = sum(map(lambda n: min(g.graph['costmatrix'][n - 1]), minCP))
+    return stages['minCP']
@@ -1,5 +1,8 @@
+import numpy as np
 from matplotlib import pyplot as plt
 
+from help.ResultLoader import loadAggregate, selectRows
+
 
 def plot_and_save(name):
     plt.clf()
@@ -24,48 +27,21 @@ def plot_and_save(name):
     plt.savefig(f'timesby{name}.png')
 
 
-def unsort(res, useBest=True):
-    sizesI = {}
-    layersI = {}
-    procsI = {}
-    for (g, t) in res:
-        t = float(t)
-        if useBest:
-            if int(g[0]) == 100 and int(g[1]) == 34:
-                proc = int(g[2])
-                if proc in procsI:
-                    procsI[proc].append(t)
-                else:
-                    procsI[proc] = [t]
-            if int(g[0]) == 100 and int(g[2]) == 6:
-                layer = int(g[1])
-                if layer in layersI:
-                    layersI[layer].append(t)
-                else:
-                    layersI[layer] = [t]
-            if int(g[2]) == 6 and int(g[1]) >= 0.33 * int(g[0]):
-                size = int(g[0])
-                if size in sizesI:
-                    sizesI[size].append(t)
-                else:
-                    sizesI[size] = [t]
-        else:
-            proc = int(g[2])
-            if proc in procsI:
-                procsI[proc].append(t)
-            else:
-                procsI[proc] = [t]
-            layer = int(g[1])
-            if layer in layersI:
-                layersI[layer].append(t)
-            else:
-                layersI[layer] = [t]
-            size = int(g[0])
-            if size in sizesI:
-                sizesI[size].append(t)
-            else:
-                sizesI[size] = [t]
-    return sizesI, layersI, procsI
+def groupBy(rows, column, mask=None):
+    """ Group the runtimes of the given rows (or of the ones of **mask**) by value of a column """
+    values, times = rows[column], rows['time']
+    if mask is not None:
+        values, times = values[mask], times[mask]
+    return {int(v): times[values == v] for v in np.unique(values)}
+
+
+def unsort(rows, useBest=True):
+    if useBest:
+        size, layer, proc = rows['graphSize'], rows['graphDepth'], rows['nbproc']
+        return groupBy(rows, 'graphSize', (proc == 6) & (layer >= 0.33 * size)), \
+            groupBy(rows, 'graphDepth', (size == 100) & (proc == 6)), \
+            groupBy(rows, 'nbproc', (size == 100) & (layer == 34))
+    return groupBy(rows, 'graphSize'), groupBy(rows, 'graphDepth'), groupBy(rows, 'nbproc')
 
 
 if __name__ == '__main__':
@@ -74,41 +50,22 @@ if __name__ == '__main__':
     myHeur2 = myHeur[:-1] + [str(1 - int(myHeur[-1]))]
     myHeur3 = myHeur[:-2] + [str(1 - int(myHeur[-2]))] + [myHeur[-1]]
 
-    res = []
-    res2 = []
-    res3 = []
-
-    with open("ress.csv") as file:
-        file.readline()
-        for index, line in enumerate(file.readlines()):
-            lineSplitted = (line[:-1].split(";")[1:])
-            heur = lineSplitted[6:-2]
-            if heur == myHeur:
-                graph = [lineSplitted[0], lineSplitted[1], lineSplitted[5]]
-                time = lineSplitted[-1]
-                res += [[graph, time]]
-            if heur == myHeur2:
-                graph2 = [lineSplitted[0], lineSplitted[1], lineSplitted[5]]
-                time2 = lineSplitted[-1]
-                res2 += [[graph2, time2]]
-            if heur == myHeur3:
-                graph3 = [lineSplitted[0], lineSplitted[1], lineSplitted[5]]
-                time3 = lineSplitted[-1]
-                res3 += [[graph3, time3]]
-            if index % 1000000 == 0:
-                print(index)
+    columns = loadAggregate("ress.csv")
+    res = selectRows(columns, ";".join(myHeur))
+    res2 = selectRows(columns, ";".join(myHeur2))
+    res3 = selectRows(columns, ";".join(myHeur3))
 
-        sizes, layers, procs = unsort(res, False)
-        sizes2, layers2, procs2 = unsort(res2, False)
-        sizes3, layers3, procs3 = unsort(res3, False)
-        best_sizes, best_layers, best_procs = unsort(res, True)
-        best_sizes2, best_layers2, best_procs2 = unsort(res2, True)
-        best_sizes3, best_layers3, best_procs3 = unsort(res3, True)
+    sizes, layers, procs = unsort(res, False)
+    sizes2, layers2, procs2 = unsort(res2, False)
+    sizes3, layers3, procs3 = unsort(res3, False)
+    best_sizes, best_layers, best_procs = unsort(res, True)
+    best_sizes2, best_layers2, best_procs2 = unsort(res2, True)
+    best_sizes3, best_layers3, best_procs3 = unsort(res3, True)
 
-        plot_and_save("sizes")
-        plot_and_save("layers")
-        plot_and_save("procs")
-        plot_and_save("best_sizes")
-        plot_and_save("best_layers")
-        plot_and_save("best_procs")
-        exit()
+    plot_and_save("sizes")
+    plot_and_save("layers")
+    plot_and_save("procs")
+    plot_and_save("best_sizes")
+    plot_and_save("best_layers")
+    plot_and_save("best_procs")
+    exit()
@@ -1,44 +1,109 @@
-from os import listdir
-
-
-def aggreg(dir, filename):
-    fileO = open(filename, 'w')
-    listFile = listdir(dir)
-    fileO.write("seed;graphSize;graphDepth;sdComp;sdComm;CCR;nbproc;prio;cost;placement;BIM;ins;bsa;makespan;time\n")
-    for fileName in listFile:
-        file = open(dir + "/" + fileName, "r")
-        firstLine = True
-        toSub = 0
-        seed = graphSize = graphDepth = sdComp = sdComm = CCR = nbproc = None
-        for index, line in enumerate(file.readlines()):
-            if line.startswith("#@"):
-                param = line.split()[0][2:]
-                val = line.split()[1]
-                if param == 'seed':
-                    seed = val
-                elif param == 'graphSize':
-                    graphSize = val
-                elif param == 'graphDepth':
-                    graphDepth = val
-                elif param == 'sdComp':
-                    sdComp = val
-                elif param == 'sdComm':
-                    sdComm = val
-                elif param == 'CCR':
-                    CCR = val
-                elif param == 'nbproc':
-                    nbproc = val
-                continue
-            elif line == '\n':
-                continue
-            elif firstLine:
-                firstLine = False
-                sdComp = round(float(sdComp) * float(CCR), 2)
-                continue
-            lineT = f'{seed};{graphSize};{graphDepth};{sdComp};{sdComm};{CCR};{nbproc};{line}'
-            fileO.write(lineT)
-    fileO.close()
+import os
+from multiprocessing import Pool
+
+from help.ResultFile import parseResultFile
+
+HEADER = "seed;graphSize;graphDepth;sdComp;sdComm;CCR;nbproc;legacyStream;prio;cost;placement;BIM;ins;bsa;makespan;" \
+         "time\n"
+
+
+def _signature(path):
+    """ Return the size and modification time (in ns) of a file, telling whether it changed since it was aggregated """
+    stat = os.stat(path)
+    return stat.st_size, stat.st_mtime_ns
+
+
+def _readIndex(indexFilename):
+    """ Return the files aggregated so far (along with their signature when it was recorded, see _signature) and the
+    size of the aggregate once they were written, as recorded in the index. Files of a chunk whose size was not
+    recorded (interrupted aggregation) are not considered as done """
+    done, pending, size = {}, [], None
+    if os.path.exists(indexFilename):
+        with open(indexFilename) as file:
+            for line in file:
+                line = line.rstrip("\n")
+                if line.startswith("#@size "):
+                    done.update(pending)
+                    pending, size = [], int(line.split()[1])
+                elif line:
+                    fields = line.rsplit(";", 2)
+                    signature = (int(fields[1]), int(fields[2])) if len(fields) == 3 else None
+                    pending.append((fields[0] if signature else line, signature))
+    return done, size
+
+
+def aggreg(dir, filename, workers=1, incremental=True, chunk=256):
+    """ Aggregate every result file of a directory in a single CSV file
+
+    Files are parsed by chunks, in parallel with several workers, and their rows are written as soon as a chunk is
+    parsed, so that only a chunk is held in memory. The files aggregated are listed in an index (**filename**.index),
+    along with the size of the aggregate after each chunk : with **incremental**, only files that are new since the
+    last aggregation are parsed and their rows appended, the aggregate being first cut back to its last recorded size
+    if an aggregation was interrupted. Since the size and modification time of each file are recorded as well, the
+    whole directory is aggregated again if a file already aggregated was since rewritten or removed, or if the
+    aggregate has other columns (written by an older version).
+
+    :param dir: Directory of the result files
+    :type dir: str
+    :param filename: Aggregate to write
+    :type filename: str
+    :param workers: Number of worker processes, 0 for one per core
+    :type workers: int
+    :param incremental: Only aggregate files that are not in the index yet ?
+    :type incremental: bool
+    :param chunk: Number of files parsed between two writes
+    :type chunk: int
+    :return: Number of files aggregated
+    :rtype: int
+    """
+    indexFilename = filename + ".index"
+    done, size = _readIndex(indexFilename) if incremental and os.path.exists(filename) else ({}, None)
+    signatures = {fileName: _signature(dir + "/" + fileName) for fileName in os.listdir(dir)}
+    changed = [fileName for fileName, signature in done.items() if signatures.get(fileName) != signature]
+    if size is not None and changed:
+        print(f"{len(changed)} result files changed or removed since the last aggregation (like {changed[0]}), "
+              f"aggregating {dir} again")
+        size = None
+    if size is not None:
+        with open(filename) as file:
+            if file.readline() != HEADER:
+                print(f"{filename} has other columns, aggregating {dir} again")
+                size = None
+    if size is None:
+        done = {}
+        fileO = open(filename, 'w')
+        fileO.write(HEADER)
+        index = open(indexFilename, 'w')
+    else:
+        fileO = open(filename, 'r+')
+        fileO.truncate(size)
+        fileO.seek(size)
+        index = open(indexFilename, 'a')
+    listFile = [fileName for fileName in signatures if fileName not in done]
+    if workers == 0:
+        workers = os.cpu_count()
+    pool = Pool(workers) if workers > 1 and len(listFile) > 1 else None
+    try:
+        for start in range(0, len(listFile), chunk):
+            names = listFile[start:start + chunk]
+            paths = [dir + "/" + fileName for fileName in names]
+            parsed = pool.imap(parseResultFile, paths) if pool else map(parseResultFile, paths)
+            for rows in parsed:
+                fileO.write(rows)
+            fileO.flush()
+            index.write("".join(f"{fileName};{signatures[fileName][0]};{signatures[fileName][1]}\n"
+                                for fileName in names) + f"#@size {fileO.tell()}\n")
+            index.flush()
+        if size is None and not listFile:
+            index.write(f"#@size {fileO.tell()}\n")
+    finally:
+        if pool:
+            pool.close()
+            pool.join()
+        fileO.close()
+        index.close()
+    return len(listFile)
 
 
 if __name__ == '__main__':
-    aggreg('res', 'ress.csv')
+    aggreg('res', 'ress.csv', workers=0)
@@ -1,6 +1,10 @@
-from os import listdir
+import os
+from functools import partial
+from multiprocessing import Pool
 
-from numpy import mean, median
+import numpy as np
+
+from help.ResultLoader import loadRanking
 
 meanFilename = "meanres.txt"
 maxFilename = "maxres.txt"
@@ -10,59 +14,190 @@ firstQFilename = "firstQres.txt"
 lastQFilename = "lastQres.txt"
 
 
-def analyse(dir):
-    listFile = listdir(dir)
-    heurRanks = {}
-    for fileName in listFile:
-        file = open(dir + "/" + fileName, "r")
-        firstLine = True
-        toSub = 0
-        for index, line in enumerate(file.readlines()):
-            if line.startswith("#@") or line == '\n':
-                continue
-            if firstLine:
-                firstLine = False
-                toSub = index
-                continue
-            heur, mk, rt = line[:-1].split(" ")
-            heurRanks.setdefault(heur, []).append(index - toSub)
-    l = sorted(heurRanks.keys(), key=lambda x: mean(heurRanks[x]))
-    n = len(l)
-    file = open(meanFilename, 'w')
-    for h in l:
-        file.write(f"{h} {mean(heurRanks[h])}\n")
-    file.close()
-
-    l = sorted(heurRanks.keys(), key=lambda x: max(heurRanks[x]))
-    file = open(maxFilename, 'w')
-    for h in l:
-        file.write(f"{h} {max(heurRanks[h])}\n")
-    file.close()
-
-    l = sorted(heurRanks.keys(), key=lambda x: min(heurRanks[x]))
-    file = open(minFilename, 'w')
-    for h in l:
-        file.write(f"{h} {min(heurRanks[h])}\n")
-    file.close()
-
-    l = sorted(heurRanks.keys(), key=lambda x: median(heurRanks[x]))
-    file = open(medianFilename, 'w')
-    for h in l:
-        file.write(f"{h} {median(heurRanks[h])}\n")
-    file.close()
-
-    l = sorted(heurRanks.keys(), key=lambda x: sum(list(map(lambda y: y >= n * 0.75, heurRanks[x]))))
-    file = open(lastQFilename, 'w')
-    for h in l:
-        file.write(f"{h} {sum(list(map(lambda y: y >= n * 0.75, heurRanks[h])))}\n")
-    file.close()
-
-    l = sorted(heurRanks.keys(), key=lambda x: sum(list(map(lambda y: y <= n * 0.25, heurRanks[x]))), reverse=True)
-    file = open(firstQFilename, 'w')
-    for h in l:
-        file.write(f"{h} {sum(list(map(lambda y: y <= n * 0.25, heurRanks[h])))}\n")
-    file.close()
+class RankAccumulator:
+    """ Running statistics of the ranks reached by every heuristic over a set of result files
+
+    Count, sum, min and max of the ranks of every heuristic are kept, along with the number of times it ranked in the
+    first and last quarter of a file. The median comes from a histogram of the ranks, exact by default : with a
+    **resolution** above 1, ranks are counted in buckets of **resolution** ranks, making the histogram smaller but the
+    median an estimate. Counts are held in the narrowest unsigned type able to hold them, starting with 16 bits.
+    Accumulators of disjoint sets of files are merged by adding them up. Heuristics are kept in order of first
+    appearance, which breaks the ties of the rankings.
+    """
+
+    def __init__(self, resolution=1):
+        self.resolution = resolution
+        self.names = []
+        self.indexes = {}
+        self.count = np.zeros(0, dtype=np.int64)
+        self.sum = np.zeros(0, dtype=np.int64)
+        self.min = np.zeros(0, dtype=np.int64)
+        self.max = np.zeros(0, dtype=np.int64)
+        self.firstQ = np.zeros(0, dtype=np.int64)
+        self.lastQ = np.zeros(0, dtype=np.int64)
+        self.hist = np.zeros((0, 0), dtype=np.uint16)
+
+    def _grow(self, heuristics, buckets):
+        """ Make room for the names of **heuristics**, and for **buckets** buckets in the histogram """
+        for heur in heuristics:
+            if heur not in self.indexes:
+                self.indexes[heur] = len(self.names)
+                self.names.append(heur)
+        rows, cols = self.hist.shape
+        n = len(self.names)
+        if n > rows or buckets > cols:
+            newRows = max(n, 2 * rows) if n > rows else rows
+            newCols = max(buckets, 2 * cols) if buckets > cols else cols
+            for field, fill in [('count', 0), ('sum', 0), ('min', np.iinfo(np.int64).max), ('max', 0), ('firstQ', 0),
+                                ('lastQ', 0)]:
+                array = getattr(self, field)
+                setattr(self, field, np.concatenate([array, np.full(newRows - rows, fill, dtype=array.dtype)]))
+            hist = np.zeros((newRows, newCols), dtype=self.hist.dtype)
+            hist[:rows, :cols] = self.hist
+            self.hist = hist
+
+    def _widen(self, bound):
+        """ Widen the type of the histogram if a bucket may exceed it, holding up to **bound** ranks """
+        if bound > np.iinfo(self.hist.dtype).max:
+            self.hist = self.hist.astype(np.uint32 if bound <= np.iinfo(np.uint32).max else np.uint64)
+
+    def add(self, heuristics):
+        """ Count the ranks of a ranking of heuristics, given by their position (starting at 1)
+
+        :param heuristics: Heuristics, best one first
+        :type heuristics: list[str]
+        :rtype: None
+        """
+        m = len(heuristics)
+        if m == 0:
+            return
+        ranks = np.arange(1, m + 1)
+        self._grow(heuristics, (m - 1) // self.resolution + 1)
+        idx = np.array([self.indexes[heur] for heur in heuristics])
+        np.add.at(self.count, idx, 1)
+        np.add.at(self.sum, idx, ranks)
+        np.minimum.at(self.min, idx, ranks)
+        np.maximum.at(self.max, idx, ranks)
+        np.add.at(self.firstQ, idx, ranks <= m * 0.25)
+        np.add.at(self.lastQ, idx, ranks >= m * 0.75)
+        self._widen(int(self.count[idx].max()))
+        np.add.at(self.hist, (idx, (ranks - 1) // self.resolution), 1)
+
+    def addFile(self, path):
+        """ Count the ranks of a result file, heuristics being ranked by makespan then runtime (see loadRanking)
+
+        :param path: Result file, CSV or columnar, other files being skipped
+        :type path: str
+        :return: Was it a result file ?
+        :rtype: bool
+        """
+        heuristics = loadRanking(path)
+        if heuristics is None:
+            return False
+        self.add(heuristics)
+        return True
+
+    def merge(self, other):
+        """ Add the ranks counted by another accumulator of the same resolution, heuristics it is the first to see
+        coming last
+
+        :param other: Accumulator of other files
+        :type other: RankAccumulator
+        :return: This accumulator
+        :rtype: RankAccumulator
+        """
+        n = len(other.names)
+        self._grow(other.names, other.hist.shape[1])
+        idx = np.array([self.indexes[heur] for heur in other.names], dtype=np.int64)
+        self.count[idx] += other.count[:n]
+        self.sum[idx] += other.sum[:n]
+        self.min[idx] = np.minimum(self.min[idx], other.min[:n])
+        self.max[idx] = np.maximum(self.max[idx], other.max[:n])
+        self.firstQ[idx] += other.firstQ[:n]
+        self.lastQ[idx] += other.lastQ[:n]
+        self._widen(int(self.count[idx].max(initial=0)))
+        self.hist[idx, :other.hist.shape[1]] += other.hist[:n]
+        return self
+
+    def _quantileRank(self, h, position):
+        """ Estimate the rank at a given position (starting at 0) among the sorted ranks of heuristic h """
+        cumulative = np.cumsum(self.hist[h])
+        bucket = int(np.searchsorted(cumulative, position, side='right'))
+        before = int(cumulative[bucket - 1]) if bucket else 0
+        lo = bucket * self.resolution + 1
+        hi = min(lo + self.resolution - 1, int(self.max[h]))
+        lo = max(lo, int(self.min[h]))
+        return lo + (position - before) * (hi - lo + 1) // int(self.hist[h, bucket])
+
+    def statistics(self):
+        """ Compute the statistics of the ranks of every heuristic
+
+        :return: Statistics in format {stat : array,..} (arrays indexed as names), stats being 'mean', 'max', 'min',
+            'median', 'lastQ' (number of ranks in the last quarter of a file) and 'firstQ' (number of ranks in the
+            first quarter of a file)
+        :rtype: dict[str, numpy.ndarray]
+        """
+        n = len(self.names)
+        median = np.array([(self._quantileRank(h, (c - 1) // 2) + self._quantileRank(h, c // 2)) / 2
+                           for h, c in enumerate(self.count[:n].tolist())])
+        return {'mean': self.sum[:n] / self.count[:n], 'max': self.max[:n], 'min': self.min[:n], 'median': median,
+                'lastQ': self.lastQ[:n], 'firstQ': self.firstQ[:n]}
+
+
+def _accumulate(paths, resolution):
+    """ Count the ranks of a chunk of result files in a worker process """
+    acc = RankAccumulator(resolution)
+    for path in paths:
+        acc.addFile(path)
+    return acc
+
+
+def accumulateRanks(dir, workers=1, chunk=256, resolution=1):
+    """ Count the ranks of every heuristic over the result files (CSV or columnar) of a directory, in a single pass,
+    other files being skipped
+
+    With several workers, chunks of files are counted in parallel and their accumulators merged in order, so that the
+    result is the same as with a single process.
+
+    :param dir: Directory of the result files
+    :type dir: str
+    :param workers: Number of worker processes, 0 for one per core
+    :type workers: int
+    :param chunk: Number of files counted by a worker at once
+    :type chunk: int
+    :param resolution: Number of ranks in a bucket of the histogram used for medians, exact with 1 (see
+        RankAccumulator)
+    :type resolution: int
+    :return: Ranks of every heuristic
+    :rtype: RankAccumulator
+    """
+    paths = [dir + "/" + fileName for fileName in os.listdir(dir) if os.path.isfile(dir + "/" + fileName)]
+    chunks = [paths[start:start + chunk] for start in range(0, len(paths), chunk)]
+    if workers == 0:
+        workers = os.cpu_count()
+    acc = RankAccumulator(resolution)
+    if workers <= 1 or len(chunks) <= 1:
+        for paths in chunks:
+            acc.merge(_accumulate(paths, resolution))
+    else:
+        with Pool(workers) as pool:
+            for part in pool.imap(partial(_accumulate, resolution=resolution), chunks):
+                acc.merge(part)
+    return acc
+
+
+def analyse(dir, workers=1, resolution=1):
+    acc = accumulateRanks(dir, workers, resolution=resolution)
+    stats = {stat: values.tolist() for stat, values in acc.statistics().items()}
+    heurs = range(len(acc.names))
+    for filename, stat, reverse in [(meanFilename, 'mean', False), (maxFilename, 'max', False),
+                                    (minFilename, 'min', False), (medianFilename, 'median', False),
+                                    (lastQFilename, 'lastQ', False), (firstQFilename, 'firstQ', True)]:
+        file = open(filename, 'w')
+        for h in sorted(heurs, key=stats[stat].__getitem__, reverse=reverse):
+            file.write(f"{acc.names[h]} {stats[stat][h]}\n")
+        file.close()
 
 
 if __name__ == '__main__':
-    analyse("res")
+    analyse("res", workers=0)
@@ -1,39 +1,89 @@
-from computations.CommCost import commCost
-from computations.EarliestTimes import computeDFT
+import numpy as np
+
+from computations.CompiledDAG import compileDAG
+
+
+def checkSchedule(g, schedule):
+    """ Check a schedule against the DAG and the platform, without stopping at the first violation
+
+    Every task must be scheduled on an existing proc, last at least its computation cost, start after the data of
+    each predecessor arrived (precedence, then communication delay), and not overlap another task of its proc. Edges
+    are checked at once on arrays, and each timeline is sorted once, for O(n log n + e) overall.
+
+    :param g: DAG to schedule
+    :type g: networkx.DiGraph | CompiledDAG
+    :param schedule: Schedule to check
+    :type schedule: dict[int, (int, float, float)]
+    :return: Violations found, in format [{'kind': kind, 'task': task, 'message': message},..], where kind is one of
+        'missing', 'processor', 'duration', 'precedence', 'communication' and 'overlap' (empty if schedule is valid)
+    :rtype: list[dict]
+    """
+    g = compileDAG(g)
+    q = g.graph['nbproc']
+    violations = []
+    proc = np.full(g.n, -1, dtype=np.int64)
+    est = np.zeros(g.n)
+    eft = np.zeros(g.n)
+    for t in g.nodes:
+        if t not in schedule:
+            violations.append({'kind': 'missing', 'task': t, 'message': f"Node {t} not scheduled"})
+            continue
+        tproc, test, teft = schedule[t][0], schedule[t][1], schedule[t][2]
+        if not 0 <= tproc < q:
+            violations.append({'kind': 'processor', 'task': t,
+                               'message': f"Task {t} scheduled on proc {tproc + 1}, out of {q} procs"})
+            continue
+        proc[t - 1], est[t - 1], eft[t - 1] = tproc, test, teft
+    valid = proc >= 0
+
+    tasks = np.flatnonzero(valid)
+    w = g.cost[tasks, proc[tasks]]
+    for k in np.flatnonzero(est[tasks] + w > eft[tasks]):
+        t = int(tasks[k])
+        violations.append({'kind': 'duration', 'task': t + 1,
+                           'message': f"Job too long for task {t + 1}. Job size on proc {proc[t] + 1} : {w[k]}, "
+                                      f"while scheduled from {est[t]} to {eft[t]}"})
+
+    edges = np.flatnonzero(valid[g.edgeSrc] & valid[g.edgeDst])
+    src, dst = g.edgeSrc[edges], g.edgeDst[edges]
+    arrival = eft[src] + g.commTensor.pairCosts(edges, proc[src], proc[dst])
+    for k in np.flatnonzero(est[dst] < arrival):
+        t, prec = int(dst[k]) + 1, int(src[k]) + 1
+        kind = 'precedence' if est[t - 1] < eft[prec - 1] else 'communication'
+        violations.append({'kind': kind, 'task': t,
+                           'message': f"Pause not long enough for task {t}. Est : {est[t - 1]} while data of prec "
+                                      f"{prec} arrives at {arrival[k]}"})
+
+    order = tasks[np.lexsort((eft[tasks], est[tasks], proc[tasks]))]
+    lastProc, lastTask, lastEnd = -1, None, 0
+    for t in order.tolist():
+        if proc[t] != lastProc:
+            lastProc, lastTask, lastEnd = proc[t], None, 0
+        if lastTask is not None and est[t] < lastEnd and eft[t] > est[t]:
+            violations.append({'kind': 'overlap', 'task': t + 1,
+                               'message': f"Task {t + 1} starts at {est[t]} on proc {proc[t] + 1} while task "
+                                          f"{lastTask + 1} runs until {lastEnd}"})
+        if lastTask is None or eft[t] > lastEnd:
+            lastTask, lastEnd = t, eft[t]
+    return violations
 
 
 def verifPrec(g, schedule, verbose):
-    """ Verify precedence constraint and job length of a given schedule
+    """ Verify precedence constraint, communication delays, job length and overlaps of a given schedule, printing
+    every violation found
 
     :param g: DAG to schedule
-    :type g: networkx.DiGraph
+    :type g: networkx.DiGraph | CompiledDAG
     :param schedule: Schedule to check
     :type schedule: dict[int, (int, float, float)]
     :param verbose: Print non-necessary information ?
     :type verbose: bool
+    :return: Violations found (see checkSchedule)
+    :rtype: list[dict]
     """
-    lastA = [0] * g.graph['nbproc']
-    for t in schedule:
-        tproc, test, teft = schedule[t]
-        dft, onproc = computeDFT(g, t, tproc, schedule, verbose, False)
-        if test < dft:
-            print(f"WHOOPS, started too soon for task {t} on proc {tproc} : should not start before {dft}")
-            exit()
-        # noinspection PyTypeChecker
-        lastA[tproc] = teft
-        for prec in g.predecessors(t):
-            pproc, pest, peft = schedule[prec]
-            if test < peft + commCost(g, prec, t, pproc, tproc, verbose):
-                print("Whoops, pause not long enough for task :", str(t) + ". Est :", test,
-                      "while actual finish time :", peft + commCost(g, prec, t, pproc, tproc, verbose),
-                      "for prec", prec)
-                exit()
-            if test + g.graph['costmatrix'][t - 1][tproc] > teft:
-                print("Whoops, job too long for task :", str(t) + ". Job size on proc", tproc + 1, ":",
-                      g.graph['costmatrix'][t - 1][tproc])
-
-                exit()
-    for n in g.nodes:
-        if n not in schedule:
-            print("WHOOPS, node not scheduled")
-            exit()
+    violations = checkSchedule(g, schedule)
+    for violation in violations:
+        print("WHOOPS,", violation['message'])
+    if verbose and not violations:
+        print("Schedule checked : no violation")
+    return violations
@@ -0,0 +1,90 @@
+import random
+
+import numpy
+
+from computations.CompiledDAG import compileDAG
+from executions.TotalComputation import computeSchedule
+from help.GraphGenerator import generateGraph
+from tests.VerifPrecedence import checkSchedule
+
+
+def reported(violations, kind, tasks):
+    """ Tell whether a violation of the given kind was reported for one of **tasks** """
+    return any(v['kind'] == kind and v['task'] in tasks for v in violations)
+
+
+def injectViolations(g, schedule, rng):
+    """ Break a valid schedule in every way checkSchedule detects, one violation at a time
+
+    :param g: DAG of the schedule
+    :type g: CompiledDAG
+    :param schedule: Valid schedule in format {task : [proc, est, eft],..}
+    :type schedule: dict[int, list]
+    :return: Broken schedules, along with the kind of violation expected and the tasks it may be reported for
+    :rtype: list[(dict[int, list], str, list[int])]
+    """
+    q = g.graph['nbproc']
+    cases = []
+    busy = [t for t in schedule if schedule[t][2] > schedule[t][1]]
+    edges = [(int(u) + 1, int(v) + 1, w) for u, v, w in zip(g.edgeSrc, g.edgeDst, g.succWeight) if w > 0]
+
+    t = rng.choice(list(schedule))
+    broken = {k: list(v) for k, v in schedule.items() if k != t}
+    cases.append((broken, 'missing', [t]))
+
+    broken = {k: list(v) for k, v in schedule.items()}
+    broken[t][0] = q
+    cases.append((broken, 'processor', [t]))
+
+    t = rng.choice(busy)
+    broken = {k: list(v) for k, v in schedule.items()}
+    broken[t][2] = broken[t][1] + (broken[t][2] - broken[t][1]) / 2
+    cases.append((broken, 'duration', [t]))
+
+    if edges:
+        u, v, w = rng.choice(edges)
+        other = (schedule[u][0] + 1) % q
+        for kind, est in [('precedence', schedule[u][1]), ('communication', schedule[u][2])]:
+            broken = {k: list(x) for k, x in schedule.items()}
+            broken[v] = [other, est, est + float(g.cost[v - 1, other])]
+            cases.append((broken, kind, [v]))
+
+    a, b = rng.sample(busy, 2)
+    proc, est = schedule[a][0], schedule[a][1]
+    broken = {k: list(x) for k, x in schedule.items()}
+    broken[b] = [proc, est, est + float(g.cost[b - 1, proc])]
+    cases.append((broken, 'overlap', [a, b]))
+    return cases
+
+
+def checkGraph(seed, size=20, depth=5, nbproc=3):
+    """ Check that a HEFT schedule of a generated graph is valid, and that every injected violation is reported
+
+    :return: Errors found
+    :rtype: list[str]
+    """
+    random.seed(seed)
+    numpy.random.seed(seed)
+    g = compileDAG(generateGraph(size, depth, 0.5, 0.5, 1, nbproc))
+    schedule = {t: list(v) for t, v in computeSchedule(g, strategyPrio="rku", costFunction="mean",
+                                                       strategyPlacement="eft").items()}
+    violations = checkSchedule(g, schedule)
+    if violations:
+        return [f"Seed {seed} : valid schedule reported as invalid ({violations[0]['message']})"]
+    errors = []
+    rng = random.Random(seed)
+    for broken, kind, tasks in injectViolations(g, schedule, rng):
+        violations = checkSchedule(g, broken)
+        if not reported(violations, kind, tasks):
+            errors.append(f"Seed {seed} : {kind} violation of task(s) {tasks} not reported, got "
+                          f"{[(v['kind'], v['task']) for v in violations]}")
+    return errors
+
+
+if __name__ == '__main__':
+    failures = []
+    for seed in range(50):
+        failures += checkGraph(seed)
+    for failure in failures[:20]:
+        print(failure)
+    print(f"{len(failures)} errors over 50 graphs")
@@ -0,0 +1,139 @@
+import math
+import random
+
+from computations.Schedule import IdleGaps, Schedule, _LEFT, _RIGHT, _START, _END, _MAXLEN
+
+
+def bruteGaps(timeline):
+    """ Scan a timeline for its idle gaps, as defined by IdleGaps
+
+    :param timeline: Tasks of a processor in format [(est, eft, task),..], sorted by start time
+    :type timeline: list[(float, float, int)]
+    :return: Gaps in format [(start, end),..], sorted by start time
+    :rtype: list[(float, float)]
+    """
+    gaps = []
+    prevEnd = 0
+    for est, eft, task in timeline:
+        if est > prevEnd:
+            gaps.append((prevEnd, est))
+        prevEnd = eft
+    gaps.append((prevEnd, math.inf))
+    return gaps
+
+
+def bruteEarliestStart(gaps, t, w):
+    """ Return the earliest time at or after **t** when a task of length **w** fits in one of **gaps** """
+    return min(max(start, t) for start, end in gaps if end - max(start, t) >= w)
+
+
+def treapGaps(node):
+    """ List the gaps of a treap in order, checking the greatest gap length held by each node
+
+    :return: Gaps in format [(start, end),..] and greatest gap length of the subtree
+    :rtype: (list[(float, float)], float)
+    """
+    if node is None:
+        return [], -math.inf
+    left, leftMax = treapGaps(node[_LEFT])
+    right, rightMax = treapGaps(node[_RIGHT])
+    maxLen = max(leftMax, rightMax, node[_END] - node[_START])
+    if node[_MAXLEN] != maxLen:
+        raise AssertionError(f"Gap ({node[_START]}, {node[_END]}) holds max length {node[_MAXLEN]}, not {maxLen}")
+    return left + [(node[_START], node[_END])] + right, maxLen
+
+
+def checkGaps(gaps, timeline, rng, queries=20):
+    """ Compare IdleGaps with a brute-force scan of **timeline** : gaps, greatest lengths and earliest starts
+
+    :return: Errors found
+    :rtype: list[str]
+    """
+    expected = bruteGaps(timeline)
+    try:
+        found, maxLen = treapGaps(gaps.root)
+    except AssertionError as e:
+        return [str(e)]
+    if found != expected:
+        return [f"Gaps {found} instead of {expected}"]
+    errors = []
+    horizon = timeline[-1][1] + 2 if timeline else 2
+    for _ in range(queries):
+        t = rng.choice([rng.uniform(0, horizon), rng.randrange(int(horizon) + 1) / 2])
+        w = rng.choice([0, rng.uniform(0, 3), rng.randrange(7) / 2])
+        if gaps.earliestStart(t, w) != bruteEarliestStart(expected, t, w):
+            errors.append(f"earliestStart({t}, {w}) = {gaps.earliestStart(t, w)} instead of "
+                          f"{bruteEarliestStart(expected, t, w)} for gaps {expected}")
+    return errors
+
+
+def randomTask(schedule, proc, rng):
+    """ Draw a task fitting in an idle gap of **proc**, zero-length tasks and tasks touching their neighbours
+    included, times being often multiples of 0.5 to get ties
+
+    :return: Task in format (est, eft)
+    :rtype: (float, float)
+    """
+    start, end = rng.choice(bruteGaps(schedule.onProc(proc)))
+    if end == math.inf:
+        end = start + rng.choice([0, 0.5, 1, 2, 4])
+    kind = rng.random()
+    if kind < 0.3:
+        est = start
+    elif kind < 0.5:
+        est = end
+    elif kind < 0.75:
+        est = start + (end - start) * rng.randrange(5) / 4
+    else:
+        est = rng.uniform(start, end)
+    length = 0 if rng.random() < 0.25 else rng.choice([end - est, (end - est) / 2, rng.uniform(0, end - est)])
+    return est, min(est + length, end)  # Rounding must not make tasks overlap
+
+
+def randomRun(seed, nbproc=3, steps=300):
+    """ Randomly schedule, move and remove tasks, checking the gaps of every processor after each step
+
+    :return: Errors found
+    :rtype: list[str]
+    """
+    rng = random.Random(seed)
+    schedule = Schedule()
+    for proc in range(nbproc):
+        schedule.earliestStart(proc, 0, 0)  # Index the gaps from the start, to maintain them incrementally
+    nextTask = 0
+    for step in range(steps):
+        proc = rng.randrange(nbproc)
+        action = rng.random()
+        if action < 0.6 or not schedule:
+            est, eft = randomTask(schedule, proc, rng)
+            schedule[nextTask] = [proc, est, eft]
+            nextTask += 1
+        elif action < 0.8:
+            task = rng.choice(list(schedule))
+            del schedule[task]
+            est, eft = randomTask(schedule, proc, rng)
+            schedule[task] = [proc, est, eft]
+        else:
+            del schedule[rng.choice(list(schedule))]
+        for p in range(nbproc):
+            errors = checkGaps(schedule.gaps[p], schedule.onProc(p), rng)
+            if not errors:
+                errors = checkGaps(IdleGaps(schedule.onProc(p)), schedule.onProc(p), rng, 5)
+            if errors:
+                return [f"Seed {seed}, step {step}, proc {p} : {error}" for error in errors]
+    copy = schedule.copy()
+    for p in range(nbproc):
+        copy.earliestStart(p, 0, 0)
+        errors = checkGaps(copy.gaps[p], copy.onProc(p), rng)
+        if errors:
+            return [f"Seed {seed}, copy, proc {p} : {error}" for error in errors]
+    return []
+
+
+if __name__ == '__main__':
+    failures = []
+    for seed in range(200):
+        failures += randomRun(seed)
+    for failure in failures[:20]:
+        print(failure)
+    print(f"{len(failures)} errors over 200 random runs")